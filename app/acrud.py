@@ -0,0 +1,128 @@
+"""crud.py의 비동기 버전.
+
+쿼리 로직은 crud.py 한 곳에만 두고, AsyncSession.run_sync로 aiosqlite 연결 위에서 실행한다.
+DB 대기 중에는 이벤트 루프가 다른 요청을 처리하므로 스레드풀을 점유하지 않는다.
+쓰기 큐(WRITE_QUEUE=1)가 켜져 있으면 쓰기는 app.writer의 그룹 커밋으로 보낸다.
+캐시를 쓰는 조회는 먼저 다른 프로세스의 쓰기를 확인한다 (activity.refresh, 스레드에서 실행).
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import activity, crud, writer
+from app.models import Board, Post
+from app.schemas import BatchRequest, BoardCreate, PostCreate, ReplyCreate
+
+
+# ── Board ────────────────────────────────────────────
+
+async def get_boards(db: AsyncSession, active_only: bool = True) -> list[dict]:
+    await activity.refresh()
+    return await db.run_sync(crud.get_boards, active_only)
+
+
+async def get_board_by_slug(db: AsyncSession, slug: str) -> Board | None:
+    return await db.run_sync(crud.get_board_by_slug, slug)
+
+
+async def create_board(db: AsyncSession, data: BoardCreate) -> Board:
+    if writer.ENABLED:
+        return await writer.run(crud.create_board, data, exclusive=True)
+    return await db.run_sync(crud.create_board, data)
+
+
+# ── Post ─────────────────────────────────────────────
+
+async def get_posts(
+    db: AsyncSession, board_id: int, limit: int = 50, offset: int = 0, cursor: str | None = None,
+) -> list[dict]:
+    await activity.refresh()
+    return await db.run_sync(crud.get_posts, board_id, limit, offset, cursor)
+
+
+async def get_archived_posts(
+    db: AsyncSession, board_id: int, limit: int = 50, offset: int = 0, cursor: str | None = None,
+) -> list[dict]:
+    return await db.run_sync(crud.get_archived_posts, board_id, limit, offset, cursor)
+
+
+async def get_archived_count(db: AsyncSession, board_id: int) -> int:
+    return await db.run_sync(crud.get_archived_count, board_id)
+
+
+async def get_post(db: AsyncSession, post_id: int) -> dict | None:
+    return await db.run_sync(crud.get_post, post_id)
+
+
+async def get_post_version(db: AsyncSession, post_id: int) -> dict | None:
+    return await db.run_sync(crud.get_post_version, post_id)
+
+
+async def create_post(db: AsyncSession, data: PostCreate) -> Post:
+    if writer.ENABLED:
+        return await writer.run(crud._create_post, data)
+    return await db.run_sync(crud.create_post, data)
+
+
+async def create_reply(db: AsyncSession, post_id: int, data: ReplyCreate) -> Post:
+    if writer.ENABLED:
+        return await writer.run(crud._create_reply, post_id, data)
+    return await db.run_sync(crud.create_reply, post_id, data)
+
+
+async def update_post(
+    db: AsyncSession, post_id: int, title: str | None = None, content: str | None = None,
+) -> Post | None:
+    if writer.ENABLED:
+        return await writer.run(crud._update_post, post_id, title, content)
+    return await db.run_sync(crud.update_post, post_id, title, content)
+
+
+async def delete_post(db: AsyncSession, post_id: int) -> bool:
+    if writer.ENABLED:
+        return await writer.run(crud._delete_post, post_id)
+    return await db.run_sync(crud.delete_post, post_id)
+
+
+async def restore_post(db: AsyncSession, post_id: int) -> bool:
+    if writer.ENABLED:
+        return await writer.run(crud._restore_post, post_id)
+    return await db.run_sync(crud.restore_post, post_id)
+
+
+async def search_posts(
+    db: AsyncSession, keyword: str, board_slug: str | None = None, limit: int = 20,
+) -> list[dict]:
+    return await db.run_sync(crud.search_posts, keyword, board_slug, limit)
+
+
+async def get_recent_posts(db: AsyncSession, limit: int = 10) -> list[dict]:
+    await activity.refresh()
+    return await db.run_sync(crud.get_recent_posts, limit)
+
+
+async def get_post_count(db: AsyncSession, board_id: int) -> int:
+    return await db.run_sync(crud.get_post_count, board_id)
+
+
+# ── Like ──────────────────────────────────────────
+
+async def toggle_like(db: AsyncSession, post_id: int, author: str) -> dict:
+    if writer.ENABLED:
+        return await writer.run(
+            crud._toggle_like, post_id, author, after=lambda s, action: crud.like_result(s, post_id, action),
+        )
+    return await db.run_sync(crud.toggle_like, post_id, author)
+
+
+async def get_likes(db: AsyncSession, post_id: int) -> dict:
+    return await db.run_sync(crud.get_likes, post_id)
+
+
+async def run_batch(db: AsyncSession, batch: BatchRequest) -> dict:
+    if writer.ENABLED:
+        return await writer.run(crud.run_batch, batch, exclusive=True)
+    return await db.run_sync(crud.run_batch, batch)
+
+
+async def get_last_activity(db: AsyncSession) -> dict:
+    return await db.run_sync(crud.get_last_activity)
@@ -0,0 +1,239 @@
+"""쓰기 활동 버전(watermark).
+
+crud 쓰기 함수가 세션에 touch()를 남기면 그 트랜잭션이 커밋되기 직전에 app_state의 'activity' 번호를 1 올린다.
+번호는 DB에 있으므로 워커·CLI·재시작과 관계없이 하나의 순서이고, 'epoch'(DB를 만들 때 정한 임의 값)와 함께
+ETag가 된다. 같은 DB를 보는 워커는 모두 같은 ETag를 낸다.
+
+/api/last-activity와 목록 API는 이 ETag로 변경이 없으면 DB를 읽지 않고 304를 돌려주고, ?wait= 롱폴링과
+/api/events SSE는 번호가 바뀔 때까지 기다린다. 자기 프로세스의 커밋은 바로 깨우고, 다른 프로세스의 커밋은
+EXTERNAL_POLL_INTERVAL마다 전용 연결의 `PRAGMA data_version`을 보고, 바뀌었을 때만 번호를 다시 읽는다.
+
+번호는 빈틈없이 이어지므로, 버전이 오를 때 건너뛴 번호 중 이 프로세스가 커밋하지 않은 것이 있으면 다른 프로세스의
+쓰기로 센다(external_version). 읽기 캐시(app.cache)는 그때 전부 비운다.
+
+crud를 거치지 않고 DB를 고친 뒤에는 `python -m app.activity bump`로 번호를 올린다.
+"""
+
+import asyncio
+import sqlite3
+import sys
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import DB_PATH
+
+EXTERNAL_POLL_INTERVAL = 1.0  # 롱폴링·SSE 중 다른 프로세스의 쓰기 확인 주기(초)
+REFRESH_INTERVAL = 0.05  # 요청마다 확인하지 않고, 이 간격 안의 요청은 마지막 확인 결과를 쓴다(초)
+
+_BUMP = text(
+    "INSERT INTO app_state (key, value, updated_at) VALUES ('activity', '1', CURRENT_TIMESTAMP)"
+    " ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1, updated_at = excluded.updated_at"
+    " RETURNING value"
+)
+_STATE = "SELECT key, value FROM app_state WHERE key IN ('epoch', 'activity')"
+
+_lock = threading.Lock()
+_epoch = ""
+_version = 0
+_cache: tuple[int, object] | None = None
+_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+_dv_conn: sqlite3.Connection | None = None
+_data_version: int | None = None
+_checked_at = 0.0
+_external = 0  # 감지한 외부 쓰기 횟수
+_own: set[int] = set()  # 이 프로세스가 커밋했지만 아직 버전에 반영되지 않은 번호
+_before_hooks: list = []
+_commit_hooks: list = []
+
+
+def current_version() -> int:
+    return _version
+
+
+def current_epoch() -> str:
+    return _epoch
+
+
+def etag(version: int | None = None) -> str:
+    return f'"{_epoch}-{_version if version is None else version}"'
+
+
+def touch(db: Session):
+    """이 세션의 다음 커밋을 활동으로 기록한다. 롤백되면 무시된다."""
+    db.info["activity_dirty"] = True
+
+
+def bump(conn) -> int:
+    """conn의 트랜잭션에서 활동 번호를 올리고 새 번호를 반환한다 (세션이 아닌 연결로 쓰는 곳용)."""
+    return int(conn.execute(_BUMP).scalar_one())
+
+
+def _advance(version: int, epoch: str | None = None, own: bool = False):
+    """버전을 version으로 올리고 기다리던 요청을 깨운다. 다른 epoch면(DB가 바뀜) 내려갈 수도 있다."""
+    global _version, _epoch, _cache, _external
+    with _lock:
+        if own:
+            _own.add(version)
+        if epoch is not None and epoch != _epoch:
+            _epoch = epoch
+            _external += 1
+            _own.clear()
+        elif version <= _version:
+            _own.discard(version)  # 확인이 먼저 반영했다 (외부로 세었다)
+            return
+        else:
+            # 자기 커밋의 after_commit이 아직 안 돌아 _own에 없는 번호도 외부로 센다 (캐시를 한 번 더 비울 뿐이다)
+            if sum(1 for v in _own if _version < v <= version) < version - _version:
+                _external += 1
+            _own.difference_update([v for v in _own if v <= version])
+        _version = version
+        _cache = None
+        waiters = list(_waiters)
+    for loop, fut in waiters:
+        loop.call_soon_threadsafe(_wake, fut)
+
+
+def _wake(fut: asyncio.Future):
+    if not fut.done():
+        fut.set_result(None)
+
+
+def _read_data_version() -> int:
+    global _dv_conn
+    if _dv_conn is None:
+        _dv_conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    return _dv_conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def close():
+    """data_version 연결을 닫는다. 다음 확인 때 다시 연다 (fork 전에 app.startup이 부른다)."""
+    global _dv_conn, _data_version
+    with _lock:
+        if _dv_conn is not None:
+            _dv_conn.close()
+        _dv_conn = None
+        _data_version = None
+
+
+def external_version() -> int:
+    return _external
+
+
+def check_external() -> bool:
+    """마지막 확인 이후 다른 연결이 커밋했으면 DB의 활동 번호를 다시 읽어 반영하고 True를 반환한다. 블로킹 I/O다."""
+    global _data_version
+    with _lock:
+        value = _read_data_version()
+        changed = value != _data_version
+        _data_version = value
+        if changed:
+            state = dict(_dv_conn.execute(_STATE).fetchall())
+    if changed:
+        _advance(int(state.get("activity", 0)), state.get("epoch", ""))
+    return changed
+
+
+async def refresh() -> int:
+    """check_external()을 스레드에서 돌리고 현재 버전을 반환한다. REFRESH_INTERVAL 안에 다시 부르면 건너뛴다."""
+    global _checked_at
+    now = time.monotonic()
+    if now - _checked_at >= REFRESH_INTERVAL:
+        _checked_at = now
+        await asyncio.to_thread(check_external)
+    return _version
+
+
+def before_commit(hook):
+    """활동이 기록된 세션이 커밋되기 직전, 같은 트랜잭션 안에서 hook(session)을 호출한다."""
+    _before_hooks.append(hook)
+    return hook
+
+
+def on_commit(hook):
+    """활동이 기록된 세션이 커밋될 때 버전을 올리기 직전에 hook(session)을 호출한다."""
+    _commit_hooks.append(hook)
+    return hook
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session):
+    if not session.info.get("activity_dirty"):
+        return
+    for hook in _before_hooks:
+        hook(session)
+    session.info["activity_version"] = bump(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session):
+    if not session.info.pop("activity_dirty", False):
+        return
+    for hook in _commit_hooks:
+        hook(session)
+    _advance(session.info.pop("activity_version"), own=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session):
+    session.info.pop("activity_dirty", None)
+    session.info.pop("activity_version", None)
+
+
+def get_cached(version: int):
+    cache = _cache
+    if cache and cache[0] == version:
+        return cache[1]
+    return None
+
+
+def set_cached(version: int, value):
+    global _cache
+    with _lock:
+        if _version == version:
+            _cache = (version, value)
+
+
+async def wait_for_change(since: int, timeout: float) -> int:
+    """버전이 since에서 바뀌거나 timeout이 지날 때까지 기다린 뒤 현재 버전을 반환한다."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while _version == since:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        fut = loop.create_future()
+        with _lock:
+            _waiters.append((loop, fut))
+        try:
+            await asyncio.wait_for(fut, min(remaining, EXTERNAL_POLL_INTERVAL))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with _lock:
+                _waiters.remove((loop, fut))
+        if _version == since:
+            await refresh()
+    return _version
+
+
+def etag_matches(if_none_match: str | None, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == tag:
+            return True
+    return False
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    if sys.argv[1:] != ["bump"]:
+        print("usage: python -m app.activity bump")
+        sys.exit(2)
+    with engine.begin() as conn:
+        print(f"activity: {bump(conn)}")
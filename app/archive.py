@@ -0,0 +1,181 @@
+"""오래된 스레드 보관 (hot/cold 분리).
+
+마지막 활동(마지막 댓글, 없으면 작성 시각)이 게시판 기준일보다 오래된 최상위 글을 댓글·좋아요와 함께
+보관소 DB(ARCHIVE_PATH, 기본은 DB 옆 archive.db)로 옮겨 핫 테이블과 인덱스를 작게 유지한다.
+보관소는 모든 연결에 `archive` 스키마로 ATTACH되어 있어(app.database), crud.get_post / get_post_version /
+search_posts는 핫 테이블에 없는 글을 그대로 보관소에서 읽는다. 게시판 목록은 핫 테이블만 보고,
+보관된 글은 따로(?archived=1) 본다. 보관된 스레드는 읽기 전용이다 (쓰기 함수는 핫 테이블만 찾는다).
+
+기준일은 Board.archive_after_days, 비어 있으면 ARCHIVE_AFTER_DAYS (기본 0 = 보관하지 않음). 고정 글은 옮기지 않는다.
+
+    python -m app.archive run [--dry-run]   # 기준일이 지난 스레드를 옮긴다
+    python -m app.archive restore POST_ID   # 보관된 스레드를 핫 테이블로 되돌린다
+    python -m app.archive status            # 게시판별 핫/보관 글 수
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import activity, cache, crud, fts
+from app.models import ArchiveBase, ArchivedLike, ArchivedPost, Board, Like, Post
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+BATCH_SIZE = 200  # 한 트랜잭션에서 옮기는 스레드 수
+
+# app.migrations의 핫 쿼리 인덱스 중 보관소 읽기(get_post, 보관 글 목록)에 필요한 것
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS archive.ix_posts_board_list"
+    " ON posts (board_id, parent_id, is_deleted, is_pinned, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS archive.ix_posts_thread ON posts (parent_id, is_deleted, created_at)",
+    "CREATE INDEX IF NOT EXISTS archive.ix_likes_post_list ON likes (post_id, created_at, author_id)",
+    "CREATE INDEX IF NOT EXISTS archive.ix_posts_deleted ON posts (deleted_at) WHERE is_deleted = 1",
+]
+
+
+def ensure_schema(conn: Connection):
+    """보관소 테이블·인덱스·FTS를 만들고, 핫 테이블에 생긴 새 컬럼을 보관소에도 추가한다.
+
+    app.database.init_db가 마이그레이션 뒤에 부른다.
+    """
+    ArchiveBase.metadata.create_all(bind=conn)
+    for table in ArchiveBase.metadata.tables.values():
+        existing = {row[1] for row in conn.execute(text(f"PRAGMA archive.table_info({table.name})"))}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE archive.{table.name} ADD COLUMN {column.name} {ddl}"))
+    for ddl in _INDEXES:
+        conn.execute(text(ddl))
+    fts.ensure_fts(conn, "archive")
+
+
+def _cutoff(days: int | None, now: datetime) -> datetime | None:
+    days = ARCHIVE_AFTER_DAYS if days is None else days
+    return now - timedelta(days=days) if days > 0 else None
+
+
+def _candidates(db: Session, board_id: int, cutoff: datetime, limit: int | None) -> list[int]:
+    """옮길 스레드(최상위 글) ID. 가장 큰 posts.id가 든 스레드는 남겨 SQLite가 보관된 ID를 다시 쓰지 않게 한다."""
+    query = db.query(Post.id).filter(
+        Post.board_id == board_id, Post.parent_id == None, Post.is_pinned == False,
+        Post.id.notin_(crud._newest_post_ids(db)),
+        func.coalesce(Post.last_reply_at, Post.created_at) < cutoff,
+    ).order_by(Post.id)
+    if limit:
+        query = query.limit(limit)
+    return [post_id for (post_id,) in query.all()]
+
+
+def _copy(db: Session, source, target, where, with_id: bool = True):
+    names = [c.name for c in source.__table__.columns if with_id or c.name != "id"]
+    columns = [source.__table__.c[n] for n in names]
+    db.execute(insert(target.__table__).from_select(names, select(*columns).where(where).order_by(source.id)))
+
+
+def _move(db: Session, thread_ids: list[int], src_post, src_like, dst_post, dst_like):
+    """스레드(글+댓글)와 좋아요를 src에서 dst로 옮긴다. dst에 남아 있던 같은 스레드는 지우고 새로 쓴다.
+
+    좋아요 ID는 dst에서 새로 받는다. likes.id는 AUTOINCREMENT가 아니라 옮겨 간 가장 큰 ID를 SQLite가 다시 내주므로,
+    그대로 옮기면 나중에 같은 ID가 다시 옮겨 올 때 부딪힌다. 좋아요 ID를 참조하는 곳은 없다 (순서는 그대로다).
+
+    main과 보관소는 WAL 모드라 두 파일에 걸친 커밋이 원자적이지 않다. 중간에 멈춰 양쪽에 남아도 다시 돌리면 된다.
+    """
+    in_src = or_(src_post.id.in_(thread_ids), src_post.parent_id.in_(thread_ids))
+    in_dst = or_(dst_post.id.in_(thread_ids), dst_post.parent_id.in_(thread_ids))
+    db.execute(delete(dst_like).where(dst_like.post_id.in_(select(dst_post.id).where(in_dst))))
+    db.execute(delete(dst_post).where(in_dst))
+    _copy(db, src_post, dst_post, in_src)
+    _copy(db, src_like, dst_like, src_like.post_id.in_(select(src_post.id).where(in_src)), with_id=False)
+    db.execute(delete(src_like).where(src_like.post_id.in_(select(src_post.id).where(in_src))))
+    # 댓글을 먼저 지운다 (posts.parent_id 외래 키)
+    db.execute(delete(src_post).where(src_post.parent_id.in_(thread_ids)))
+    db.execute(delete(src_post).where(src_post.id.in_(thread_ids)))
+
+
+def _finish(db: Session, board_id: int):
+    crud._refresh_board_counters(db, board_id)
+    cache.invalidate(db, cache.BOARDS, cache.board(board_id), cache.RECENT)
+    activity.touch(db)
+    db.commit()
+
+
+def run(db: Session, dry_run: bool = False, now: datetime | None = None) -> dict[str, int]:
+    """기준일이 지난 스레드를 게시판별로 BATCH_SIZE개씩 옮긴다. {게시판 slug: 옮긴(dry_run이면 옮길) 수}."""
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    boards = db.query(Board.id, Board.slug, Board.archive_after_days).order_by(Board.id).all()
+    moved = {}
+    for board_id, slug, days in boards:
+        cutoff = _cutoff(days, now)
+        if cutoff is None:
+            continue
+        if dry_run:
+            moved[slug] = len(_candidates(db, board_id, cutoff, None))
+            continue
+        moved[slug] = 0
+        while True:
+            # 후보 조회부터 main·보관소 양쪽 쓰기 잠금을 잡은 채로 한다
+            db.execute(text("BEGIN IMMEDIATE"))
+            ids = _candidates(db, board_id, cutoff, BATCH_SIZE)
+            if not ids:
+                db.rollback()
+                break
+            _move(db, ids, Post, Like, ArchivedPost, ArchivedLike)
+            _finish(db, board_id)
+            moved[slug] += len(ids)
+    return moved
+
+
+def restore(db: Session, post_id: int) -> bool:
+    """보관된 스레드를 핫 테이블로 되돌린다. 기준일이 그대로면 다음 run에서 다시 옮겨진다."""
+    db.execute(text("BEGIN IMMEDIATE"))
+    board_id = db.query(ArchivedPost.board_id).filter(
+        ArchivedPost.id == post_id, ArchivedPost.parent_id == None
+    ).scalar()
+    if board_id is None:
+        db.rollback()
+        return False
+    _move(db, [post_id], ArchivedPost, ArchivedLike, Post, Like)
+    _finish(db, board_id)
+    return True
+
+
+def status(db: Session) -> list[dict]:
+    rows = db.query(Board.slug, Board.post_count, Board.archive_after_days, Board.id).order_by(Board.id).all()
+    return [
+        {"board": slug, "hot": hot, "archived": crud.get_archived_count(db, board_id),
+         "after_days": ARCHIVE_AFTER_DAYS if days is None else days}
+        for slug, hot, days, board_id in rows
+    ]
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, init_db
+
+    args = sys.argv[1:]
+    if not args or args[0] not in ("run", "restore", "status") or (args[0] == "restore" and len(args) != 2):
+        print("usage: python -m app.archive run [--dry-run] | restore POST_ID | status")
+        sys.exit(1)
+    init_db()
+    db = SessionLocal()
+    try:
+        if args[0] == "run":
+            dry_run = "--dry-run" in args
+            moved = run(db, dry_run=dry_run)
+            for slug, count in moved.items():
+                print(f"{slug}: {count}개 스레드{' (옮길 예정)' if dry_run else ''}")
+            print(f"합계 {sum(moved.values())}개" if moved else "보관 기준일이 설정된 게시판이 없습니다 (ARCHIVE_AFTER_DAYS)")
+        elif args[0] == "restore":
+            if not restore(db, int(args[1])):
+                print(f"보관소에 {args[1]}번 글이 없습니다")
+                sys.exit(1)
+            print(f"{args[1]}번 스레드를 되돌렸습니다")
+        else:
+            for row in status(db):
+                print(f"{row['board']}: 핫 {row['hot']}개, 보관 {row['archived']}개, 기준 {row['after_days'] or '-'}일")
+    finally:
+        db.close()
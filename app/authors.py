@@ -0,0 +1,94 @@
+"""작성자 이름 ↔ 정수 ID (authors 테이블) 인메모리 캐시.
+
+posts/likes는 author_id만 저장하고, API/템플릿은 Post.author / Like.author 프로퍼티로 이름을 읽는다.
+작성자는 수십 명 수준이라 전부 메모리에 두고, 모르는 ID가 나오면(다른 프로세스가 추가) 표를 다시 읽는다.
+crud 조회 함수는 결과의 작성자 ID로 preload()를 불러 호출한 세션으로 미리 읽어 두므로, 비동기 라우트가
+응답을 만들 때 name_of()가 이벤트 루프에서 동기 연결로 읽는 일은 없다.
+새 이름은 intern()이 쓰기 트랜잭션 안에서 추가하고, 커밋된 뒤에야 공용 캐시에 올린다. 그 전에는 그 세션만
+ID를 쓰고(db.info), 다른 세션은 DB에서 찾지 못해 스스로 추가하거나 기다린다. 롤백되면 그 ID는 버린다.
+"""
+
+import threading
+from typing import Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.database import read_engine
+from app.models import Author
+
+_lock = threading.Lock()
+_by_name: dict[str, int] = {}  # 커밋된 작성자만
+_by_id: dict[int, str] = {}
+_pending: dict[int, str] = {}  # 커밋 전 트랜잭션이 추가한 ID. 이름 표시(name_of)에만 쓰고 쓰기에는 쓰지 않는다
+
+
+def _remember(author_id: int, name: str):
+    with _lock:
+        _by_name[name] = author_id
+        _by_id[author_id] = name
+
+
+def _load(rows):
+    with _lock:
+        _by_id.update(rows)
+        _by_name.update((name, author_id) for author_id, name in rows)
+
+
+def _reload():
+    with read_engine.connect() as conn:
+        _load(conn.execute(select(Author.id, Author.name)).all())
+
+
+def preload(db: Session, author_ids: Iterable[int]):
+    """모르는 ID가 있으면 db(호출한 세션, 비동기 세션의 run_sync 안이면 aiosqlite 연결)로 표를 다시 읽는다."""
+    if any(i not in _by_id and i not in _pending for i in author_ids):
+        _load(db.execute(select(Author.id, Author.name)).all())
+
+
+def name_of(author_id: int) -> str:
+    name = _by_id.get(author_id) or _pending.get(author_id)
+    if name is None:
+        _reload()
+        name = _by_id.get(author_id, "")
+    return name
+
+
+def id_of(db: Session, name: str) -> int | None:
+    """이름의 ID. 없는 작성자면 None (추가하지 않는다)."""
+    author_id = db.info.get("new_authors", {}).get(name) or _by_name.get(name)
+    if author_id is None:
+        # 다른 세션의 커밋 전 행은 보이지 않으므로, 여기서 찾은 행은 커밋된 것이다
+        author_id = db.execute(select(Author.id).where(Author.name == name)).scalar()
+        if author_id is not None:
+            _remember(author_id, name)
+    return author_id
+
+
+def intern(db: Session, name: str) -> int:
+    """이름의 ID를 돌려주고, 처음 보는 이름이면 이 세션의 트랜잭션에서 추가한다."""
+    author_id = id_of(db, name)
+    if author_id is None:
+        db.execute(insert(Author).values(name=name).on_conflict_do_nothing(index_elements=[Author.name]))
+        author_id = db.execute(select(Author.id).where(Author.name == name)).scalar_one()
+        db.info.setdefault("new_authors", {})[name] = author_id
+        with _lock:
+            _pending[author_id] = name
+    return author_id
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session):
+    for name, author_id in session.info.pop("new_authors", {}).items():
+        _remember(author_id, name)
+        with _lock:
+            _pending.pop(author_id, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session):
+    # 롤백된 ID는 다른 이름에 다시 쓰일 수 있으므로 버린다
+    for author_id in session.info.pop("new_authors", {}).values():
+        with _lock:
+            _pending.pop(author_id, None)
@@ -0,0 +1,289 @@
+"""SQLite 백업 API로 뜨는 온라인 백업 (선택, BACKUP_INTERVAL=초).
+
+실행 중인 DB 파일을 그대로 복사하면 WAL에만 있는 페이지가 빠지거나 복사 도중 바뀐 페이지가 섞인다.
+여기서는 sqlite3 `Connection.backup`으로 main DB와 보관소(app.archive)를 BACKUP_STEP_PAGES 페이지씩
+나눠 복사하고, 단계 사이에 BACKUP_PAUSE_MS만큼 쉬어 다른 연결의 쓰기가 오래 막히지 않게 한다.
+
+원본 연결은 복사 내내 읽기 트랜잭션 하나를 열어 둔다. WAL에서는 읽기가 쓰기를 막지 않으므로 쓰기는 그대로
+진행되고, 백업은 시작 시점의 스냅숏을 끝까지 복사한다. (열어 두지 않으면 다른 연결이 쓸 때마다 백업이
+처음부터 다시 시작되어, 쓰기가 계속 들어오는 동안에는 끝나지 않는다.) main과 보관소도 같은 시점의 스냅숏이다.
+
+백업은 BACKUP_DIR(기본은 DB 옆 backups/) 아래 `board-YYYYMMDD-HHMMSS-ffffff/`(마이크로초까지)에 DB별 파일 하나씩 남는다.
+journal_mode를 DELETE로 바꿔 -wal 없이 그대로 복사해 쓸 수 있고, `PRAGMA integrity_check`(BACKUP_CHECK=quick이면
+quick_check)를 통과한 것만 이름을 바꿔 확정한다. 확정된 백업은 최근 BACKUP_KEEP개만 남긴다.
+
+BACKUP_INTERVAL이 0보다 크면 웹 서버가 그 간격으로 백그라운드 스레드에서 실행한다.
+POST /api/admin/backup으로 바로 실행하고, GET /api/admin/backup으로 진행 상황·지난 결과·백업 목록을 본다.
+
+    python -m app.backup run      # 지금 한 번 백업
+    python -m app.backup list     # 남아 있는 백업
+    python -m app.backup verify DIR   # 백업 폴더의 무결성 검사
+
+복원은 서버를 멈추고 백업 파일을 DB_PATH/ARCHIVE_PATH 위치에 복사한 뒤 남은 -wal/-shm 파일을 지운다.
+"""
+
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from app.database import ARCHIVE_PATH, DB_PATH
+
+INTERVAL = float(os.getenv("BACKUP_INTERVAL", "0"))  # 0이면 끔
+ENABLED = INTERVAL > 0
+BACKUP_DIR = os.getenv("BACKUP_DIR") or os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "backups")
+KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+STEP_PAGES = int(os.getenv("BACKUP_STEP_PAGES", "1024"))
+PAUSE = float(os.getenv("BACKUP_PAUSE_MS", "20")) / 1000
+CHECK = os.getenv("BACKUP_CHECK", "full")  # full | quick
+_PREFIX = "board-"
+_PARTIAL = ".partial"
+_STAMP = "%Y%m%d-%H%M%S-%f"  # 같은 초에 두 번 떠도 이름이 겹치지 않게 마이크로초까지
+
+_logger = logging.getLogger("board.backup")
+_lock = threading.Lock()
+_current: dict | None = None
+_last: dict | None = None
+_thread: threading.Thread | None = None
+_stop = threading.Event()
+
+
+class _Stopped(Exception):
+    pass
+
+
+def _progress(report: dict, **changes):
+    with _lock:
+        report.update(changes)
+
+
+def _sources() -> list[tuple[str, str]]:
+    """(스키마, 원본 경로). 보관소 파일이 아직 없으면 건너뛴다."""
+    sources = [("main", DB_PATH)]
+    if os.path.exists(ARCHIVE_PATH):
+        sources.append(("archive", ARCHIVE_PATH))
+    return sources
+
+
+def _read_uri(path: str) -> str:
+    return f"file:{quote(os.path.abspath(path))}?mode=ro"
+
+
+# ── Copy ─────────────────────────────────────────────
+
+def _copy(src: sqlite3.Connection, schema: str, target: str, report: dict):
+    stats = {"file": os.path.basename(target), "pages": 0, "steps": 0, "bytes": 0}
+    _progress(report, files={**report["files"], schema: stats})
+
+    def step(_status, remaining: int, total: int):
+        stats.update(pages=total, steps=stats["steps"] + 1, remaining=remaining)
+        _progress(report, files={**report["files"], schema: dict(stats)})
+        if _stop.is_set():
+            raise _Stopped()
+        if remaining:
+            time.sleep(PAUSE)
+
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst, pages=STEP_PAGES, progress=step, name=schema)
+        # 복사본은 원본의 WAL 설정을 물려받는다. 파일 하나로 옮겨 쓸 수 있게 되돌린다
+        dst.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dst.close()
+    stats.pop("remaining", None)
+    stats["bytes"] = os.path.getsize(target)
+    _progress(report, files={**report["files"], schema: stats})
+
+
+def check(path: str) -> str:
+    """백업 파일의 integrity_check 결과. 문제가 없으면 "ok"."""
+    conn = sqlite3.connect(_read_uri(path), uri=True)
+    try:
+        rows = conn.execute("PRAGMA quick_check" if CHECK == "quick" else "PRAGMA integrity_check").fetchall()
+    finally:
+        conn.close()
+    return "; ".join(row[0] for row in rows[:10])
+
+
+def _snapshot(report: dict, target_dir: str):
+    sources = _sources()
+    src = sqlite3.connect(_read_uri(DB_PATH), uri=True, timeout=30, isolation_level=None)
+    try:
+        for schema, path in sources[1:]:
+            src.execute(f"ATTACH DATABASE ? AS {schema}", (_read_uri(path),))
+        # 두 파일의 WAL 스냅숏을 같은 읽기 트랜잭션에서 잡아 둔다
+        src.execute("BEGIN")
+        for schema, _ in sources:
+            src.execute(f"SELECT count(*) FROM {schema}.sqlite_master").fetchone()
+        for schema, path in sources:
+            _copy(src, schema, os.path.join(target_dir, os.path.basename(path)), report)
+        src.execute("COMMIT")
+    finally:
+        src.close()
+
+
+# ── Rotation ─────────────────────────────────────────
+
+def backups() -> list[dict]:
+    """확정된 백업(최신순): 이름, 경로, 만든 시각, 파일별 크기."""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    result = []
+    for name in sorted(os.listdir(BACKUP_DIR), reverse=True):
+        path = os.path.join(BACKUP_DIR, name)
+        if not name.startswith(_PREFIX) or name.endswith(_PARTIAL) or not os.path.isdir(path):
+            continue
+        files = {f: os.path.getsize(os.path.join(path, f)) for f in sorted(os.listdir(path))}
+        result.append({"name": name, "path": path, "created_at": _created_at(name), "files": files,
+                       "bytes": sum(files.values())})
+    return result
+
+
+def _created_at(name: str) -> str | None:
+    for fmt in (_STAMP, "%Y%m%d-%H%M%S"):  # 초 단위 이름은 이전 버전이 만든 백업
+        try:
+            return datetime.strptime(name[len(_PREFIX):], fmt).replace(tzinfo=timezone.utc).isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+def rotate() -> list[str]:
+    """최근 KEEP개만 남기고 지운다. 중단되어 남은 .partial 폴더도 지운다. 지운 이름 목록."""
+    removed = [b["name"] for b in backups()[KEEP:]]
+    if os.path.isdir(BACKUP_DIR):
+        removed += [n for n in os.listdir(BACKUP_DIR) if n.startswith(_PREFIX) and n.endswith(_PARTIAL)
+                    and n != (_current or {}).get("name", "") + _PARTIAL]
+    for name in removed:
+        shutil.rmtree(os.path.join(BACKUP_DIR, name), ignore_errors=True)
+    return removed
+
+
+# ── Job ──────────────────────────────────────────────
+
+def _claim() -> dict | None:
+    """새 백업의 보고서를 만들어 진행 중으로 표시한다. 이미 실행 중이면 None (확인과 표시를 한 잠금 안에서 한다)."""
+    global _current
+    now = datetime.now(timezone.utc)
+    report = {
+        "name": f"{_PREFIX}{now:{_STAMP}}", "path": None, "started_at": now.isoformat(timespec="seconds"),
+        "finished_at": None, "seconds": None, "files": {}, "integrity": {}, "removed": [], "error": None,
+    }
+    with _lock:
+        if _current is not None:
+            return None
+        _current = report
+    return report
+
+
+def run() -> dict:
+    """백업을 한 번 뜨고 검사·확정·회전까지 한 뒤 결과를 반환한다. 이미 실행 중이면 그 진행 상황을 반환."""
+    report = _claim()
+    if report is None:
+        with _lock:
+            return dict(_current or _last)
+    return _run(report)
+
+
+def _run(report: dict) -> dict:
+    global _current, _last
+    name = report["name"]
+    started = time.perf_counter()
+    partial = os.path.join(BACKUP_DIR, name + _PARTIAL)
+    try:
+        os.makedirs(partial, exist_ok=True)
+        _snapshot(report, partial)
+        integrity = {schema: check(os.path.join(partial, stats["file"])) for schema, stats in report["files"].items()}
+        _progress(report, integrity=integrity)
+        bad = {schema: result for schema, result in integrity.items() if result != "ok"}
+        if bad:
+            raise RuntimeError(f"integrity check failed: {bad}")
+        final = os.path.join(BACKUP_DIR, name)
+        os.rename(partial, final)
+        _progress(report, path=final, removed=rotate())
+        _logger.info("backup %s: %s bytes", name, sum(s["bytes"] for s in report["files"].values()))
+    except _Stopped:
+        shutil.rmtree(partial, ignore_errors=True)
+        _progress(report, error="stopped")
+    except Exception as e:
+        _logger.exception("backup failed")
+        shutil.rmtree(partial, ignore_errors=True)
+        _progress(report, error=str(e))
+    finally:
+        with _lock:
+            report["finished_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            report["seconds"] = round(time.perf_counter() - started, 2)
+            _current = None
+            _last = report
+    return report
+
+
+def trigger() -> bool:
+    """run()을 별도 스레드에서 시작한다. 이미 실행 중이면 False."""
+    report = _claim()
+    if report is None:
+        return False
+    _stop.clear()
+    threading.Thread(target=_run, args=(report,), name="board-backup-once", daemon=True).start()
+    return True
+
+
+def _loop():
+    while not _stop.wait(INTERVAL):
+        run()
+
+
+def start():
+    """INTERVAL마다 run()하는 백그라운드 스레드를 띄운다. 웹 서버 시작 시 ENABLED면 부른다."""
+    global _thread
+    if _thread is None:
+        _stop.clear()
+        _thread = threading.Thread(target=_loop, name="board-backup", daemon=True)
+        _thread.start()
+
+
+def stop(timeout: float = 10):
+    """진행 중인 백업은 다음 단계에서 멈추고 미완성 폴더를 지운다."""
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout)
+        _thread = None
+
+
+def status() -> dict:
+    with _lock:
+        state = {
+            "enabled": ENABLED, "interval_seconds": INTERVAL, "dir": BACKUP_DIR, "keep": KEEP,
+            "running": dict(_current) if _current else None, "last_run": _last,
+        }
+    return {**state, "backups": backups()}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = sys.argv[1:]
+    if not args or args[0] not in ("run", "list", "verify") or (args[0] == "verify" and len(args) != 2):
+        print("usage: python -m app.backup run | list | verify DIR")
+        sys.exit(1)
+    if args[0] == "run":
+        report = run()
+        if report["error"]:
+            print(f"백업 실패: {report['error']}")
+            sys.exit(1)
+        for schema, stats in report["files"].items():
+            print(f"{schema}: {stats['file']} {stats['bytes']:,} bytes ({stats['steps']}단계), {report['integrity'][schema]}")
+        print(f"{report['path']} ({report['seconds']}초)" + (f", 지운 백업 {len(report['removed'])}개" if report["removed"] else ""))
+    elif args[0] == "list":
+        for item in backups():
+            print(f"{item['name']}: {item['bytes']:,} bytes ({', '.join(item['files'])})")
+    else:
+        results = {f: check(os.path.join(args[1], f)) for f in sorted(os.listdir(args[1])) if f.endswith(".db")}
+        for file, result in results.items():
+            print(f"{file}: {result}")
+        sys.exit(0 if results and all(r == "ok" for r in results.values()) else 1)
@@ -0,0 +1,115 @@
+"""읽기 결과 캐시 (게시판 목록, 게시판별 첫 페이지, 최신 글).
+
+크기가 CACHE_SIZE로 제한된 LRU다. 항목마다 태그(BOARDS, RECENT, board(id))를 달아 두고,
+crud 쓰기 함수가 invalidate()로 남긴 태그의 항목만 커밋이 확정된 뒤에 지운다.
+다른 워커/CLI의 쓰기는 활동 번호를 확인할 때(activity.check_external) 이 프로세스가 커밋하지 않은 번호가
+끼어 있으면 알 수 있고, 그 뒤 첫 조회에서 전부 비운다. cached()는 DB를 읽지 않으므로 확인은 호출하는 쪽이 먼저 한다:
+비동기 경로는 acrud가 `await activity.refresh()`(스레드에서 실행)로, 동기 경로(direct 모드, CLI)는 check_external()로.
+
+캐시된 ORM 객체는 세션에서 분리(expunge)해 두므로 읽기 전용으로만 다룬다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import activity
+from app.database import Base
+
+CACHE_SIZE = int(os.getenv("CACHE_SIZE", "256"))  # 0이면 캐시 끔
+
+BOARDS = "boards"
+RECENT = "recent"
+
+
+def board(board_id: int) -> tuple:
+    return ("board", board_id)
+
+
+_lock = threading.Lock()
+_entries: OrderedDict[Hashable, tuple[frozenset, object]] = OrderedDict()
+_generation = 0  # 무효화마다 증가. 조회 도중 무효화가 끼면 그 결과는 저장하지 않는다
+_external_seen = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+
+def _check_external():
+    global _external_seen
+    external = activity.external_version()
+    if external != _external_seen:
+        _external_seen = external
+        clear()
+
+
+def clear():
+    global _generation
+    with _lock:
+        _entries.clear()
+        _generation += 1
+
+
+def _detach(db: Session, value):
+    """결과 안의 ORM 객체를 세션에서 떼어, 이후 커밋의 expire 대상이 되지 않게 한다."""
+    items = value if isinstance(value, list) else [value]
+    for item in items:
+        for obj in item.values() if isinstance(item, dict) else [item]:
+            if isinstance(obj, Base) and obj in db:
+                db.expunge(obj)
+
+
+def cached(db: Session, key: Hashable, tags: Iterable, load: Callable[[], object]):
+    """key의 캐시 값을 반환하고, 없으면 load()로 읽어 tags와 함께 저장한다."""
+    global _generation
+    if CACHE_SIZE <= 0:
+        return load()
+    _check_external()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[1]
+        _stats["misses"] += 1
+        generation = _generation
+    value = load()
+    _detach(db, value)
+    with _lock:
+        if generation == _generation:
+            _entries[key] = (frozenset(tags), value)
+            while len(_entries) > CACHE_SIZE:
+                _entries.popitem(last=False)
+                _stats["evictions"] += 1
+    return value
+
+
+def invalidate(db: Session, *tags):
+    """이 세션이 커밋되면 tags가 달린 항목을 지운다."""
+    db.info.setdefault("cache_tags", set()).update(tags)
+
+
+@activity.on_commit
+def _apply(session: Session):
+    global _generation
+    tags = session.info.pop("cache_tags", None)
+    if not tags:
+        return
+    with _lock:
+        stale = [key for key, (entry_tags, _) in _entries.items() if entry_tags & tags]
+        for key in stale:
+            del _entries[key]
+        _generation += 1
+        _stats["invalidations"] += len(stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session):
+    session.info.pop("cache_tags", None)
+
+
+def stats() -> dict:
+    with _lock:
+        return {"size": len(_entries), "max_size": CACHE_SIZE, **_stats}
@@ -1,45 +1,42 @@
+import base64
+import json
+from datetime import datetime, timezone
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from app.models import Board, Post, Like
-from app.schemas import BoardCreate, PostCreate, ReplyCreate
+from sqlalchemy import case, func, desc, or_, select, tuple_
+from app import authors, cache, events, fts, render, serializers
+from app.models import ArchivedLike, ArchivedPost, Board, Post, Like
+from app.schemas import BoardCreate, PostCreate, ReplyCreate, BatchRequest
 
 
 # ── Board ────────────────────────────────────────────
 
 def get_boards(db: Session, active_only: bool = True) -> list[dict]:
+    return cache.cached(db, ("boards", active_only), [cache.BOARDS], lambda: _query_boards(db, active_only))
+
+
+def _query_boards(db: Session, active_only: bool) -> list[dict]:
     query = db.query(Board)
     if active_only:
         query = query.filter(Board.is_active == True)
     boards = query.order_by(Board.sort_order, Board.id).all()
-
-    result = []
-    for b in boards:
-        count = (
-            db.query(func.count(Post.id))
-            .filter(Post.board_id == b.id, Post.parent_id == None, Post.is_deleted == False)
-            .scalar()
-        )
-        latest = (
-            db.query(Post)
-            .filter(Post.board_id == b.id, Post.parent_id == None, Post.is_deleted == False)
-            .order_by(desc(Post.created_at))
-            .first()
-        )
-        result.append({
-            "board": b,
-            "post_count": count,
-            "latest_post": latest,
-        })
-    return result
+    # post_count / latest_post는 비정규화 컬럼과 joined 로딩으로 한 번에 읽는다
+    return [{"board": b, "post_count": b.post_count, "latest_post": b.latest_post} for b in boards]
 
 
 def get_board_by_slug(db: Session, slug: str) -> Board | None:
     return db.query(Board).filter(Board.slug == slug).first()
 
 
+def _board_slug(db: Session, board_id: int) -> str | None:
+    return db.query(Board.slug).filter(Board.id == board_id).scalar()
+
+
 def create_board(db: Session, data: BoardCreate) -> Board:
     board = Board(**data.model_dump())
     db.add(board)
+    cache.invalidate(db, cache.BOARDS)
+    events.record(db, events.BOARD_CREATED, data.slug, name=data.name)
     db.commit()
     db.refresh(board)
     return board
@@ -48,53 +45,220 @@ def create_board(db: Session, data: BoardCreate) -> Board:
 # ── Post ─────────────────────────────────────────────
 
 def _get_like_info(db: Session, post_id: int) -> dict:
-    count = db.query(func.count(Like.id)).filter(Like.post_id == post_id).scalar()
-    authors = [r[0] for r in db.query(Like.author).filter(Like.post_id == post_id).order_by(Like.created_at).all()]
-    return {"like_count": count, "liked_by": authors}
+    liked_by = _load_liked_by(db, [post_id])[post_id]
+    return {"like_count": len(liked_by), "liked_by": liked_by}
 
 
-def get_posts(db: Session, board_id: int, limit: int = 50, offset: int = 0) -> list[dict]:
-    posts = (
-        db.query(Post)
-        .filter(Post.board_id == board_id, Post.parent_id == None, Post.is_deleted == False)
-        .order_by(desc(Post.is_pinned), desc(Post.created_at))
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+_IN_CHUNK = 500  # SQLite 바인딩 변수 한도 아래로 IN 절을 나눈다
+
+
+def _chunks(ids: list[int]):
+    for i in range(0, len(ids), _IN_CHUNK):
+        yield ids[i:i + _IN_CHUNK]
+
+
+def _load_liked_by(db: Session, post_ids: list[int], like_cls=Like) -> dict[int, list[str]]:
+    """글 ID 목록의 좋아요 누른 사람(누른 순서)을 글 단위가 아닌 묶음 쿼리로 조회한다."""
+    ids = list(dict.fromkeys(post_ids))
+    liked_by = {pid: [] for pid in ids}
+    for chunk in _chunks(ids):
+        likes = (
+            db.query(like_cls.post_id, like_cls.author_id)
+            .filter(like_cls.post_id.in_(chunk))
+            .order_by(like_cls.post_id, like_cls.created_at, like_cls.id)
+            .all()
+        )
+        authors.preload(db, [author_id for _, author_id in likes])
+        for post_id, author_id in likes:
+            liked_by[post_id].append(authors.name_of(author_id))
+    return liked_by
+
+
+def _load_boards(db: Session, board_ids: list[int]) -> dict[int, Board]:
+    ids = list(dict.fromkeys(board_ids))
+    boards = {}
+    for chunk in _chunks(ids):
+        for b in db.query(Board).filter(Board.id.in_(chunk)).all():
+            boards[b.id] = b
+    return boards
+
+
+def _with_stats(db: Session, posts: list[Post], with_board: bool = False, like_cls=Like) -> list[dict]:
+    authors.preload(db, [p.author_id for p in posts])
+    liked_by = _load_liked_by(db, [p.id for p in posts], like_cls)
+    boards = _load_boards(db, [p.board_id for p in posts]) if with_board else {}
     result = []
     for p in posts:
-        reply_count = (
-            db.query(func.count(Post.id))
-            .filter(Post.parent_id == p.id, Post.is_deleted == False)
-            .scalar()
-        )
-        like_info = _get_like_info(db, p.id)
-        result.append({"post": p, "reply_count": reply_count, **like_info})
+        item = {"post": p, "reply_count": p.reply_count, "like_count": p.like_count, "liked_by": liked_by[p.id]}
+        if with_board:
+            item["board"] = boards.get(p.board_id)
+        result.append(item)
     return result
 
 
+def _bump(db: Session, post_id: int, **values):
+    """카운터 컬럼을 SQL 쪽에서 갱신한다. 카운터 변경은 글 수정이 아니므로 updated_at은 유지."""
+    values = {getattr(Post, k): v for k, v in values.items()}
+    values[Post.updated_at] = Post.updated_at
+    db.query(Post).filter(Post.id == post_id).update(values)
+
+
+def _refresh_post_counters(db: Session, post_id: int):
+    """삭제/복구처럼 여러 댓글이 한꺼번에 바뀌는 경우 댓글 카운터를 다시 센다."""
+    reply_count, last_reply_at = (
+        db.query(func.count(Post.id), func.max(Post.created_at))
+        .filter(Post.parent_id == post_id, Post.is_deleted == False)
+        .one()
+    )
+    _bump(db, post_id, reply_count=reply_count, last_reply_at=last_reply_at)
+
+
+def _refresh_board_counters(db: Session, board_id: int):
+    visible = (Post.board_id == board_id, Post.parent_id == None, Post.is_deleted == False)
+    count = db.query(func.count(Post.id)).filter(*visible).scalar()
+    latest_id = db.query(Post.id).filter(*visible).order_by(desc(Post.created_at), desc(Post.id)).limit(1).scalar()
+    db.query(Board).filter(Board.id == board_id).update({"post_count": count, "latest_post_id": latest_id})
+
+
+def _newest_post_ids(db: Session) -> set[int]:
+    """가장 큰 posts.id와 그 스레드의 최상위 글 ID. 이 행이 지워지면 SQLite가 그 ID를 새 글에 다시 쓰므로
+    보관(app.archive)·영구 삭제(app.retention) 대상에서 뺀다."""
+    top = db.query(func.max(Post.id)).scalar()
+    thread = db.query(func.coalesce(Post.parent_id, Post.id)).filter(Post.id == top).scalar()
+    return {i for i in (top, thread) if i is not None}
+
+
+def encode_cursor(post: Post) -> str:
+    """(is_pinned, created_at, id) 키셋 커서를 URL-safe 문자열로 만든다."""
+    raw = json.dumps([int(bool(post.is_pinned)), post.created_at.isoformat(), post.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[bool, datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        pinned, created_at, post_id = json.loads(raw)
+        return bool(pinned), datetime.fromisoformat(created_at), int(post_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def next_cursor(items: list[dict], limit: int) -> str | None:
+    """가득 찬 페이지면 마지막 글 기준 다음 커서를, 아니면 None을 반환한다."""
+    if limit <= 0 or len(items) < limit:
+        return None
+    return encode_cursor(items[-1]["post"])
+
+
+def get_posts(
+    db: Session, board_id: int, limit: int = 50, offset: int = 0, cursor: str | None = None,
+) -> list[dict]:
+    """게시판 글 목록. cursor가 있으면 OFFSET 대신 키셋으로 그 다음 글부터 읽는다.
+
+    가장 자주 열리는 첫 페이지만 캐시한다.
+    """
+    if not cursor and not offset:
+        return cache.cached(
+            db, ("posts", board_id, limit), [cache.board(board_id)],
+            lambda: _query_posts(db, board_id, limit, 0, None),
+        )
+    return _query_posts(db, board_id, limit, offset, cursor)
+
+
+def _query_posts(
+    db: Session, board_id: int, limit: int, offset: int, cursor: str | None, post_cls=Post, like_cls=Like,
+) -> list[dict]:
+    query = (
+        db.query(post_cls)
+        .filter(post_cls.board_id == board_id, post_cls.parent_id == None, post_cls.is_deleted == False)
+        .order_by(desc(post_cls.is_pinned), desc(post_cls.created_at), desc(post_cls.id))
+    )
+    if cursor:
+        pinned, created_at, post_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(post_cls.is_pinned, post_cls.created_at, post_cls.id) < (pinned, created_at, post_id)
+        )
+    elif offset:
+        query = query.offset(offset)
+    posts = query.limit(limit).all()
+    return _with_stats(db, posts, like_cls=like_cls)
+
+
+def get_archived_posts(
+    db: Session, board_id: int, limit: int = 50, offset: int = 0, cursor: str | None = None,
+) -> list[dict]:
+    """보관소(app.archive)로 옮겨진 게시판 글 목록. get_posts와 같은 정렬/커서를 쓴다."""
+    return _query_posts(db, board_id, limit, offset, cursor, ArchivedPost, ArchivedLike)
+
+
+def get_archived_count(db: Session, board_id: int) -> int:
+    return db.query(func.count(ArchivedPost.id)).filter(
+        ArchivedPost.board_id == board_id, ArchivedPost.parent_id == None, ArchivedPost.is_deleted == False
+    ).scalar()
+
+
 def get_post(db: Session, post_id: int) -> dict | None:
-    post = db.query(Post).filter(Post.id == post_id, Post.is_deleted == False).first()
+    """글과 댓글. 핫 테이블에 없으면 보관소에서 찾는다 (archived=True, 읽기 전용)."""
+    return _get_thread(db, post_id, Post, Like) or _get_thread(db, post_id, ArchivedPost, ArchivedLike)
+
+
+def _get_thread(db: Session, post_id: int, post_cls, like_cls) -> dict | None:
+    post = db.query(post_cls).filter(post_cls.id == post_id, post_cls.is_deleted == False).first()
     if not post:
         return None
     replies = (
-        db.query(Post)
-        .filter(Post.parent_id == post_id, Post.is_deleted == False)
-        .order_by(Post.created_at)
+        db.query(post_cls)
+        .filter(post_cls.parent_id == post_id, post_cls.is_deleted == False)
+        .order_by(post_cls.created_at)
         .all()
     )
     board = db.query(Board).filter(Board.id == post.board_id).first()
-    like_info = _get_like_info(db, post.id)
-    # 댓글별 좋아요 정보도 포함
-    replies_with_likes = []
-    for r in replies:
-        r_like = _get_like_info(db, r.id)
-        replies_with_likes.append({"reply": r, **r_like})
-    return {"post": post, "replies": replies_with_likes, "board": board, **like_info}
+    authors.preload(db, [post.author_id] + [r.author_id for r in replies])
+    # 본문 + 댓글별 좋아요 누른 사람을 한 번에 조회
+    liked_by = _load_liked_by(db, [post.id] + [r.id for r in replies], like_cls)
+    replies_with_likes = [
+        {"reply": r, "like_count": r.like_count, "liked_by": liked_by[r.id]} for r in replies
+    ]
+    return {
+        "post": post, "replies": replies_with_likes, "board": board,
+        "like_count": post.like_count, "liked_by": liked_by[post.id], "archived": post_cls is ArchivedPost,
+    }
 
 
-def create_post(db: Session, data: PostCreate) -> Post:
+def get_post_version(db: Session, post_id: int) -> dict | None:
+    """get_post 응답의 검증값(ETag 재료)을 집계 쿼리 한 번으로 읽는다. 글이 없으면 None.
+
+    스레드(글+댓글)에서 보이는 행 수·마지막 수정 시각, 좋아요 수·마지막 좋아요 시각이 같으면 응답도 같다.
+    좋아요 취소 후 다른 사람이 누르면 수는 같아도 마지막 좋아요 시각이 바뀐다.
+    보관소로 옮겨져도 행이 그대로이므로 검증값은 바뀌지 않는다.
+    """
+    return (_thread_version(db, post_id, Post, Like)
+            or _thread_version(db, post_id, ArchivedPost, ArchivedLike))
+
+
+def _thread_version(db: Session, post_id: int, post_cls, like_cls) -> dict | None:
+    in_thread = or_(post_cls.id == post_id, post_cls.parent_id == post_id)
+    thread_ids = select(post_cls.id).where(in_thread)
+    row = db.execute(
+        select(
+            func.sum(case((post_cls.id == post_id, 1), else_=0)),
+            func.max(post_cls.board_id),
+            func.count(post_cls.id),
+            func.max(post_cls.updated_at),
+            select(func.count(like_cls.id)).where(like_cls.post_id.in_(thread_ids)).scalar_subquery(),
+            select(func.max(like_cls.created_at)).where(like_cls.post_id.in_(thread_ids)).scalar_subquery(),
+        ).where(in_thread, post_cls.is_deleted == False)
+    ).one()
+    found, board_id, rows, updated_at, likes, liked_at = row
+    if not found:
+        return None
+    return {"key": (post_id, board_id, rows, updated_at.isoformat(), likes, liked_at.isoformat() if liked_at else None)}
+
+
+# 쓰기 함수는 커밋하지 않는 _xxx(flush까지)와 커밋하는 공개 함수로 나뉜다. run_batch와 app.writer는
+# _xxx를 모아 한 번 커밋한다. 그래서 _xxx는 ValueError를 DB를 건드리기 전에만 던져야 한다.
+
+def _create_post(db: Session, data: PostCreate) -> Post:
     board = get_board_by_slug(db, data.board_slug)
     if not board:
         raise ValueError(f"Board '{data.board_slug}' not found")
@@ -102,18 +266,30 @@ def create_post(db: Session, data: PostCreate) -> Post:
         board_id=board.id,
         title=data.title,
         content=data.content,
-        author=data.author,
+        content_html=render.to_html(data.content),
+        author_id=authors.intern(db, data.author),
         prefix=data.prefix,
         tag=data.tag,
         is_pinned=data.is_pinned,
     )
     db.add(post)
+    db.flush()
+    db.query(Board).filter(Board.id == board.id).update(
+        {Board.post_count: Board.post_count + 1, Board.latest_post_id: post.id}
+    )
+    cache.invalidate(db, cache.BOARDS, cache.board(board.id), cache.RECENT)
+    events.record(db, events.POST_CREATED, board.slug, post_id=post.id, title=post.title, author=post.author)
+    return post
+
+
+def create_post(db: Session, data: PostCreate) -> Post:
+    post = _create_post(db, data)
     db.commit()
     db.refresh(post)
     return post
 
 
-def create_reply(db: Session, post_id: int, data: ReplyCreate) -> Post:
+def _create_reply(db: Session, post_id: int, data: ReplyCreate) -> Post:
     parent = db.query(Post).filter(Post.id == post_id, Post.is_deleted == False).first()
     if not parent:
         raise ValueError(f"Post {post_id} not found")
@@ -121,15 +297,28 @@ def create_reply(db: Session, post_id: int, data: ReplyCreate) -> Post:
         board_id=parent.board_id,
         parent_id=post_id,
         content=data.content,
-        author=data.author,
+        content_html=render.to_html(data.content),
+        author_id=authors.intern(db, data.author),
     )
     db.add(reply)
+    db.flush()
+    _bump(db, post_id, reply_count=Post.reply_count + 1, last_reply_at=reply.created_at)
+    cache.invalidate(db, cache.board(parent.board_id), cache.RECENT)
+    events.record(
+        db, events.REPLY_CREATED, _board_slug(db, parent.board_id),
+        post_id=post_id, reply_id=reply.id, author=reply.author,
+    )
+    return reply
+
+
+def create_reply(db: Session, post_id: int, data: ReplyCreate) -> Post:
+    reply = _create_reply(db, post_id, data)
     db.commit()
     db.refresh(reply)
     return reply
 
 
-def update_post(db: Session, post_id: int, title: str | None = None, content: str | None = None) -> Post | None:
+def _update_post(db: Session, post_id: int, title: str | None = None, content: str | None = None) -> Post | None:
     post = db.query(Post).filter(Post.id == post_id, Post.is_deleted == False).first()
     if not post:
         return None
@@ -137,55 +326,142 @@ def update_post(db: Session, post_id: int, title: str | None = None, content: st
         post.title = title
     if content is not None:
         post.content = content
+        post.content_html = render.to_html(content)
+    cache.invalidate(db, cache.BOARDS, cache.board(post.board_id), cache.RECENT)
+    events.record(db, events.POST_UPDATED, _board_slug(db, post.board_id), post_id=post.id, parent_id=post.parent_id)
+    db.flush()
+    return post
+
+
+def update_post(db: Session, post_id: int, title: str | None = None, content: str | None = None) -> Post | None:
+    post = _update_post(db, post_id, title, content)
+    if not post:
+        return None
     db.commit()
     db.refresh(post)
     return post
 
 
-def delete_post(db: Session, post_id: int) -> bool:
+def _delete_post(db: Session, post_id: int) -> bool:
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         return False
+    now = datetime.now(timezone.utc)
     post.is_deleted = True
-    # soft-delete replies too
-    db.query(Post).filter(Post.parent_id == post_id).update({"is_deleted": True})
+    post.deleted_at = now
+    # soft-delete replies too (먼저 삭제된 댓글의 삭제 시각은 유지 — app.retention 보존 기간 기준)
+    db.query(Post).filter(Post.parent_id == post_id).update(
+        {"is_deleted": True, "deleted_at": func.coalesce(Post.deleted_at, now)}
+    )
+    db.flush()
+    _refresh_counters_after_visibility_change(db, post)
+    events.record(db, events.POST_DELETED, _board_slug(db, post.board_id), post_id=post.id, parent_id=post.parent_id)
+    return True
+
+
+def delete_post(db: Session, post_id: int) -> bool:
+    if not _delete_post(db, post_id):
+        return False
     db.commit()
     return True
 
 
-def restore_post(db: Session, post_id: int) -> bool:
-    """소프트 삭제된 글을 복구한다."""
+def _refresh_counters_after_visibility_change(db: Session, post: Post):
+    cache.invalidate(db, cache.BOARDS, cache.board(post.board_id), cache.RECENT)
+    if post.parent_id is None:
+        _refresh_post_counters(db, post.id)
+        _refresh_board_counters(db, post.board_id)
+    else:
+        _refresh_post_counters(db, post.parent_id)
+
+
+def _restore_post(db: Session, post_id: int) -> bool:
     post = db.query(Post).filter(Post.id == post_id, Post.is_deleted == True).first()
     if not post:
         return False
     post.is_deleted = False
+    post.deleted_at = None
     # replies도 함께 복구
-    db.query(Post).filter(Post.parent_id == post_id, Post.is_deleted == True).update({"is_deleted": False})
+    db.query(Post).filter(Post.parent_id == post_id, Post.is_deleted == True).update(
+        {"is_deleted": False, "deleted_at": None}
+    )
+    db.flush()
+    _refresh_counters_after_visibility_change(db, post)
+    events.record(db, events.POST_RESTORED, _board_slug(db, post.board_id), post_id=post.id, parent_id=post.parent_id)
+    return True
+
+
+def restore_post(db: Session, post_id: int) -> bool:
+    """소프트 삭제된 글을 복구한다."""
+    if not _restore_post(db, post_id):
+        return False
     db.commit()
     return True
 
 
 def search_posts(db: Session, keyword: str, board_slug: str | None = None, limit: int = 20) -> list[dict]:
-    query = db.query(Post).filter(
-        Post.parent_id == None,
-        Post.is_deleted == False,
-        (Post.title.contains(keyword) | Post.content.contains(keyword)),
-    )
+    """FTS5(trigram) 검색. bm25 순위(제목 가중)로 정렬하고 하이라이트 발췌문을 붙인다.
+
+    핫 테이블 결과가 limit보다 적을 때만 보관소를 이어서 검색해 뒤에 붙인다.
+    """
+    long_terms, short_terms = fts.split_terms(keyword)
+    if not long_terms and not short_terms:
+        return []
+    board_id = None
     if board_slug:
         board = db.query(Board).filter(Board.slug == board_slug).first()
         if board:
-            query = query.filter(Post.board_id == board.id)
-    posts = query.order_by(desc(Post.created_at)).limit(limit).all()
-    result = []
-    for p in posts:
-        board = db.query(Board).filter(Board.id == p.board_id).first()
-        reply_count = db.query(func.count(Post.id)).filter(Post.parent_id == p.id, Post.is_deleted == False).scalar()
-        like_info = _get_like_info(db, p.id)
-        result.append({"post": p, "reply_count": reply_count, "board": board, **like_info})
+            board_id = board.id
+
+    result = _search(db, Post, Like, fts.posts_fts, long_terms, short_terms, board_id, limit)
+    if len(result) < limit:
+        result += _search(
+            db, ArchivedPost, ArchivedLike, fts.archived_posts_fts, long_terms, short_terms, board_id,
+            limit - len(result),
+        )
+    return result
+
+
+def _search(
+    db: Session, post_cls, like_cls, fts_posts, long_terms: list[str], short_terms: list[str],
+    board_id: int | None, limit: int,
+) -> list[dict]:
+    if long_terms:
+        query = (
+            db.query(post_cls, fts.snippet())
+            .join(fts_posts, fts_posts.c.rowid == post_cls.id)
+            .filter(fts.fts_table.op("MATCH")(fts.match_expr(long_terms)))
+            .order_by(func.bm25(fts.fts_table, 10.0, 1.0), desc(post_cls.created_at))
+        )
+    else:
+        # 3글자 미만 검색어만 있으면 trigram 인덱스를 쓸 수 없어 최신순 LIKE로 찾는다
+        query = db.query(post_cls).order_by(desc(post_cls.created_at))
+    query = query.filter(post_cls.parent_id == None, post_cls.is_deleted == False)
+    for term in short_terms:
+        query = query.filter(
+            post_cls.title.contains(term, autoescape=True) | post_cls.content.contains(term, autoescape=True)
+        )
+    if board_id is not None:
+        query = query.filter(post_cls.board_id == board_id)
+    rows = query.limit(limit).all()
+
+    if long_terms:
+        posts = [p for p, _ in rows]
+        snippets = {p.id: fts.highlight(s) for p, s in rows}
+    else:
+        posts = rows
+        snippets = {p.id: fts.make_snippet([p.content, p.title], short_terms) for p in posts}
+    result = _with_stats(db, posts, with_board=True, like_cls=like_cls)
+    for item in result:
+        item["snippet"] = snippets[item["post"].id]
     return result
 
 
 def get_recent_posts(db: Session, limit: int = 10) -> list[dict]:
+    return cache.cached(db, ("recent", limit), [cache.RECENT], lambda: _query_recent_posts(db, limit))
+
+
+def _query_recent_posts(db: Session, limit: int) -> list[dict]:
     posts = (
         db.query(Post)
         .filter(Post.parent_id == None, Post.is_deleted == False)
@@ -193,40 +469,46 @@ def get_recent_posts(db: Session, limit: int = 10) -> list[dict]:
         .limit(limit)
         .all()
     )
-    result = []
-    for p in posts:
-        board = db.query(Board).filter(Board.id == p.board_id).first()
-        reply_count = db.query(func.count(Post.id)).filter(Post.parent_id == p.id, Post.is_deleted == False).scalar()
-        like_info = _get_like_info(db, p.id)
-        result.append({"post": p, "reply_count": reply_count, "board": board, **like_info})
-    return result
+    return _with_stats(db, posts, with_board=True)
 
 
 def get_post_count(db: Session, board_id: int) -> int:
-    return (
-        db.query(func.count(Post.id))
-        .filter(Post.board_id == board_id, Post.parent_id == None, Post.is_deleted == False)
-        .scalar()
-    )
+    return db.query(Board.post_count).filter(Board.id == board_id).scalar() or 0
 
 
 # ── Like ──────────────────────────────────────────
 
-def toggle_like(db: Session, post_id: int, author: str) -> dict:
-    """좋아요 토글. 이미 있으면 취소, 없으면 추가."""
+def _toggle_like(db: Session, post_id: int, author: str) -> str:
     post = db.query(Post).filter(Post.id == post_id, Post.is_deleted == False).first()
     if not post:
         raise ValueError(f"Post {post_id} not found")
-    existing = db.query(Like).filter(Like.post_id == post_id, Like.author == author).first()
+    author_id = authors.intern(db, author)
+    existing = db.query(Like).filter(Like.post_id == post_id, Like.author_id == author_id).first()
     if existing:
         db.delete(existing)
-        db.commit()
+        _bump(db, post_id, like_count=Post.like_count - 1)
         action = "unliked"
     else:
-        like = Like(post_id=post_id, author=author)
+        like = Like(post_id=post_id, author_id=author_id)
         db.add(like)
-        db.commit()
+        _bump(db, post_id, like_count=Post.like_count + 1)
         action = "liked"
+    cache.invalidate(db, cache.board(post.board_id), cache.RECENT)
+    events.record(
+        db, events.LIKE_TOGGLED, _board_slug(db, post.board_id),
+        post_id=post_id, parent_id=post.parent_id, author=author, action=action,
+    )
+    return action
+
+
+def toggle_like(db: Session, post_id: int, author: str) -> dict:
+    """좋아요 토글. 이미 있으면 취소, 없으면 추가."""
+    action = _toggle_like(db, post_id, author)
+    db.commit()
+    return like_result(db, post_id, action)
+
+
+def like_result(db: Session, post_id: int, action: str) -> dict:
     return {"action": action, **_get_like_info(db, post_id)}
 
 
@@ -234,6 +516,56 @@ def get_likes(db: Session, post_id: int) -> dict:
     return _get_like_info(db, post_id)
 
 
+# ── Batch ───────────────────────────────────────────
+
+def _batch_update_post(db: Session, op) -> dict:
+    post = _update_post(db, op.post_id, op.title, op.content)
+    if not post:
+        raise ValueError(f"Post {op.post_id} not found")
+    return serializers.updated_post(post)
+
+
+def _batch_delete_post(db: Session, op) -> dict:
+    if not _delete_post(db, op.post_id):
+        raise ValueError(f"Post {op.post_id} not found")
+    return {"post_id": op.post_id}
+
+
+def _batch_toggle_like(db: Session, op) -> dict:
+    action = _toggle_like(db, op.post_id, op.author)
+    db.flush()
+    return {"post_id": op.post_id, "action": action, **_get_like_info(db, op.post_id)}
+
+
+_BATCH_OPS = {
+    "create_post": lambda db, op: serializers.created_post(_create_post(db, op)),
+    "create_reply": lambda db, op: serializers.created_reply(_create_reply(db, op.post_id, op)),
+    "toggle_like": _batch_toggle_like,
+    "update_post": _batch_update_post,
+    "delete_post": _batch_delete_post,
+}
+
+
+def run_batch(db: Session, batch: BatchRequest) -> dict:
+    """여러 쓰기를 한 트랜잭션에서 순서대로 실행하고 한 번만 커밋한다.
+
+    하나라도 실패하면 전체를 롤백한다. 결과는 작업마다 status(ok / error / rolled_back / skipped)를 담는다.
+    이벤트·캐시 무효화는 커밋 때 한꺼번에 반영된다.
+    """
+    results = []
+    for index, op in enumerate(batch.operations):
+        try:
+            results.append({"op": op.op, "status": "ok", **_BATCH_OPS[op.op](db, op)})
+        except ValueError as e:
+            db.rollback()
+            results = [{"op": r["op"], "status": "rolled_back"} for r in results]
+            results.append({"op": op.op, "status": "error", "error": str(e)})
+            results += [{"op": rest.op, "status": "skipped"} for rest in batch.operations[index + 1:]]
+            return {"committed": False, "failed_index": index, "results": results}
+    db.commit()
+    return {"committed": True, "failed_index": None, "results": results}
+
+
 def get_last_activity(db: Session) -> dict:
     """글 작성/수정/댓글/좋아요 중 가장 최근 활동 시간을 반환한다."""
     last_post_at = db.query(func.max(Post.created_at)).filter(
@@ -1,24 +1,102 @@
 import os
+from urllib.parse import quote
+
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app import migrations, slowlog
 
 DB_PATH = os.getenv("DB_PATH", "/app/data/board.db")
+# 오래된 스레드 보관소 (app.archive). 모든 연결에 archive 스키마로 붙는다
+ARCHIVE_PATH = os.getenv("ARCHIVE_PATH") or os.path.join(os.path.dirname(DB_PATH), "archive.db")
 DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
+# 읽기 전용 연결 (SQLite URI mode=ro). WAL에서는 쓰기와 상관없이 동시에 읽는다
+_READ_URI = f"file:{quote(os.path.abspath(DB_PATH))}?mode=ro&uri=true"
+READ_DATABASE_URL = f"sqlite:///{_READ_URI}"
+ASYNC_READ_DATABASE_URL = f"sqlite+aiosqlite:///{_READ_URI}"
+READ_CACHE_MB = int(os.getenv("DB_READ_CACHE_MB", "32"))  # 읽기 연결마다 (지연 할당)
+READ_MMAP_MB = int(os.getenv("DB_READ_MMAP_MB", "256"))  # 프로세스 전체가 OS 페이지 캐시를 공유
 
+# 동기 엔진: 시작 시 마이그레이션/시드, CLI 도구, 쓰기 큐(app.writer)용
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False, "timeout": 30},
 )
 
+# 비동기 쓰기 엔진: 웹 요청의 쓰기. SQLite는 쓰기를 하나씩만 받으므로 연결 하나로 직렬화해
+# busy_timeout 경쟁 대신 풀에서 차례를 기다리게 한다.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args={"timeout": 30},
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=1,
+    max_overflow=0,
+)
+
+# 비동기 읽기 엔진: GET 라우트용. aiosqlite 기본값(NullPool) 대신 연결을 재사용한다.
+async_read_engine = create_async_engine(
+    ASYNC_READ_DATABASE_URL,
+    connect_args={"timeout": 30},
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_POOL_OVERFLOW", "20")),
+)
+
+# 동기 읽기 엔진: MCP direct 모드 GET, 작성자 이름 캐시(app.authors)용
+read_engine = create_engine(
+    READ_DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": 30},
+)
+
 
-@event.listens_for(engine, "connect")
 def _set_sqlite_pragma(dbapi_conn, _):
-    dbapi_conn.execute("PRAGMA journal_mode=WAL")
-    dbapi_conn.execute("PRAGMA synchronous=NORMAL")
-    dbapi_conn.execute("PRAGMA busy_timeout=30000")
+    cursor = dbapi_conn.cursor()
+    # 새 DB 파일에만 바로 적용된다. 기존 DB는 `python -m app.retention vacuum`을 한 번 돌려야 바뀐다
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.execute("ATTACH DATABASE ? AS archive", (ARCHIVE_PATH,))
+    cursor.execute("PRAGMA archive.auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA archive.journal_mode=WAL")
+    cursor.execute("PRAGMA archive.synchronous=NORMAL")
+    cursor.close()
+
+
+def _set_read_pragma(dbapi_conn, _):
+    """읽기 연결은 쓰기 잠금을 잡지 않도록 query_only로 막고, 캐시와 mmap을 넉넉히 준다.
 
+    journal_mode(WAL)와 auto_vacuum은 DB 파일에 남는 설정이라 쓰기 연결이 정한 값을 그대로 쓴다.
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA busy_timeout=30000")
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.execute("ATTACH DATABASE ? AS archive", (f"file:{quote(os.path.abspath(ARCHIVE_PATH))}?mode=ro",))
+    for schema in ("main", "archive"):
+        cursor.execute(f"PRAGMA {schema}.cache_size={-READ_CACHE_MB * 1024}")
+        cursor.execute(f"PRAGMA {schema}.mmap_size={READ_MMAP_MB * 1024 * 1024}")
+    cursor.close()
+
+
+event.listen(engine, "connect", _set_sqlite_pragma)
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragma)
+event.listen(read_engine, "connect", _set_read_pragma)
+event.listen(async_read_engine.sync_engine, "connect", _set_read_pragma)
+
+# 이벤트 리스너(app.metrics, app.slowlog)를 걸 대상
+ALL_ENGINES = [engine, async_engine.sync_engine, read_engine, async_read_engine.sync_engine]
+
+if slowlog.ENABLED:
+    slowlog.install(ALL_ENGINES, DB_PATH, ARCHIVE_PATH)
 
 SessionLocal = sessionmaker(bind=engine)
+ReadSessionLocal = sessionmaker(bind=read_engine)
+# 커밋 후 속성을 다시 읽으면 비동기 세션에서 지연 로딩이 일어나므로 expire하지 않는다
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -33,5 +111,23 @@ def get_db():
         db.close()
 
 
-def init_db():
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """GET 라우트용 읽기 전용 세션. 쓰기를 시도하면 `attempt to write a readonly database`로 실패한다."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def init_db() -> list[int]:
+    """테이블 생성 후 밀린 마이그레이션을 적용하고 보관소 스키마를 맞춘다. 적용한 버전 목록을 반환."""
+    from app import archive, models  # noqa: F401 — 테이블을 Base.metadata에 등록
+
     Base.metadata.create_all(bind=engine)
+    applied = migrations.run_migrations(engine)
+    with engine.begin() as conn:
+        archive.ensure_schema(conn)
+    return applied
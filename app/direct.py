@@ -0,0 +1,182 @@
+"""REST API의 프로세스 내 실행기 (MCP 서버 direct 모드용).
+
+mcp_server.py가 BOARD_MODE=direct일 때 HTTP 대신 call()로 같은 경로를 호출한다.
+라우트마다 crud 함수를 같은 SQLite 파일에 직접 실행하고 serializers로 응답을 만들어,
+HTTP 모드와 응답(본문, X-Next-Cursor 헤더)이 같다. 실패는 상태 코드를 담은 ApiError로 올린다.
+
+direct 모드의 쓰기도 같은 DB의 활동 번호와 events 표(app.activity, app.events)에 기록되므로,
+웹 서버의 /api/last-activity와 /api/events(SSE)에 EXTERNAL_POLL_INTERVAL 안에 나타난다.
+"""
+
+import re
+from typing import Callable
+
+from app import activity, crud, serializers
+from app.database import ReadSessionLocal, SessionLocal, init_db
+from app.schemas import BatchRequest, BoardCreate, LikeCreate, PostCreate, PostUpdate, ReplyCreate
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"{status} {detail}")
+        self.status = status
+        self.detail = detail
+
+
+_routes: list[tuple[str, re.Pattern, Callable]] = []
+
+
+def _route(method: str, pattern: str):
+    def decorator(fn):
+        _routes.append((method, re.compile(pattern + "$"), fn))
+        return fn
+    return decorator
+
+
+def _int(params: dict, name: str, default: int) -> int:
+    return int(params.get(name, default))
+
+
+def _bool(params: dict, name: str) -> bool:
+    return str(params.get(name, "")).lower() in ("1", "true", "yes", "on")
+
+
+# ── Routes (app/main.py REST API와 동일) ─────────────
+
+@_route("GET", r"/api/boards")
+def _list_boards(db, params, body):
+    return serializers.board_list(crud.get_boards(db)), {}
+
+
+@_route("GET", r"/api/posts")
+def _list_posts(db, params, body):
+    limit = _int(params, "limit", 20)
+    headers = {}
+    if params.get("board_slug"):
+        board = crud.get_board_by_slug(db, params["board_slug"])
+        if not board:
+            raise ApiError(404, "Board not found")
+        list_posts = crud.get_archived_posts if _bool(params, "archived") else crud.get_posts
+        try:
+            posts = list_posts(db, board.id, limit, _int(params, "offset", 0), params.get("cursor"))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        next_cursor = crud.next_cursor(posts, limit)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+    else:
+        posts = crud.get_recent_posts(db, limit)
+    return serializers.post_list(posts), headers
+
+
+@_route("GET", r"/api/posts/(\d+)")
+def _get_post(db, params, body, post_id):
+    data = crud.get_post(db, post_id)
+    if not data:
+        raise ApiError(404, "Post not found")
+    return serializers.post_detail(data), {}
+
+
+@_route("POST", r"/api/posts")
+def _create_post(db, params, body):
+    try:
+        post = crud.create_post(db, PostCreate(**body))
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    return serializers.created_post(post), {}
+
+
+@_route("POST", r"/api/posts/(\d+)/reply")
+def _create_reply(db, params, body, post_id):
+    try:
+        reply = crud.create_reply(db, post_id, ReplyCreate(**body))
+    except ValueError as e:
+        raise ApiError(404, str(e))
+    return serializers.created_reply(reply), {}
+
+
+@_route("POST", r"/api/posts/(\d+)/like")
+def _toggle_like(db, params, body, post_id):
+    try:
+        return crud.toggle_like(db, post_id, LikeCreate(**body).author), {}
+    except ValueError as e:
+        raise ApiError(404, str(e))
+
+
+@_route("GET", r"/api/posts/(\d+)/likes")
+def _get_likes(db, params, body, post_id):
+    return crud.get_likes(db, post_id), {}
+
+
+@_route("PUT", r"/api/posts/(\d+)")
+def _update_post(db, params, body, post_id):
+    data = PostUpdate(**body)
+    post = crud.update_post(db, post_id, data.title, data.content)
+    if not post:
+        raise ApiError(404, "Post not found")
+    return serializers.updated_post(post), {}
+
+
+@_route("DELETE", r"/api/posts/(\d+)")
+def _delete_post(db, params, body, post_id):
+    if not crud.delete_post(db, post_id):
+        raise ApiError(404, "Post not found")
+    return {"ok": True}, {}
+
+
+@_route("POST", r"/api/posts/(\d+)/restore")
+def _restore_post(db, params, body, post_id):
+    if not crud.restore_post(db, post_id):
+        raise ApiError(404, "Post not found or not deleted")
+    return {"ok": True, "post_id": post_id}, {}
+
+
+@_route("POST", r"/api/boards")
+def _create_board(db, params, body):
+    data = BoardCreate(**body)
+    if crud.get_board_by_slug(db, data.slug):
+        raise ApiError(409, f"Board '{data.slug}' already exists")
+    return serializers.created_board(crud.create_board(db, data)), {}
+
+
+@_route("POST", r"/api/batch")
+def _batch(db, params, body):
+    return crud.run_batch(db, BatchRequest(**body)), {}
+
+
+@_route("GET", r"/api/search")
+def _search(db, params, body):
+    results = crud.search_posts(db, params["q"], params.get("board_slug"), _int(params, "limit", 20))
+    return serializers.post_summaries(results), {}
+
+
+@_route("GET", r"/api/recent")
+def _recent(db, params, body):
+    return serializers.post_summaries(crud.get_recent_posts(db, _int(params, "limit", 10))), {}
+
+
+@_route("GET", r"/api/last-activity")
+def _last_activity(db, params, body):
+    return serializers.last_activity(crud.get_last_activity(db)), {}
+
+
+# ── Entry point ──────────────────────────────────────
+
+_ready = False
+
+
+def call(method: str, path: str, params: dict | None = None, json: dict | None = None) -> tuple[object, dict]:
+    """(응답 본문, 응답 헤더)를 반환한다. 첫 호출 때 스키마 마이그레이션을 확인한다."""
+    global _ready
+    if not _ready:
+        init_db()
+        _ready = True
+    for route_method, pattern, handler in _routes:
+        match = pattern.match(path)
+        if route_method == method and match:
+            args = [int(g) for g in match.groups()]
+            activity.check_external()  # 웹 서버 등 다른 프로세스의 쓰기를 캐시에 반영한다
+            # GET은 웹 서버와 같이 읽기 전용 연결로 처리한다
+            with (ReadSessionLocal if method == "GET" else SessionLocal)() as db:
+                return handler(db, params or {}, json or {}, *args)
+    raise ApiError(404, "Not Found")
@@ -0,0 +1,92 @@
+"""변경 이벤트 피드 (/api/events SSE).
+
+crud 쓰기 함수가 record()로 세션에 이벤트를 쌓으면, 커밋 직전 같은 트랜잭션에서 events 표에 넣는다.
+롤백되면 이벤트도 함께 사라지고, id(AUTOINCREMENT)는 워커·재시작과 관계없이 하나의 순서로 이어진다.
+표에는 최근 BUFFER_SIZE개만 남기므로 느린 구독자가 공간을 붙잡지 않는다. 구독자는 자신이 마지막으로 받은 id만
+들고 표를 읽고, 그 사이 밀려난 이벤트가 있으면 reset 이벤트를 받는다. SSE id에는 DB의 epoch(app.activity)를
+붙이므로(`<epoch>-<id>`), 새로 만든 DB의 id를 옛 DB의 id로 착각하지 않고 reset을 받는다. 새 이벤트는 활동 버전(app.activity)이
+바뀌는 것으로 알아채므로 다른 워커의 쓰기도 EXTERNAL_POLL_INTERVAL 안에 전달된다.
+"""
+
+import json
+import os
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app import activity
+from app.database import async_read_engine
+
+BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "1000"))
+if BUFFER_SIZE < 1:
+    raise ValueError(f"EVENT_BUFFER_SIZE must be at least 1, got {BUFFER_SIZE}")
+READ_BATCH = 200  # since()가 한 번에 읽는 최대 수
+
+POST_CREATED = "post-created"
+REPLY_CREATED = "reply-created"
+POST_UPDATED = "post-updated"
+POST_DELETED = "post-deleted"
+POST_RESTORED = "post-restored"
+LIKE_TOGGLED = "like-toggled"
+BOARD_CREATED = "board-created"
+
+_INSERT = text(
+    "INSERT INTO events (type, board_slug, data, created_at)"
+    " VALUES (:type, :board_slug, :data, CURRENT_TIMESTAMP) RETURNING id"
+)
+_PRUNE = text("DELETE FROM events WHERE id <= :cutoff")
+_SINCE = text("SELECT id, type, board_slug, data FROM events WHERE id > :last ORDER BY id LIMIT :limit")
+_NEWEST = text("SELECT coalesce(max(id), 0) FROM events")
+
+
+def record(db: Session, type_: str, board_slug: str | None, **data):
+    """이 세션이 커밋되면 발행할 이벤트를 남긴다. 활동 버전(touch)도 함께 기록된다."""
+    db.info.setdefault("pending_events", []).append({"type": type_, "board_slug": board_slug, "data": data})
+    activity.touch(db)
+
+
+@activity.before_commit
+def _write(session: Session):
+    pending = session.info.pop("pending_events", None)
+    if not pending:
+        return
+    for item in pending:
+        newest = session.execute(_INSERT, {**item, "data": json.dumps(item["data"], ensure_ascii=False)}).scalar_one()
+    session.execute(_PRUNE, {"cutoff": newest - BUFFER_SIZE})
+
+
+def format_id(event_id: int) -> str:
+    return f"{activity.current_epoch()}-{event_id}"
+
+
+def parse_id(value: str) -> int | None:
+    """format_id()의 반대. 다른 epoch(다른 DB)의 id이거나 형식이 틀리면 None."""
+    epoch, _, number = value.strip().rpartition("-")
+    if epoch != activity.current_epoch() or not number.isdigit():
+        return None
+    return int(number)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session):
+    session.info.pop("pending_events", None)
+
+
+async def last_id() -> int:
+    async with async_read_engine.connect() as conn:
+        return (await conn.execute(_NEWEST)).scalar()
+
+
+async def since(last: int) -> tuple[list[dict], bool]:
+    """last 이후 이벤트(최대 READ_BATCH개)와, 그 사이 놓친 이벤트가 있는지(재동기화 필요) 여부를 반환한다."""
+    async with async_read_engine.connect() as conn:
+        rows = (await conn.execute(_SINCE, {"last": last, "limit": READ_BATCH})).all()
+        if not rows:
+            # DB를 새로 만들었거나 백업에서 되돌려 id가 처음부터 다시 시작된 경우
+            return [], last > (await conn.execute(_NEWEST)).scalar()
+    # id는 빈틈없이 이어지므로(롤백되면 번호도 돌아간다) 첫 id가 last + 1이 아니면 그 사이가 잘려 나간 것이다
+    batch = [
+        {"id": id_, "type": type_, "board_slug": board_slug, "data": json.loads(data)}
+        for id_, type_, board_slug, data in rows
+    ]
+    return batch, batch[0]["id"] > last + 1
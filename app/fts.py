@@ -0,0 +1,139 @@
+"""SQLite FTS5 전문 검색 인덱스.
+
+posts 테이블을 외부 콘텐츠로 쓰는 trigram FTS5 테이블을 트리거로 동기화한다.
+trigram 토크나이저는 띄어쓰기와 형태소에 상관없이 부분 문자열을 찾으므로 한국어에 맞다.
+
+기존 DB 재색인: python -m app.fts rebuild
+"""
+
+import html
+import sys
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, func, literal_column, text
+from sqlalchemy.engine import Connection
+
+MIN_TERM_LEN = 3  # trigram 인덱스가 쓰이는 최소 검색어 길이
+MARK_OPEN, MARK_CLOSE = "<mark>", "</mark>"
+# snippet()/make_snippet()이 먼저 끼우는 표시. 본문을 HTML 이스케이프한 뒤에 <mark>로 바꾼다 (사용자 영역 문자)
+_SENTINEL_OPEN, _SENTINEL_CLOSE = "\ue000", "\ue001"
+SNIPPET_TOKENS = 16
+
+# 쿼리 작성용 테이블 정의. Base.metadata에 넣지 않아 create_all 대상이 아니다.
+def _fts_table(schema: str | None = None) -> Table:
+    return Table(
+        "posts_fts", MetaData(),
+        Column("rowid", Integer, primary_key=True),
+        Column("title", Text),
+        Column("content", Text),
+        schema=schema,
+    )
+
+
+posts_fts = _fts_table()
+archived_posts_fts = _fts_table("archive")  # app.archive 보관소. FROM에서 이름이 같아 fts_table로 가리킨다
+fts_table = literal_column("posts_fts")
+
+# 댓글은 검색 대상이 아니므로 최상위 글(parent_id IS NULL)만 색인한다.
+# {schema}는 main 또는 보관소(archive, app.archive). 트리거 안의 이름은 트리거와 같은 스키마를 가리킨다.
+_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS {schema}.posts_fts_ai AFTER INSERT ON posts
+    WHEN new.parent_id IS NULL BEGIN
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {schema}.posts_fts_ad AFTER DELETE ON posts
+    WHEN old.parent_id IS NULL BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {schema}.posts_fts_au AFTER UPDATE OF title, content ON posts
+    WHEN old.parent_id IS NULL BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+
+def _fts_exists(conn: Connection, schema: str) -> bool:
+    query = f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = 'posts_fts'"
+    return conn.execute(text(query)).first() is not None
+
+
+def ensure_fts(conn: Connection, schema: str = "main"):
+    """FTS 테이블과 트리거를 만든다. 처음 만들 때 기존 글이 있으면 바로 색인한다."""
+    created = not _fts_exists(conn, schema)
+    for ddl in _DDL:
+        conn.execute(text(ddl.format(schema=schema)))
+    if created:
+        rebuild(conn, schema)
+
+
+def rebuild(conn: Connection, schema: str = "main") -> int:
+    """FTS 인덱스를 posts 기준으로 다시 만든다. 색인된 글 수를 반환한다."""
+    conn.execute(text(f"INSERT INTO {schema}.posts_fts(posts_fts) VALUES ('delete-all')"))
+    result = conn.execute(text(
+        f"INSERT INTO {schema}.posts_fts(rowid, title, content) "
+        f"SELECT id, title, content FROM {schema}.posts WHERE parent_id IS NULL"
+    ))
+    conn.execute(text(f"INSERT INTO {schema}.posts_fts(posts_fts) VALUES ('optimize')"))
+    return result.rowcount
+
+
+def split_terms(keyword: str) -> tuple[list[str], list[str]]:
+    """검색어를 (FTS MATCH용, LIKE 보조 필터용) 두 묶음으로 나눈다.
+
+    trigram은 3글자 미만 부분 문자열을 색인하지 않으므로 짧은 단어는 LIKE로 거른다.
+    """
+    terms = list(dict.fromkeys(t for t in keyword.split() if t))
+    long_terms = [t for t in terms if len(t) >= MIN_TERM_LEN]
+    short_terms = [t for t in terms if len(t) < MIN_TERM_LEN]
+    return long_terms, short_terms
+
+
+def match_expr(terms: list[str]) -> str:
+    """각 단어를 FTS5 구문(phrase)으로 감싸 AND 검색식을 만든다."""
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def snippet():
+    """FTS5 snippet() 식. 원문 그대로이므로 결과는 highlight()로 HTML을 만든다."""
+    return func.snippet(fts_table, -1, _SENTINEL_OPEN, _SENTINEL_CLOSE, "…", SNIPPET_TOKENS)
+
+
+def highlight(raw: str | None) -> str:
+    """표시가 끼워진 원문 발췌를 이스케이프된 HTML로 바꾼다. 원문의 태그는 글자 그대로 보인다."""
+    escaped = html.escape(raw or "", quote=False)
+    return escaped.replace(_SENTINEL_OPEN, MARK_OPEN).replace(_SENTINEL_CLOSE, MARK_CLOSE)
+
+
+def make_snippet(texts: list[str | None], terms: list[str], width: int = 40) -> str:
+    """FTS snippet()을 쓸 수 없는 LIKE 검색 결과용 하이라이트 발췌문(HTML). 처음 일치하는 텍스트에서 뽑는다."""
+    bodies = [(t or "").replace("\n", " ").replace(_SENTINEL_OPEN, "").replace(_SENTINEL_CLOSE, "") for t in texts]
+    for body in bodies:
+        lower = body.lower()
+        hits = [(lower.find(t.lower()), t) for t in terms]
+        hits = [(i, t) for i, t in hits if i >= 0]
+        if not hits:
+            continue
+        pos, term = min(hits)
+        start = max(0, pos - width)
+        end = min(len(body), pos + len(term) + width)
+        excerpt = (body[start:pos] + _SENTINEL_OPEN + body[pos:pos + len(term)] + _SENTINEL_CLOSE
+                   + body[pos + len(term):end])
+        return highlight(("…" if start > 0 else "") + excerpt + ("…" if end < len(body) else ""))
+    body = bodies[-1] if bodies else ""
+    return highlight(body[:width * 2] + ("…" if len(body) > width * 2 else ""))
+
+
+if __name__ == "__main__":
+    from app.database import engine, init_db
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m app.fts rebuild")
+        sys.exit(1)
+    init_db()
+    with engine.begin() as conn:
+        count = rebuild(conn)
+        archived = rebuild(conn, "archive")
+    print(f"posts_fts 재색인 완료: {count}개 글 (보관소 {archived}개)")
@@ -1,32 +1,46 @@
+import asyncio
+import hashlib
+import json
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-from fastapi import FastAPI, Depends, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, Form
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db, init_db
-from app.seed import seed_data
-from app import crud
-from app.schemas import BoardCreate, PostCreate, PostUpdate, ReplyCreate, LikeCreate
+from app.database import ReadSessionLocal, async_engine, async_read_engine, get_async_db, get_async_read_db
+from app import (
+    acrud, activity, backup, crud, events, metrics, retention, serializers, slowlog, startup, transfer, writer,
+)
+from app.schemas import BatchRequest, BoardCreate, PostCreate, PostUpdate, ReplyCreate, LikeCreate
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    init_db()
-    db = next(get_db())
-    try:
-        seed_data(db)
-    finally:
-        db.close()
+    # 여러 워커 중 하나만 스키마·시드를 준비하고, 나머지는 지문 확인 한 번으로 넘어간다 (app.startup)
+    await asyncio.to_thread(startup.prepare)
+    await asyncio.to_thread(activity.check_external)  # DB의 활동 번호로 시작한다
+    if (retention.ENABLED or backup.ENABLED) and startup.lead_jobs():
+        if retention.ENABLED:
+            retention.start()
+        if backup.ENABLED:
+            backup.start()
     yield
+    await asyncio.to_thread(backup.stop)
+    await asyncio.to_thread(retention.stop)
+    startup.release_jobs()
+    await asyncio.to_thread(writer.stop)
+    await async_engine.dispose()
+    await async_read_engine.dispose()
 
 
 app = FastAPI(title="Claude Board", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 templates = Jinja2Templates(directory="app/templates")
+if metrics.ENABLED:
+    metrics.install(app, templates)
 
 
 def _time_ago(dt: datetime) -> str:
@@ -51,30 +65,46 @@ templates.env.filters["time_ago"] = _time_ago
 # ── HTML Pages ───────────────────────────────────────
 
 @app.get("/", response_class=HTMLResponse)
-def index(request: Request, db: Session = Depends(get_db)):
-    boards = crud.get_boards(db)
+async def index(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    boards = await acrud.get_boards(db)
     return templates.TemplateResponse("index.html", {"request": request, "boards": boards})
 
 
+MAX_NUMBERED_PAGES = 10  # 이후 페이지는 키셋 커서("더 오래된 글")로 넘긴다
+
+
 @app.get("/board/{slug}", response_class=HTMLResponse)
-def board_page(slug: str, request: Request, page: int = 1, db: Session = Depends(get_db)):
-    board = crud.get_board_by_slug(db, slug)
+async def board_page(
+    slug: str, request: Request, page: int = 1, cursor: str | None = None, archived: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """archived=1이면 보관소(app.archive)로 옮겨진 글을 같은 방식으로 보여준다."""
+    board = await acrud.get_board_by_slug(db, slug)
     if not board:
         raise HTTPException(404, "게시판을 찾을 수 없습니다")
     limit = 20
-    offset = (page - 1) * limit
-    posts = crud.get_posts(db, board.id, limit=limit, offset=offset)
-    total = crud.get_post_count(db, board.id)
+    list_posts = acrud.get_archived_posts if archived else acrud.get_posts
+    try:
+        if cursor:
+            posts = await list_posts(db, board.id, limit=limit, cursor=cursor)
+        else:
+            offset = (page - 1) * limit
+            posts = await list_posts(db, board.id, limit=limit, offset=offset)
+    except ValueError:
+        raise HTTPException(400, "잘못된 페이지 커서입니다")
+    total = await (acrud.get_archived_count if archived else acrud.get_post_count)(db, board.id)
     total_pages = max(1, (total + limit - 1) // limit)
     return templates.TemplateResponse("board.html", {
-        "request": request, "board": board, "posts": posts,
+        "request": request, "board": board, "posts": posts, "archived": archived,
         "page": page, "total_pages": total_pages, "total": total,
+        "cursor": cursor, "next_cursor": crud.next_cursor(posts, limit),
+        "numbered_pages": min(total_pages, MAX_NUMBERED_PAGES),
     })
 
 
 @app.get("/post/{post_id}", response_class=HTMLResponse)
-def post_page(post_id: int, request: Request, db: Session = Depends(get_db)):
-    data = crud.get_post(db, post_id)
+async def post_page(post_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    data = await acrud.get_post(db, post_id)
     if not data:
         raise HTTPException(404, "게시글을 찾을 수 없습니다")
     return templates.TemplateResponse("post.html", {"request": request, **data})
@@ -83,14 +113,14 @@ def post_page(post_id: int, request: Request, db: Session = Depends(get_db)):
 # ── Like Form Action ────────────────────────────────
 
 @app.post("/action/like/{post_id}")
-def action_toggle_like(
+async def action_toggle_like(
     post_id: int,
     author: str = Form(...),
     redirect_to: str = Form(""),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     try:
-        crud.toggle_like(db, post_id, author)
+        await acrud.toggle_like(db, post_id, author)
     except ValueError:
         raise HTTPException(404, "게시글을 찾을 수 없습니다")
     target = redirect_to or f"/post/{post_id}"
@@ -98,8 +128,8 @@ def action_toggle_like(
 
 
 @app.get("/new/{slug}", response_class=HTMLResponse)
-def new_post_page(slug: str, request: Request, db: Session = Depends(get_db)):
-    board = crud.get_board_by_slug(db, slug)
+async def new_post_page(slug: str, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    board = await acrud.get_board_by_slug(db, slug)
     if not board:
         raise HTTPException(404, "게시판을 찾을 수 없습니다")
     return templates.TemplateResponse("new_post.html", {"request": request, "board": board})
@@ -108,209 +138,336 @@ def new_post_page(slug: str, request: Request, db: Session = Depends(get_db)):
 # ── Form Actions ─────────────────────────────────────
 
 @app.post("/action/post")
-def action_create_post(
+async def action_create_post(
     board_slug: str = Form(...),
     title: str = Form(...),
     content: str = Form(...),
     author: str = Form(...),
     prefix: str = Form(""),
     tag: str = Form(""),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     data = PostCreate(
         board_slug=board_slug, title=title, content=content,
         author=author, prefix=prefix or None, tag=tag or None,
     )
-    post = crud.create_post(db, data)
+    post = await acrud.create_post(db, data)
     return RedirectResponse(f"/post/{post.id}", status_code=303)
 
 
 @app.post("/action/reply/{post_id}")
-def action_create_reply(
+async def action_create_reply(
     post_id: int,
     content: str = Form(...),
     author: str = Form(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     data = ReplyCreate(content=content, author=author)
-    crud.create_reply(db, post_id, data)
+    await acrud.create_reply(db, post_id, data)
     return RedirectResponse(f"/post/{post_id}", status_code=303)
 
 
+# ── Conditional GET ──────────────────────────────────
+
+def _validators(tag: str) -> dict:
+    # Last-Modified는 보내지 않는다. 좋아요 취소·댓글 삭제처럼 시각이 앞으로 가지 않는 변경이 있어
+    # If-Modified-Since로는 바뀐 응답을 304로 돌려줄 수 있다. 재검증은 ETag(If-None-Match)로만 한다.
+    return {"ETag": tag, "Cache-Control": "no-cache"}
+
+
+def _not_modified(request: Request, headers: dict) -> bool:
+    return activity.etag_matches(request.headers.get("if-none-match"), headers["ETag"])
+
+
+async def _activity_validators() -> dict:
+    """목록 응답용. 활동 버전은 모든 쓰기(다른 프로세스 포함)마다 바뀐다. 데이터를 읽기 전에 잡는다."""
+    return _validators(activity.etag(await activity.refresh()))
+
+
 # ── REST API ─────────────────────────────────────────
 
 @app.get("/api/boards")
-def api_list_boards(db: Session = Depends(get_db)):
-    boards = crud.get_boards(db)
-    return [
-        {
-            "id": b["board"].id, "name": b["board"].name, "slug": b["board"].slug,
-            "category": b["board"].category, "team": b["board"].team,
-            "icon": b["board"].icon, "description": b["board"].description,
-            "post_count": b["post_count"],
-        }
-        for b in boards
-    ]
+async def api_list_boards(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    headers = await _activity_validators()
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(serializers.board_list(await acrud.get_boards(db)), headers=headers)
 
 
 @app.get("/api/posts")
-def api_list_posts(board_slug: str | None = None, limit: int = 20, offset: int = 0, db: Session = Depends(get_db)):
+async def api_list_posts(
+    request: Request, board_slug: str | None = None, limit: int = 20, offset: int = 0,
+    cursor: str | None = None, archived: bool = False, db: AsyncSession = Depends(get_async_read_db),
+):
+    """board_slug가 있으면 게시판 글 목록(archived=true면 보관된 글), 없으면 최신 글."""
+    headers = await _activity_validators()
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
     if board_slug:
-        board = crud.get_board_by_slug(db, board_slug)
+        board = await acrud.get_board_by_slug(db, board_slug)
         if not board:
             raise HTTPException(404, "Board not found")
-        posts = crud.get_posts(db, board.id, limit=limit, offset=offset)
+        list_posts = acrud.get_archived_posts if archived else acrud.get_posts
+        try:
+            posts = await list_posts(db, board.id, limit=limit, offset=offset, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        # 다음 페이지 커서는 목록 응답 형태를 바꾸지 않도록 헤더로 내려준다
+        next_cursor = crud.next_cursor(posts, limit)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
     else:
-        posts = crud.get_recent_posts(db, limit=limit)
-    return [
-        {
-            "id": p["post"].id, "title": p["post"].title, "author": p["post"].author,
-            "prefix": p["post"].prefix, "tag": p["post"].tag, "is_pinned": p["post"].is_pinned,
-            "created_at": p["post"].created_at.isoformat(),
-            "updated_at": p["post"].updated_at.isoformat() if p["post"].updated_at else None,
-            "reply_count": p["reply_count"],
-            "like_count": p["like_count"], "liked_by": p["liked_by"],
-        }
-        for p in posts
-    ]
+        posts = await acrud.get_recent_posts(db, limit=limit)
+    return JSONResponse(serializers.post_list(posts), headers=headers)
 
 
 @app.get("/api/posts/{post_id}")
-def api_get_post(post_id: int, db: Session = Depends(get_db)):
-    data = crud.get_post(db, post_id)
+async def api_get_post(post_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """스레드 검증값을 집계 쿼리 하나로 먼저 읽어, 바뀌지 않았으면 본문을 만들지 않고 304를 준다."""
+    version = await acrud.get_post_version(db, post_id)
+    if not version:
+        raise HTTPException(404, "Post not found")
+    digest = hashlib.sha1(repr(version["key"]).encode()).hexdigest()[:16]
+    headers = _validators(f'"p{post_id}-{digest}"')
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    data = await acrud.get_post(db, post_id)
     if not data:
         raise HTTPException(404, "Post not found")
-    return {
-        "id": data["post"].id, "title": data["post"].title,
-        "content": data["post"].content, "author": data["post"].author,
-        "prefix": data["post"].prefix, "tag": data["post"].tag, "is_pinned": data["post"].is_pinned,
-        "created_at": data["post"].created_at.isoformat(),
-        "updated_at": data["post"].updated_at.isoformat() if data["post"].updated_at else None,
-        "board_slug": data["board"].slug, "board_name": data["board"].name,
-        "like_count": data["like_count"], "liked_by": data["liked_by"],
-        "replies": [
-            {
-                "id": r["reply"].id, "content": r["reply"].content, "author": r["reply"].author,
-                "created_at": r["reply"].created_at.isoformat(),
-                "updated_at": r["reply"].updated_at.isoformat() if r["reply"].updated_at else None,
-                "like_count": r["like_count"], "liked_by": r["liked_by"],
-            }
-            for r in data["replies"]
-        ],
-    }
+    return JSONResponse(serializers.post_detail(data), headers=headers)
 
 
 @app.post("/api/posts")
-def api_create_post(data: PostCreate, db: Session = Depends(get_db)):
+async def api_create_post(data: PostCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        post = crud.create_post(db, data)
+        post = await acrud.create_post(db, data)
     except ValueError as e:
         raise HTTPException(400, str(e))
-    return {"id": post.id, "title": post.title, "created_at": post.created_at.isoformat()}
+    return serializers.created_post(post)
 
 
 @app.post("/api/posts/{post_id}/reply")
-def api_create_reply(post_id: int, data: ReplyCreate, db: Session = Depends(get_db)):
+async def api_create_reply(post_id: int, data: ReplyCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        reply = crud.create_reply(db, post_id, data)
+        reply = await acrud.create_reply(db, post_id, data)
     except ValueError as e:
         raise HTTPException(404, str(e))
-    return {"id": reply.id, "created_at": reply.created_at.isoformat()}
+    return serializers.created_reply(reply)
 
 
 @app.post("/api/posts/{post_id}/like")
-def api_toggle_like(post_id: int, data: LikeCreate, db: Session = Depends(get_db)):
+async def api_toggle_like(post_id: int, data: LikeCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        result = crud.toggle_like(db, post_id, data.author)
+        result = await acrud.toggle_like(db, post_id, data.author)
     except ValueError as e:
         raise HTTPException(404, str(e))
     return result
 
 
 @app.get("/api/posts/{post_id}/likes")
-def api_get_likes(post_id: int, db: Session = Depends(get_db)):
-    return crud.get_likes(db, post_id)
+async def api_get_likes(post_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    headers = await _activity_validators()
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(await acrud.get_likes(db, post_id), headers=headers)
 
 
 @app.put("/api/posts/{post_id}")
-def api_update_post(post_id: int, data: PostUpdate, db: Session = Depends(get_db)):
-    post = crud.update_post(db, post_id, title=data.title, content=data.content)
+async def api_update_post(post_id: int, data: PostUpdate, db: AsyncSession = Depends(get_async_db)):
+    post = await acrud.update_post(db, post_id, title=data.title, content=data.content)
     if not post:
         raise HTTPException(404, "Post not found")
-    return {
-        "id": post.id, "title": post.title, "content": post.content,
-        "updated_at": post.updated_at.isoformat() if post.updated_at else None,
-    }
+    return serializers.updated_post(post)
 
 
 @app.delete("/api/posts/{post_id}")
-def api_delete_post(post_id: int, db: Session = Depends(get_db)):
-    ok = crud.delete_post(db, post_id)
+async def api_delete_post(post_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await acrud.delete_post(db, post_id)
     if not ok:
         raise HTTPException(404, "Post not found")
     return {"ok": True}
 
 
 @app.post("/api/posts/{post_id}/restore")
-def api_restore_post(post_id: int, db: Session = Depends(get_db)):
-    ok = crud.restore_post(db, post_id)
+async def api_restore_post(post_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await acrud.restore_post(db, post_id)
     if not ok:
         raise HTTPException(404, "Post not found or not deleted")
     return {"ok": True, "post_id": post_id}
 
 
 @app.post("/api/boards")
-def api_create_board(data: BoardCreate, db: Session = Depends(get_db)):
-    existing = crud.get_board_by_slug(db, data.slug)
+async def api_create_board(data: BoardCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = await acrud.get_board_by_slug(db, data.slug)
     if existing:
         raise HTTPException(409, f"Board '{data.slug}' already exists")
-    board = crud.create_board(db, data)
-    return {"id": board.id, "slug": board.slug}
+    board = await acrud.create_board(db, data)
+    return serializers.created_board(board)
+
+
+@app.post("/api/batch")
+async def api_batch(batch: BatchRequest, db: AsyncSession = Depends(get_async_db)):
+    """create_post / create_reply / toggle_like / update_post / delete_post를 한 트랜잭션으로 실행한다.
+
+    하나라도 실패하면 전부 롤백되고 committed=false, failed_index와 작업별 status가 돌아간다.
+    """
+    return await acrud.run_batch(db, batch)
 
 
 @app.get("/api/search")
-def api_search(q: str, board_slug: str | None = None, limit: int = 20, db: Session = Depends(get_db)):
-    results = crud.search_posts(db, q, board_slug=board_slug, limit=limit)
-    return [
-        {
-            "id": r["post"].id, "title": r["post"].title, "author": r["post"].author,
-            "board_slug": r["board"].slug if r["board"] else "",
-            "board_name": r["board"].name if r["board"] else "",
-            "created_at": r["post"].created_at.isoformat(),
-            "updated_at": r["post"].updated_at.isoformat() if r["post"].updated_at else None,
-            "reply_count": r["reply_count"],
-            "like_count": r["like_count"],
-        }
-        for r in results
-    ]
+async def api_search(
+    request: Request, q: str, board_slug: str | None = None, limit: int = 20,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    headers = await _activity_validators()
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    results = await acrud.search_posts(db, q, board_slug=board_slug, limit=limit)
+    return JSONResponse(serializers.post_summaries(results), headers=headers)
 
 
 @app.get("/api/recent")
-def api_recent(limit: int = 10, db: Session = Depends(get_db)):
-    results = crud.get_recent_posts(db, limit=limit)
-    return [
-        {
-            "id": r["post"].id, "title": r["post"].title, "author": r["post"].author,
-            "board_slug": r["board"].slug if r["board"] else "",
-            "board_name": r["board"].name if r["board"] else "",
-            "created_at": r["post"].created_at.isoformat(),
-            "updated_at": r["post"].updated_at.isoformat() if r["post"].updated_at else None,
-            "reply_count": r["reply_count"],
-            "like_count": r["like_count"],
-        }
-        for r in results
-    ]
+async def api_recent(request: Request, limit: int = 10, db: AsyncSession = Depends(get_async_read_db)):
+    headers = await _activity_validators()
+    if _not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(serializers.post_summaries(await acrud.get_recent_posts(db, limit=limit)), headers=headers)
+
+
+MAX_ACTIVITY_WAIT = 60  # 롱폴링 최대 대기(초)
 
 
 @app.get("/api/last-activity")
-def api_last_activity(db: Session = Depends(get_db)):
-    data = crud.get_last_activity(db)
-    def _iso(dt) -> str | None:
-        return dt.isoformat() if dt else None
-    return {
-        "last_post_at": _iso(data["last_post_at"]),
-        "last_updated_at": _iso(data["last_updated_at"]),
-        "last_comment_at": _iso(data["last_comment_at"]),
-        "last_like_at": _iso(data["last_like_at"]),
-        "last_activity_at": _iso(data["last_activity_at"]),
-    }
+async def api_last_activity(request: Request, wait: float = 0, db: AsyncSession = Depends(get_async_read_db)):
+    """활동 버전 ETag로 조건부 GET(304)을 지원한다. ?wait=초 를 주면 변경될 때까지 롱폴링."""
+    if_none_match = request.headers.get("if-none-match")
+    version = await activity.refresh()
+    if wait > 0 and activity.etag_matches(if_none_match, activity.etag(version)):
+        version = await activity.wait_for_change(version, min(wait, MAX_ACTIVITY_WAIT))
+    tag = activity.etag(version)
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if activity.etag_matches(if_none_match, tag):
+        return Response(status_code=304, headers=headers)
+
+    payload = activity.get_cached(version)
+    if payload is None:
+        payload = serializers.last_activity(await acrud.get_last_activity(db))
+        activity.set_cached(version, payload)
+    return JSONResponse(payload, headers=headers)
+
+
+@app.get("/api/export")
+def api_export(board_slug: str | None = None, since: datetime | None = None, until: datetime | None = None):
+    """게시판·글·댓글·좋아요를 NDJSON으로 흘려보낸다 (app.transfer). since/until은 스레드 작성 시각 기준.
+
+    서버 측 커서로 읽으므로 메모리는 일정하다. 가져오기: python -m app.transfer import FILE
+    """
+    db = ReadSessionLocal()
+    lines = transfer.export_lines(db, board_slug, since, until)
+    try:
+        first = next(lines)
+    except ValueError as e:
+        db.close()
+        raise HTTPException(404, str(e))
+
+    def stream():
+        try:
+            yield first
+            yield from transfer.chunked(lines)
+        finally:
+            db.close()
+
+    filename = f"board-{board_slug or 'all'}-{datetime.now(timezone.utc):%Y%m%d}.ndjson"
+    return StreamingResponse(stream(), media_type="application/x-ndjson", headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    })
+
+
+@app.get("/api/admin/write-queue")
+async def api_write_queue_stats():
+    """그룹 커밋 쓰기 큐(WRITE_QUEUE=1) 상태: 대기열 길이, 그룹 크기, 대기/전체/커밋 지연(ms) 백분위."""
+    return writer.stats()
+
+
+@app.get("/api/admin/slow-queries")
+async def api_slow_queries(limit: int = 50, full_scan: bool = False):
+    """SLOW_QUERY_MS보다 오래 걸린 SQL(최신순): 문장, 파라미터 형태, 호출 함수, EXPLAIN QUERY PLAN."""
+    return slowlog.recent(limit=limit, full_scan_only=full_scan)
+
+
+@app.get("/api/admin/retention")
+async def api_retention_status():
+    """삭제 글 영구 삭제 + 점진적 VACUUM 작업(RETENTION_DAYS) 상태: 진행 중인 실행과 지난 실행의 삭제 수/반환 바이트."""
+    return {**retention.status(), "jobs_leader": startup.leads_jobs()}
+
+
+@app.get("/api/admin/backup")
+async def api_backup_status():
+    """온라인 백업(BACKUP_INTERVAL) 상태: 진행 중인 백업의 단계별 진행, 지난 결과(무결성 검사 포함), 남은 백업 목록."""
+    return {**await asyncio.to_thread(backup.status), "jobs_leader": startup.leads_jobs()}
+
+
+@app.post("/api/admin/backup", status_code=202)
+async def api_backup_run():
+    """백업을 바로 시작한다. 이미 실행 중이면 409. 진행 상황은 GET /api/admin/backup."""
+    if not backup.trigger():
+        raise HTTPException(409, "backup already running")
+    return await asyncio.to_thread(backup.status)
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus 텍스트 형식 지표: 라우트별 지연/SQL 수, 커밋 지연, SQLite 잠금 대기 (METRICS=1)."""
+    if not metrics.ENABLED:
+        raise HTTPException(404, "metrics disabled (METRICS=1)")
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+EVENT_HEARTBEAT = 15  # SSE 연결 유지용 주석 전송 주기(초)
+
+
+def _sse(event: dict) -> str:
+    payload = json.dumps({"board_slug": event["board_slug"], **event["data"]}, ensure_ascii=False)
+    return f"id: {events.format_id(event['id'])}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+@app.get("/api/events")
+async def api_events(request: Request, board_slug: str | None = None, last_event_id: str | None = None):
+    """글/댓글/수정/삭제·복구/좋아요 변경을 Server-Sent Events로 흘려보낸다.
+
+    board_slug로 게시판을 거를 수 있고, Last-Event-ID 헤더(또는 last_event_id 파라미터)로 이어받는다.
+    버퍼에서 이미 밀려난 구간이 있거나 다른 DB(epoch)의 id면 `reset` 이벤트를 보내 클라이언트가 다시 조회하게 한다.
+    """
+    await activity.refresh()
+    resume = last_event_id or request.headers.get("last-event-id")
+    newest = await events.last_id()
+    last = newest if not resume else events.parse_id(resume)
+    foreign = last is None
+    if foreign:
+        last = newest
+
+    async def stream():
+        nonlocal last
+        yield "retry: 3000\n\n"
+        if foreign:
+            yield f"id: {events.format_id(last)}\nevent: reset\ndata: {{}}\n\n"
+        while not await request.is_disconnected():
+            version = activity.current_version()
+            batch, missed = await events.since(last)
+            if missed:
+                if not batch:
+                    last = await events.last_id()
+                yield f"id: {events.format_id(batch[0]['id'] - 1 if batch else last)}\nevent: reset\ndata: {{}}\n\n"
+            for event in batch:
+                last = event["id"]
+                if board_slug and event["board_slug"] != board_slug:
+                    continue
+                yield _sse(event)
+            if batch or missed:
+                continue
+            if await activity.wait_for_change(version, EVENT_HEARTBEAT) == version:
+                yield ": ping\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache", "X-Accel-Buffering": "no",
+    })
@@ -0,0 +1,261 @@
+"""요청별 SQL 계측, Server-Timing 헤더, Prometheus /metrics (선택, METRICS=1).
+
+install()이 켜는 것:
+- 엔진 이벤트로 SQL 실행 수/시간을 재서 contextvar에 담긴 현재 요청에 더한다 (쓰기 큐 작업도 요청 문맥에서 실행됨)
+- ASGI 미들웨어가 응답에 `Server-Timing: db, template, serialize, app`을 붙이고 라우트별 지연 히스토그램을 남긴다
+- 템플릿 렌더링(TemplateResponse)과 직렬화(app.serializers, JSONResponse.render) 시간을 잰다
+- 세션 커밋 지연(flush 포함), SQLite 잠금 대기(METRICS_LOCK_WAIT_MS보다 오래 걸린 쓰기/커밋)와 busy 오류 수
+
+METRICS=0(기본)이면 install()을 부르지 않으므로 리스너/미들웨어/래퍼가 하나도 걸리지 않는다.
+"""
+
+import functools
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+ENABLED = os.getenv("METRICS", "0") == "1"
+LOCK_WAIT = float(os.getenv("METRICS_LOCK_WAIT_MS", "20")) / 1000  # 이보다 오래 걸린 쓰기는 잠금 대기로 센다
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+UNTIMED_PATHS = {"/metrics", "/api/events"}  # 지표 조회 자신과 끝나지 않는 SSE 스트림
+_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE", "BEGIN")
+
+
+class _RequestStats:
+    __slots__ = ("queries", "db", "template", "serialize")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = self.template = self.serialize = 0.0
+
+    def server_timing(self, total: float) -> str:
+        return (f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+                f"template;dur={self.template * 1000:.2f}, serialize;dur={self.serialize * 1000:.2f}, "
+                f"app;dur={total * 1000:.2f}")
+
+
+_current: ContextVar[_RequestStats | None] = ContextVar("board_request_stats", default=None)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_requests: dict[tuple, int] = {}  # (route, method, status) → 횟수
+_latency: dict[tuple, _Histogram] = {}  # (route, method)
+_queries: dict[tuple, _Histogram] = {}  # (route, method) → 요청당 SQL 수
+_db_seconds: dict[tuple, float] = {}
+_commit = _Histogram(LATENCY_BUCKETS)
+_counters = {"background_queries": 0, "lock_waits": 0, "lock_wait_seconds": 0.0, "busy_errors": 0}
+
+
+# ── Engine / session hooks ───────────────────────────
+
+def _before_cursor(conn, _cursor, _statement, _parameters, _context, _executemany):
+    conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor(conn, _cursor, statement, _parameters, _context, _executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db += elapsed
+    else:
+        with _lock:
+            _counters["background_queries"] += 1
+    if elapsed >= LOCK_WAIT and statement.lstrip()[:7].upper().startswith(_WRITE_PREFIXES):
+        _lock_wait(elapsed)
+
+
+def _lock_wait(elapsed: float):
+    with _lock:
+        _counters["lock_waits"] += 1
+        _counters["lock_wait_seconds"] += elapsed
+
+
+def _handle_error(context):
+    message = str(context.original_exception)
+    if "database is locked" in message or "database is busy" in message:
+        with _lock:
+            _counters["busy_errors"] += 1
+
+
+def _before_commit(session: Session):
+    session.info["metrics_commit_start"] = time.perf_counter()
+
+
+def _after_commit(session: Session):
+    start = session.info.pop("metrics_commit_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    with _lock:
+        _commit.observe(elapsed)
+    if elapsed >= LOCK_WAIT:
+        _lock_wait(elapsed)
+
+
+def _timed(kind: str, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            setattr(stats, kind, getattr(stats, kind) + time.perf_counter() - start)
+    return wrapper
+
+
+# ── Middleware ───────────────────────────────────────
+
+class _Middleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNTIMED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        stats = _RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            _observe(scope, status, time.perf_counter() - start, stats)
+
+
+def _observe(scope, status: int, elapsed: float, stats: _RequestStats):
+    key = (getattr(scope.get("route"), "path", None) or "unmatched", scope["method"])
+    with _lock:
+        _requests[(*key, status)] = _requests.get((*key, status), 0) + 1
+        _latency.setdefault(key, _Histogram(LATENCY_BUCKETS)).observe(elapsed)
+        _queries.setdefault(key, _Histogram(QUERY_BUCKETS)).observe(stats.queries)
+        _db_seconds[key] = _db_seconds.get(key, 0.0) + stats.db
+
+
+def install(app, templates):
+    """계측을 켠다. app 생성 직후(요청을 받기 전) 한 번 호출한다."""
+    from app import serializers
+    from app.database import ALL_ENGINES
+
+    for target in ALL_ENGINES:
+        event.listen(target, "before_cursor_execute", _before_cursor)
+        event.listen(target, "after_cursor_execute", _after_cursor)
+        event.listen(target, "handle_error", _handle_error)
+    event.listen(Session, "before_commit", _before_commit)
+    event.listen(Session, "after_commit", _after_commit)
+
+    templates.TemplateResponse = _timed("template", templates.TemplateResponse)
+    for name in [n for n in vars(serializers) if not n.startswith("_")]:
+        fn = getattr(serializers, name)
+        if callable(fn) and getattr(fn, "__module__", None) == serializers.__name__:
+            setattr(serializers, name, _timed("serialize", fn))
+    JSONResponse.render = _timed("serialize", JSONResponse.render)
+    app.add_middleware(_Middleware)
+
+
+# ── Exposition ───────────────────────────────────────
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, hist: _Histogram, **labels) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(hist.buckets, hist.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+    lines.append(f"{name}_sum{_labels(**labels) if labels else ''} {hist.sum:.6f}")
+    lines.append(f"{name}_count{_labels(**labels) if labels else ''} {hist.count}")
+    return lines
+
+
+def render() -> str:
+    """Prometheus 텍스트 형식."""
+    from app import cache, writer
+
+    out = []
+
+    def metric(name: str, kind: str, help_text: str, lines: list[str]):
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} {kind}")
+        out.extend(lines)
+
+    with _lock:
+        metric("board_http_requests_total", "counter", "HTTP 요청 수",
+               [f"board_http_requests_total{_labels(route=r, method=m, status=s)} {n}"
+                for (r, m, s), n in sorted(_requests.items())])
+        metric("board_http_request_duration_seconds", "histogram", "라우트별 응답 시간", [
+            line for (r, m), hist in sorted(_latency.items())
+            for line in _histogram_lines("board_http_request_duration_seconds", hist, route=r, method=m)])
+        metric("board_db_queries_per_request", "histogram", "요청당 SQL 실행 수", [
+            line for (r, m), hist in sorted(_queries.items())
+            for line in _histogram_lines("board_db_queries_per_request", hist, route=r, method=m)])
+        metric("board_db_query_seconds_total", "counter", "라우트별 SQL 실행 시간 합",
+               [f"board_db_query_seconds_total{_labels(route=r, method=m)} {s:.6f}"
+                for (r, m), s in sorted(_db_seconds.items())])
+        metric("board_db_background_queries_total", "counter", "요청 밖(시작, CLI 등)에서 실행한 SQL 수",
+               [f"board_db_background_queries_total {_counters['background_queries']}"])
+        metric("board_db_commit_duration_seconds", "histogram", "세션 커밋 지연 (flush 포함)",
+               _histogram_lines("board_db_commit_duration_seconds", _commit))
+        metric("board_sqlite_lock_waits_total", "counter", "METRICS_LOCK_WAIT_MS보다 오래 걸린 쓰기/커밋 수",
+               [f"board_sqlite_lock_waits_total {_counters['lock_waits']}"])
+        metric("board_sqlite_lock_wait_seconds_total", "counter", "그 쓰기/커밋에 걸린 시간 합",
+               [f"board_sqlite_lock_wait_seconds_total {_counters['lock_wait_seconds']:.6f}"])
+        metric("board_sqlite_busy_errors_total", "counter", "database is locked/busy 오류 수",
+               [f"board_sqlite_busy_errors_total {_counters['busy_errors']}"])
+
+    cache_stats = cache.stats()
+    metric("board_cache_requests_total", "counter", "읽기 캐시 조회 수",
+           [f"board_cache_requests_total{_labels(result='hit')} {cache_stats['hits']}",
+            f"board_cache_requests_total{_labels(result='miss')} {cache_stats['misses']}"])
+    metric("board_cache_entries", "gauge", "읽기 캐시 항목 수", [f"board_cache_entries {cache_stats['size']}"])
+    if writer.ENABLED:
+        metric("board_write_queue_depth", "gauge", "쓰기 큐 대기 작업 수",
+               [f"board_write_queue_depth {writer.stats()['queue_depth']}"])
+    return "\n".join(out) + "\n"
@@ -0,0 +1,313 @@
+"""버전 기반 스키마 마이그레이션.
+
+create_all은 기존 테이블에 컬럼/인덱스를 추가하지 않으므로, 스키마 변경은 여기에
+번호를 붙여 순서대로 쌓는다. 현재 버전은 SQLite `PRAGMA user_version`에 기록한다.
+각 단계는 BEGIN IMMEDIATE 트랜잭션 안에서 실행되어 여러 프로세스가 동시에 돌려도 한 번만 적용된다.
+
+    python -m app.migrations                # 최신 버전까지 적용
+    python -m app.migrations --status       # 현재/최신 버전 출력
+    python -m app.migrations --check-plans  # 핫 쿼리 실행 계획에 테이블 풀스캔이 없는지 검사
+
+풀스캔 검사는 테스트(tests/test_query_plans.py, `python -m pytest`)에서도 돈다.
+"""
+
+import re
+import sys
+from typing import Callable
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+
+from app import fts
+
+
+def _columns(conn: Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _add_column(conn: Connection, table: str, name: str, ddl: str):
+    if name not in _columns(conn, table):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+# ── Migrations ───────────────────────────────────────
+
+def _m001_counters(conn: Connection):
+    """Post/Board 비정규화 카운터 컬럼 추가 후 실제 값으로 채운다."""
+    _add_column(conn, "posts", "reply_count", "INTEGER DEFAULT 0 NOT NULL")
+    _add_column(conn, "posts", "like_count", "INTEGER DEFAULT 0 NOT NULL")
+    _add_column(conn, "posts", "last_reply_at", "DATETIME")
+    _add_column(conn, "boards", "post_count", "INTEGER DEFAULT 0 NOT NULL")
+    _add_column(conn, "boards", "latest_post_id", "INTEGER")
+    conn.execute(text("""
+        UPDATE posts SET
+            reply_count = (SELECT count(*) FROM posts r WHERE r.parent_id = posts.id AND r.is_deleted = 0),
+            last_reply_at = (SELECT max(r.created_at) FROM posts r WHERE r.parent_id = posts.id AND r.is_deleted = 0),
+            like_count = (SELECT count(*) FROM likes l WHERE l.post_id = posts.id)
+    """))
+    conn.execute(text("""
+        UPDATE boards SET
+            post_count = (SELECT count(*) FROM posts p
+                          WHERE p.board_id = boards.id AND p.parent_id IS NULL AND p.is_deleted = 0),
+            latest_post_id = (SELECT p.id FROM posts p
+                              WHERE p.board_id = boards.id AND p.parent_id IS NULL AND p.is_deleted = 0
+                              ORDER BY p.created_at DESC, p.id DESC LIMIT 1)
+    """))
+
+
+def _m002_fts(conn: Connection):
+    """posts_fts 전문 검색 테이블과 동기화 트리거."""
+    fts.ensure_fts(conn)
+
+
+def _m003_hot_query_indexes(conn: Connection):
+    """crud.py 핫 쿼리용 복합(커버링) 인덱스. 접두어가 겹치는 단일 컬럼 인덱스는 정리한다."""
+    # create_all로 새로 만든 DB는 처음부터 author_id다 (_m005_authors)
+    author = "author_id" if "author_id" in _columns(conn, "likes") else "author"
+    for ddl in [
+        # get_posts: board_id/parent_id/is_deleted 필터 + (is_pinned, created_at, id) 정렬·키셋
+        "CREATE INDEX IF NOT EXISTS ix_posts_board_list"
+        " ON posts (board_id, parent_id, is_deleted, is_pinned, created_at, id)",
+        # get_post 댓글, 댓글 카운터, get_recent_posts(parent_id IS NULL), 마지막 글/댓글 시각
+        "CREATE INDEX IF NOT EXISTS ix_posts_thread ON posts (parent_id, is_deleted, created_at)",
+        # get_last_activity 마지막 수정 시각
+        "CREATE INDEX IF NOT EXISTS ix_posts_updated ON posts (parent_id, is_deleted, updated_at)",
+        # liked_by 묶음 조회 (post_id IN ... ORDER BY post_id, created_at) — author까지 커버링
+        f"CREATE INDEX IF NOT EXISTS ix_likes_post_list ON likes (post_id, created_at, {author})",
+        # get_last_activity 마지막 좋아요 시각
+        "CREATE INDEX IF NOT EXISTS ix_likes_created ON likes (created_at)",
+        "DROP INDEX IF EXISTS ix_posts_board_id",
+        "DROP INDEX IF EXISTS ix_posts_parent_id",
+        "DROP INDEX IF EXISTS ix_likes_post_id",
+    ]:
+        conn.execute(text(ddl))
+
+
+def _m004_content_html(conn: Connection):
+    """서버 렌더링 Markdown 캐시 컬럼. 기존 행은 `python -m app.render backfill`로 채운다."""
+    _add_column(conn, "posts", "content_html", "TEXT")
+
+
+def _m005_authors(conn: Connection):
+    """posts.author / likes.author 문자열을 authors 테이블의 정수 ID(author_id)로 바꾼다.
+
+    likes는 (post_id, author) 유니크 제약 때문에 컬럼만 지울 수 없어 테이블을 다시 만든다.
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS authors (
+            id INTEGER NOT NULL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL UNIQUE,
+            created_at DATETIME
+        )
+    """))
+    if "author" in _columns(conn, "posts"):
+        conn.execute(text("""
+            INSERT OR IGNORE INTO authors (name, created_at)
+            SELECT author, min(created_at) FROM (
+                SELECT author, created_at FROM posts UNION ALL SELECT author, created_at FROM likes
+            ) GROUP BY author ORDER BY min(created_at)
+        """))
+        _add_column(conn, "posts", "author_id", "INTEGER REFERENCES authors (id)")
+        conn.execute(text("UPDATE posts SET author_id = (SELECT id FROM authors WHERE authors.name = posts.author)"))
+        conn.execute(text("ALTER TABLE posts DROP COLUMN author"))
+    if "author" in _columns(conn, "likes"):
+        conn.execute(text("""
+            CREATE TABLE likes_new (
+                id INTEGER NOT NULL PRIMARY KEY,
+                post_id INTEGER NOT NULL REFERENCES posts (id),
+                author_id INTEGER NOT NULL REFERENCES authors (id),
+                created_at DATETIME,
+                CONSTRAINT uq_like_post_author UNIQUE (post_id, author_id)
+            )
+        """))
+        conn.execute(text("""
+            INSERT INTO likes_new (id, post_id, author_id, created_at)
+            SELECT l.id, l.post_id, a.id, l.created_at FROM likes l JOIN authors a ON a.name = l.author
+        """))
+        conn.execute(text("DROP TABLE likes"))
+        conn.execute(text("ALTER TABLE likes_new RENAME TO likes"))
+    for ddl in [
+        "CREATE INDEX IF NOT EXISTS ix_likes_post_list ON likes (post_id, created_at, author_id)",
+        "CREATE INDEX IF NOT EXISTS ix_likes_created ON likes (created_at)",
+        # 작성자별 조회
+        "CREATE INDEX IF NOT EXISTS ix_posts_author ON posts (author_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_likes_author ON likes (author_id)",
+    ]:
+        conn.execute(text(ddl))
+
+
+def _m006_archive_after_days(conn: Connection):
+    """게시판별 보관 기준일 (app.archive). NULL이면 ARCHIVE_AFTER_DAYS 환경 변수를 따른다."""
+    _add_column(conn, "boards", "archive_after_days", "INTEGER")
+
+
+def _m007_deleted_at(conn: Connection):
+    """소프트 삭제 시각과 영구 삭제(app.retention) 후보용 부분 인덱스. 이미 삭제된 행은 마지막 수정 시각으로 채운다."""
+    _add_column(conn, "posts", "deleted_at", "DATETIME")
+    conn.execute(text("UPDATE posts SET deleted_at = updated_at WHERE is_deleted = 1 AND deleted_at IS NULL"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_posts_deleted ON posts (deleted_at) WHERE is_deleted = 1"))
+
+
+def _m008_app_state(conn: Connection):
+    """시작 준비(app.startup)를 마친 코드의 지문 등 키-값 상태."""
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS app_state (
+            key VARCHAR(50) NOT NULL PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at DATETIME
+        )
+    """))
+
+
+def _m009_activity(conn: Connection):
+    """DB에 두는 활동 번호·epoch(app.activity)와 변경 이벤트 피드(app.events). 워커 사이에 공유된다."""
+    conn.execute(text("""
+        INSERT OR IGNORE INTO app_state (key, value, updated_at)
+        VALUES ('epoch', lower(hex(randomblob(4))), CURRENT_TIMESTAMP), ('activity', '0', CURRENT_TIMESTAMP)
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            type VARCHAR(30) NOT NULL,
+            board_slug VARCHAR(50),
+            data TEXT NOT NULL,
+            created_at DATETIME NOT NULL
+        )
+    """))
+
+
+def _m010_archive_deleted_at(conn: Connection):
+    """보관소로 먼저 옮겨진 삭제 행과 _m007 뒤 이전 버전 프로세스가 지운 행의 deleted_at을 마지막 수정 시각으로 한 번 채운다."""
+    conn.execute(text("UPDATE posts SET deleted_at = updated_at WHERE is_deleted = 1 AND deleted_at IS NULL"))
+    if "archive" not in {row[1] for row in conn.execute(text("PRAGMA database_list"))}:
+        return
+    from app import archive  # app.database가 이 모듈을 import하므로 여기서
+
+    archive.ensure_schema(conn)  # 보관소 posts에 deleted_at 컬럼이 없으면 만든다
+    conn.execute(text("UPDATE archive.posts SET deleted_at = updated_at WHERE is_deleted = 1 AND deleted_at IS NULL"))
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "counters", _m001_counters),
+    (2, "fts", _m002_fts),
+    (3, "hot query indexes", _m003_hot_query_indexes),
+    (4, "content html", _m004_content_html),
+    (5, "authors", _m005_authors),
+    (6, "archive after days", _m006_archive_after_days),
+    (7, "deleted at", _m007_deleted_at),
+    (8, "app state", _m008_app_state),
+    (9, "activity", _m009_activity),
+    (10, "archive deleted at", _m010_archive_deleted_at),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ── Runner ───────────────────────────────────────────
+
+def get_version(conn: Connection) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """아직 적용되지 않은 마이그레이션을 순서대로 적용하고, 적용한 버전 목록을 반환한다."""
+    applied = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if get_version(conn) >= LATEST_VERSION:
+            return applied
+        for version, name, migrate in MIGRATIONS:
+            # 쓰기 잠금을 먼저 잡고 버전을 다시 읽어, 다른 프로세스가 이미 적용했으면 건너뛴다
+            conn.execute(text("BEGIN IMMEDIATE"))
+            try:
+                if get_version(conn) >= version:
+                    conn.execute(text("COMMIT"))
+                    continue
+                migrate(conn)
+                conn.execute(text(f"PRAGMA user_version = {version}"))
+                conn.execute(text("COMMIT"))
+            except Exception:
+                conn.execute(text("ROLLBACK"))
+                raise
+            applied.append(version)
+    return applied
+
+
+# ── Query plan check ─────────────────────────────────
+
+# SEARCH가 아닌 SCAN은 인덱스를 쓰더라도 전체를 훑는다 (posts_fts 가상 테이블은 제외)
+_TABLE_SCAN = re.compile(r"\bSCAN (TABLE )?(posts|likes)\b")
+
+
+def _hot_queries(db) -> None:
+    """crud.py 핫 경로 읽기 함수를 한 번씩 실행한다."""
+    from app import crud
+
+    boards = crud.get_boards(db)
+    board = boards[0]["board"] if boards else None
+    board_id = board.id if board else 1
+    posts = crud.get_posts(db, board_id, limit=20)
+    crud.get_posts(db, board_id, limit=20, offset=20)
+    if posts:
+        crud.get_posts(db, board_id, limit=20, cursor=crud.encode_cursor(posts[-1]["post"]))
+    crud.get_board_by_slug(db, board.slug if board else "free")
+    crud.get_post(db, posts[0]["post"].id if posts else 1)
+    crud.get_post_version(db, posts[0]["post"].id if posts else 1)
+    crud.get_post(db, 0)  # 핫 테이블에 없는 글 → 보관소 조회
+    crud.get_archived_posts(db, board_id, limit=20)
+    crud.get_archived_count(db, board_id)
+    crud.get_recent_posts(db, limit=20)
+    crud.search_posts(db, "게시판 안내")
+    crud.search_posts(db, "게시판 안내", board_slug=board.slug if board else None)
+    crud.get_likes(db, 1)
+    crud.get_post_count(db, board_id)
+    crud.get_last_activity(db)
+
+
+def check_query_plans(engine: Engine) -> list[tuple[str, str]]:
+    """핫 쿼리를 실행하며 캡처한 SQL마다 EXPLAIN QUERY PLAN을 돌려 posts/likes 풀스캔을 찾는다.
+
+    (sql, plan 행) 목록을 반환한다. 비어 있으면 통과.
+    """
+    from app.database import SessionLocal
+
+    captured: list[tuple[str, tuple]] = []
+
+    def _capture(_conn, _cursor, statement, parameters, _context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    db = SessionLocal(bind=engine)
+    try:
+        _hot_queries(db)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    offenders = []
+    with engine.connect() as conn:
+        for statement, parameters in captured:
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+                detail = row[-1]
+                if _TABLE_SCAN.search(detail):
+                    offenders.append((" ".join(statement.split()), detail))
+    return offenders
+
+
+if __name__ == "__main__":
+    from app.database import engine, init_db
+
+    args = sys.argv[1:]
+    if "--status" in args:
+        with engine.connect() as conn:
+            print(f"schema version: {get_version(conn)} (latest {LATEST_VERSION})")
+    elif "--check-plans" in args:
+        init_db()
+        offenders = check_query_plans(engine)
+        for statement, detail in offenders:
+            print(f"FULL SCAN: {detail}\n  {statement}")
+        print("query plans OK" if not offenders else f"{len(offenders)}개 쿼리가 풀스캔합니다")
+        sys.exit(1 if offenders else 0)
+    else:
+        applied = init_db()
+        with engine.connect() as conn:
+            print(f"applied: {applied or '없음'}, schema version: {get_version(conn)}")
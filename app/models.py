@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship, backref
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Table, UniqueConstraint
+from sqlalchemy.orm import DeclarativeBase, relationship, backref, foreign
 from app.database import Base
 
 
@@ -8,6 +8,20 @@ def _utcnow():
     return datetime.now(timezone.utc)
 
 
+class Author(Base):
+    """작성자 이름 사전. posts/likes는 이름 대신 이 ID를 저장한다 (이름 ↔ ID는 app.authors가 캐시)."""
+    __tablename__ = "authors"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), unique=True, nullable=False)
+    created_at = Column(DateTime, default=_utcnow)
+
+
+def _author_name(author_id: int) -> str:
+    from app import authors  # app.authors가 이 모듈을 import한다
+    return authors.name_of(author_id)
+
+
 class Board(Base):
     __tablename__ = "boards"
 
@@ -21,27 +35,45 @@ class Board(Base):
     sort_order = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=_utcnow)
+    # 비정규화 카운터 — crud 쓰기 함수가 같은 트랜잭션에서 갱신, app.reconcile로 검증/복구
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    latest_post_id = Column(Integer, nullable=True)
+    # 이보다 오래 활동이 없는 스레드를 보관소로 옮긴다 (app.archive). NULL이면 ARCHIVE_AFTER_DAYS, 0이면 안 옮김
+    archive_after_days = Column(Integer, nullable=True)
 
-    posts = relationship("Post", back_populates="board")
+    posts = relationship("Post", back_populates="board", foreign_keys="Post.board_id")
+    latest_post = relationship(
+        "Post",
+        primaryjoin=lambda: foreign(Board.latest_post_id) == Post.id,
+        viewonly=True,
+        lazy="joined",
+    )
 
 
 class Post(Base):
     __tablename__ = "posts"
+    # 인덱스는 app.migrations에서 관리한다 (핫 쿼리용 복합 인덱스)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    board_id = Column(Integer, ForeignKey("boards.id"), nullable=False, index=True)
-    parent_id = Column(Integer, ForeignKey("posts.id"), nullable=True, index=True)
+    board_id = Column(Integer, ForeignKey("boards.id"), nullable=False)
+    parent_id = Column(Integer, ForeignKey("posts.id"), nullable=True)
     title = Column(String(200), nullable=True)
     content = Column(Text, nullable=False)
-    author = Column(String(100), nullable=False)
+    content_html = Column(Text, nullable=True)  # app.render 결과. 비어 있으면 브라우저에서 렌더링
+    author_id = Column(Integer, ForeignKey("authors.id"), nullable=False)
     prefix = Column(String(50), nullable=True)
     tag = Column(String(50), nullable=True)
     is_pinned = Column(Boolean, default=False)
     is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(DateTime, nullable=True)  # 소프트 삭제 시각. 보존 기간이 지나면 app.retention이 영구 삭제
     created_at = Column(DateTime, default=_utcnow)
     updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
+    # 비정규화 카운터 (삭제되지 않은 댓글 기준)
+    reply_count = Column(Integer, nullable=False, default=0, server_default="0")
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_reply_at = Column(DateTime, nullable=True)
 
-    board = relationship("Board", back_populates="posts")
+    board = relationship("Board", back_populates="posts", foreign_keys=[board_id])
     replies = relationship(
         "Post",
         backref=backref("parent", remote_side="Post.id"),
@@ -50,16 +82,53 @@ class Post(Base):
     )
     likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
 
+    @property
+    def author(self) -> str:
+        return _author_name(self.author_id)
+
 
 class Like(Base):
     __tablename__ = "likes"
     __table_args__ = (
-        UniqueConstraint("post_id", "author", name="uq_like_post_author"),
+        UniqueConstraint("post_id", "author_id", name="uq_like_post_author"),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False, index=True)
-    author = Column(String(100), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
+    author_id = Column(Integer, ForeignKey("authors.id"), nullable=False)
     created_at = Column(DateTime, default=_utcnow)
 
     post = relationship("Post", back_populates="likes")
+
+    @property
+    def author(self) -> str:
+        return _author_name(self.author_id)
+
+
+# ── Archive ──────────────────────────────────────────
+# 오래된 스레드를 옮겨 두는 보관소 DB(ATTACH ... AS archive)의 테이블. 컬럼은 posts/likes를 그대로 따르되
+# 외래 키는 없다. Base.metadata와 따로 두어 create_all 대상이 아니며, app.archive.ensure_schema가 만든다.
+
+class ArchiveBase(DeclarativeBase):
+    pass
+
+
+def _archive_table(source: Table) -> Table:
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in source.columns]
+    return Table(source.name, ArchiveBase.metadata, *columns, schema="archive")
+
+
+class ArchivedPost(ArchiveBase):
+    __table__ = _archive_table(Post.__table__)
+
+    @property
+    def author(self) -> str:
+        return _author_name(self.author_id)
+
+
+class ArchivedLike(ArchiveBase):
+    __table__ = _archive_table(Like.__table__)
+
+    @property
+    def author(self) -> str:
+        return _author_name(self.author_id)
@@ -0,0 +1,102 @@
+"""비정규화 카운터 검증/복구.
+
+Post.reply_count / like_count / last_reply_at, Board.post_count / latest_post_id를
+실제 데이터로 다시 계산해 어긋난 행을 찾고 고친다.
+
+    python -m app.reconcile           # 검사 후 복구
+    python -m app.reconcile --check   # 검사만 (어긋난 행이 있으면 종료 코드 1)
+"""
+
+import sys
+
+from sqlalchemy import bindparam, func, select, and_, or_, desc, update
+from sqlalchemy.orm import Session, aliased
+
+from app import activity
+from app.models import Board, Post, Like
+
+
+def _post_drift(db: Session) -> list[tuple]:
+    reply = aliased(Post)
+    visible_replies = and_(reply.parent_id == Post.id, reply.is_deleted == False)
+    expected_replies = select(func.count(reply.id)).where(visible_replies).correlate(Post).scalar_subquery()
+    expected_last = select(func.max(reply.created_at)).where(visible_replies).correlate(Post).scalar_subquery()
+    expected_likes = select(func.count(Like.id)).where(Like.post_id == Post.id).correlate(Post).scalar_subquery()
+    rows = select(
+        Post.id,
+        expected_replies.label("reply_count"),
+        expected_likes.label("like_count"),
+        expected_last.label("last_reply_at"),
+        Post.reply_count.label("cur_reply_count"),
+        Post.like_count.label("cur_like_count"),
+        Post.last_reply_at.label("cur_last_reply_at"),
+    ).subquery()
+    return db.execute(
+        select(rows.c.id, rows.c.reply_count, rows.c.like_count, rows.c.last_reply_at).where(or_(
+            rows.c.reply_count != rows.c.cur_reply_count,
+            rows.c.like_count != rows.c.cur_like_count,
+            rows.c.last_reply_at.is_distinct_from(rows.c.cur_last_reply_at),
+        ))
+    ).all()
+
+
+def _board_drift(db: Session) -> list[tuple]:
+    visible = and_(Post.board_id == Board.id, Post.parent_id == None, Post.is_deleted == False)
+    expected_count = select(func.count(Post.id)).where(visible).correlate(Board).scalar_subquery()
+    expected_latest = (
+        select(Post.id).where(visible).order_by(desc(Post.created_at), desc(Post.id)).limit(1)
+        .correlate(Board).scalar_subquery()
+    )
+    rows = select(
+        Board.id,
+        expected_count.label("post_count"),
+        expected_latest.label("latest_post_id"),
+        Board.post_count.label("cur_post_count"),
+        Board.latest_post_id.label("cur_latest_post_id"),
+    ).subquery()
+    return db.execute(
+        select(rows.c.id, rows.c.post_count, rows.c.latest_post_id).where(or_(
+            rows.c.post_count != rows.c.cur_post_count,
+            rows.c.latest_post_id.is_distinct_from(rows.c.cur_latest_post_id),
+        ))
+    ).all()
+
+
+def reconcile(db: Session, fix: bool = True) -> dict:
+    """어긋난 카운터 수를 반환한다. fix=True면 같은 트랜잭션에서 고치고 커밋한다."""
+    posts = _post_drift(db)
+    boards = _board_drift(db)
+    if fix and (posts or boards):
+        if posts:
+            # 가져오기(app.transfer) 뒤에는 수십만 행이 어긋날 수 있어 executemany 한 번으로 고친다
+            db.connection().execute(
+                update(Post.__table__).where(Post.id == bindparam("post_id")).values(
+                    reply_count=bindparam("reply_count"), like_count=bindparam("like_count"),
+                    last_reply_at=bindparam("last_reply_at"), updated_at=Post.updated_at,
+                ),
+                [{"post_id": p, "reply_count": r, "like_count": l, "last_reply_at": t} for p, r, l, t in posts],
+            )
+        for board_id, post_count, latest_post_id in boards:
+            db.query(Board).filter(Board.id == board_id).update(
+                {Board.post_count: post_count, Board.latest_post_id: latest_post_id},
+                synchronize_session=False,
+            )
+        activity.touch(db)
+        db.commit()
+    return {"posts": len(posts), "boards": len(boards), "fixed": fix}
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, init_db
+
+    check_only = "--check" in sys.argv[1:]
+    init_db()
+    db = SessionLocal()
+    try:
+        result = reconcile(db, fix=not check_only)
+    finally:
+        db.close()
+    status = "복구 완료" if result["fixed"] else "검사만 수행"
+    print(f"카운터 불일치: 글 {result['posts']}개, 게시판 {result['boards']}개 ({status})")
+    if check_only and (result["posts"] or result["boards"]):
+        sys.exit(1)
@@ -0,0 +1,98 @@
+"""Markdown → HTML 서버 렌더링.
+
+글/댓글을 쓰거나 고칠 때 한 번만 렌더링해 Post.content_html에 저장하고, post.html은 그 HTML을 그대로 쓴다.
+브라우저의 marked 설정(GFM 표/취소선/자동 링크, 줄바꿈 = <br>)을 따르고 코드 블록은 Pygments로 칠한다.
+원문에 섞인 HTML은 태그로 해석하지 않으며, 결과는 nh3로 한 번 더 정리한다.
+
+    python -m app.render backfill        # content_html이 비어 있는 글/댓글 렌더링 (보관소 포함)
+    python -m app.render backfill --all  # 렌더러를 바꾼 뒤 전체 다시 렌더링
+"""
+
+import sys
+
+import nh3
+from markdown_it import MarkdownIt
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name, guess_lexer
+from pygments.util import ClassNotFound
+from sqlalchemy.orm import Session
+
+from app import activity
+from app.models import ArchivedPost, Post
+
+PYGMENTS_STYLE = "github-dark"
+BACKFILL_BATCH = 200
+
+_formatter = HtmlFormatter(nowrap=True)
+
+
+def _highlight(code: str, lang: str, _attrs) -> str:
+    try:
+        lexer = get_lexer_by_name(lang) if lang else guess_lexer(code)
+    except ClassNotFound:
+        return ""  # markdown-it 기본 처리(이스케이프)
+    return highlight(code, lexer, _formatter)
+
+
+_md = (
+    MarkdownIt("commonmark", {"html": False, "breaks": True, "linkify": True, "highlight": _highlight})
+    .enable(["table", "strikethrough", "linkify"])
+)
+
+_ALLOWED_ATTRIBUTES = {
+    **nh3.ALLOWED_ATTRIBUTES,
+    "code": {"class"},  # language-xxx
+    "span": {"class"},  # Pygments 토큰
+}
+
+
+def to_html(content: str) -> str:
+    return nh3.clean(_md.render(content), attributes=_ALLOWED_ATTRIBUTES, link_rel="noopener noreferrer")
+
+
+def stylesheet() -> str:
+    """코드 하이라이트 CSS (app/static/pygments.css 생성용)."""
+    return HtmlFormatter(style=PYGMENTS_STYLE).get_style_defs(".markdown-body pre")
+
+
+def backfill(db: Session, everything: bool = False) -> int:
+    """content_html을 채운다(main과 보관소 모두). updated_at은 건드리지 않는다. 렌더링한 행 수를 반환."""
+    return sum(_backfill(db, post_cls, everything) for post_cls in (Post, ArchivedPost))
+
+
+def _backfill(db: Session, post_cls, everything: bool) -> int:
+    count = 0
+    last_id = 0
+    while True:
+        query = db.query(post_cls.id, post_cls.content).filter(post_cls.id > last_id)
+        if not everything:
+            query = query.filter(post_cls.content_html == None)
+        rows = query.order_by(post_cls.id).limit(BACKFILL_BATCH).all()
+        if not rows:
+            return count
+        for post_id, content in rows:
+            db.query(post_cls).filter(post_cls.id == post_id).update(
+                {post_cls.content_html: to_html(content), post_cls.updated_at: post_cls.updated_at},
+                synchronize_session=False,
+            )
+        activity.touch(db)
+        db.commit()
+        count += len(rows)
+        last_id = rows[-1][0]
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, init_db
+
+    args = sys.argv[1:]
+    if not args or args[0] != "backfill":
+        print("usage: python -m app.render backfill [--all]")
+        sys.exit(1)
+    init_db()
+    db = SessionLocal()
+    try:
+        count = backfill(db, everything="--all" in args)
+    finally:
+        db.close()
+    print(f"content_html 렌더링 완료: {count}개 글/댓글")
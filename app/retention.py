@@ -0,0 +1,278 @@
+"""소프트 삭제된 글의 영구 삭제와 점진적 VACUUM (선택, RETENTION_DAYS=보존 일수).
+
+delete_post는 is_deleted만 켜므로 삭제된 스레드·댓글·좋아요가 posts/likes에 계속 남는다.
+삭제된 지 RETENTION_DAYS가 지난 글(최상위 글이면 댓글까지)과 그 좋아요를 RETENTION_BATCH개씩 짧은
+트랜잭션으로 지우고, 배치 사이에 RETENTION_PAUSE_MS만큼 쉬어 다른 쓰기가 끼어들게 한다. 보관소(app.archive)도 같이 정리한다.
+그다음 `PRAGMA incremental_vacuum`을 VACUUM_STEP_PAGES 페이지씩 나눠 돌려 빈 페이지를 파일에서 돌려준다.
+
+RETENTION_DAYS가 0보다 크면 웹 서버가 RETENTION_INTERVAL초마다 백그라운드 스레드에서 실행한다.
+진행 상황과 지난 실행 결과(지운 행 수, 돌려준 바이트)는 /api/admin/retention으로 본다.
+
+점진적 VACUUM은 auto_vacuum=INCREMENTAL인 DB에서만 된다. 새 DB는 처음부터 그렇게 만들어지고(app.database),
+기존 DB는 한 번 전체 VACUUM이 필요하다 (쓰기를 오래 막으므로 한가한 시간에):
+
+    python -m app.retention run [--dry-run]   # 지금 한 번 실행
+    python -m app.retention vacuum            # auto_vacuum=INCREMENTAL로 바꾸는 일회성 전체 VACUUM
+    python -m app.retention status            # 삭제 대기 행 수, 빈 페이지 수
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.database import SessionLocal, engine
+from app.models import ArchivedLike, ArchivedPost, Like, Post
+
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "0"))  # 0이면 끔
+ENABLED = RETENTION_DAYS > 0
+INTERVAL = float(os.getenv("RETENTION_INTERVAL", "3600"))
+BATCH_SIZE = int(os.getenv("RETENTION_BATCH", "200"))
+PAUSE = float(os.getenv("RETENTION_PAUSE_MS", "50")) / 1000
+VACUUM_STEP_PAGES = int(os.getenv("VACUUM_STEP_PAGES", "256"))
+
+# (스키마, 글 모델, 좋아요 모델)
+_TARGETS = [("main", Post, Like), ("archive", ArchivedPost, ArchivedLike)]
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+_logger = logging.getLogger("board.retention")
+_lock = threading.Lock()
+_current: dict | None = None
+_last: dict | None = None
+_thread: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def _progress(report: dict, **changes):
+    with _lock:
+        report.update(changes)
+
+
+# ── Purge ────────────────────────────────────────────
+
+def _expired(post_cls, cutoff: datetime):
+    """deleted_at 없이 삭제된 옛 행은 마이그레이션(_m007, _m010)이 한 번 채워 두었다."""
+    return post_cls.is_deleted == True, post_cls.deleted_at < cutoff
+
+
+def _purge_batch(db: Session, post_cls, like_cls, cutoff: datetime, keep: set[int]) -> tuple[int, int] | None:
+    """보존 기간이 지난 삭제 글 BATCH_SIZE개를 지운다. (지운 글+댓글 수, 좋아요 수), 남은 게 없으면 None."""
+    db.execute(text("BEGIN IMMEDIATE"))
+    rows = (
+        db.query(post_cls.id, post_cls.parent_id)
+        .filter(*_expired(post_cls, cutoff), post_cls.id.notin_(keep))
+        .order_by(post_cls.deleted_at)
+        .limit(BATCH_SIZE)
+        .all()
+    )
+    if not rows:
+        db.rollback()
+        return None
+    ids = [post_id for post_id, _ in rows]
+    threads = [post_id for post_id, parent_id in rows if parent_id is None]
+    in_batch = or_(post_cls.id.in_(ids), post_cls.parent_id.in_(threads))
+    likes = db.execute(delete(like_cls).where(like_cls.post_id.in_(select(post_cls.id).where(in_batch)))).rowcount
+    # 댓글을 먼저 지운다 (posts.parent_id 외래 키). 삭제된 스레드의 댓글은 모두 삭제 상태다
+    posts = db.execute(delete(post_cls).where(post_cls.parent_id.in_(threads))).rowcount
+    posts += db.execute(delete(post_cls).where(post_cls.id.in_(ids))).rowcount
+    db.commit()
+    return posts, likes
+
+
+def purge(db: Session, report: dict, now: datetime | None = None):
+    """main과 보관소에서 보존 기간이 지난 삭제 글을 배치로 지운다. 진행 상황은 report에 쌓는다.
+
+    보이는 글·카운터는 바뀌지 않으므로 캐시 무효화나 이벤트는 없다.
+    """
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    cutoff = now - timedelta(days=RETENTION_DAYS)
+    for schema, post_cls, like_cls in _TARGETS:
+        # 보관소 ID는 새로 발급되지 않으므로 main에서만 가장 최근 스레드를 남긴다
+        keep = crud._newest_post_ids(db) if post_cls is Post else set()
+        while not _stop.is_set():
+            result = _purge_batch(db, post_cls, like_cls, cutoff, keep)
+            if result is None:
+                break
+            with _lock:
+                report["batches"] += 1
+                report["posts"] += result[0]
+                report["likes"] += result[1]
+            _logger.info("retention %s: 글 %d개, 좋아요 %d개 삭제 (누적 글 %d개)",
+                         schema, result[0], result[1], report["posts"])
+            time.sleep(PAUSE)
+
+
+def pending(db: Session, now: datetime | None = None) -> dict:
+    """스키마별 영구 삭제 대기 행 수 (삭제 상태인 전체 / 보존 기간이 지난 것)."""
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    cutoff = now - timedelta(days=RETENTION_DAYS)
+    result = {}
+    for schema, post_cls, _like_cls in _TARGETS:
+        deleted = db.query(func.count(post_cls.id)).filter(post_cls.is_deleted == True).scalar()
+        expired = db.query(func.count(post_cls.id)).filter(*_expired(post_cls, cutoff)).scalar()
+        result[schema] = {"deleted": deleted, "expired": expired if RETENTION_DAYS > 0 else 0}
+    return result
+
+
+# ── Vacuum ───────────────────────────────────────────
+
+def _pragma(conn, schema: str, name: str) -> int:
+    return conn.execute(text(f"PRAGMA {schema}.{name}")).scalar()
+
+
+def vacuum_stats() -> dict:
+    with engine.connect() as conn:
+        return {
+            schema: {
+                "auto_vacuum": _AUTO_VACUUM_MODES.get(_pragma(conn, schema, "auto_vacuum")),
+                "page_size": _pragma(conn, schema, "page_size"),
+                "page_count": _pragma(conn, schema, "page_count"),
+                "free_pages": _pragma(conn, schema, "freelist_count"),
+            }
+            for schema, _post_cls, _like_cls in _TARGETS
+        }
+
+
+def incremental_vacuum(report: dict):
+    """빈 페이지를 VACUUM_STEP_PAGES씩 짧은 쓰기 트랜잭션으로 나눠 파일에서 돌려준다."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for schema, _post_cls, _like_cls in _TARGETS:
+            page_size = _pragma(conn, schema, "page_size")
+            before = _pragma(conn, schema, "page_count")
+            free = _pragma(conn, schema, "freelist_count")
+            stats = {"auto_vacuum": _AUTO_VACUUM_MODES.get(_pragma(conn, schema, "auto_vacuum")),
+                     "free_pages": free, "freed_bytes": 0}
+            _progress(report, vacuum={**report["vacuum"], schema: stats})
+            if stats["auto_vacuum"] != "incremental":
+                continue
+            while free and not _stop.is_set():
+                # sqlite3의 execute()는 한 단계(페이지 하나)만 실행하므로 끝까지 도는 executescript로 보낸다
+                conn.connection.dbapi_connection.executescript(
+                    f"PRAGMA {schema}.incremental_vacuum({VACUUM_STEP_PAGES})"
+                )
+                free = _pragma(conn, schema, "freelist_count")
+                freed = (before - _pragma(conn, schema, "page_count")) * page_size
+                _progress(report, vacuum={**report["vacuum"], schema: {**stats, "free_pages": free, "freed_bytes": freed}})
+                time.sleep(PAUSE)
+            # WAL에 쌓인 잘린 페이지를 본 파일에 반영한다 (다른 연결을 기다리지 않음)
+            conn.execute(text(f"PRAGMA {schema}.wal_checkpoint(PASSIVE)")).all()
+            _logger.info("retention %s: %d bytes 반환", schema, report["vacuum"][schema]["freed_bytes"])
+
+
+def full_vacuum():
+    """auto_vacuum=INCREMENTAL로 바꾸는 일회성 전체 VACUUM. 끝날 때까지 다른 쓰기를 막는다."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for schema, _post_cls, _like_cls in _TARGETS:
+            conn.execute(text(f"PRAGMA {schema}.auto_vacuum=INCREMENTAL"))
+            conn.execute(text(f"VACUUM {schema}"))
+
+
+# ── Job ──────────────────────────────────────────────
+
+def run(dry_run: bool = False) -> dict:
+    """영구 삭제 후 점진적 VACUUM을 한 번 실행하고 결과를 반환한다. 이미 실행 중이면 그 진행 상황을 반환."""
+    global _current, _last
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), "finished_at": None,
+        "retention_days": RETENTION_DAYS, "dry_run": dry_run,
+        "batches": 0, "posts": 0, "likes": 0, "vacuum": {}, "error": None,
+    }
+    with _lock:
+        if _current is not None:
+            return dict(_current)
+        _current = report
+    db = SessionLocal()
+    try:
+        if dry_run:
+            _progress(report, pending=pending(db), vacuum=vacuum_stats())
+        else:
+            purge(db, report)
+            incremental_vacuum(report)
+    except Exception as e:
+        _logger.exception("retention job failed")
+        _progress(report, error=str(e))
+    finally:
+        db.close()
+        with _lock:
+            report["finished_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            _current = None
+            if not dry_run:
+                _last = report
+    return report
+
+
+def _loop():
+    while not _stop.wait(INTERVAL):
+        run()
+
+
+def start():
+    """INTERVAL마다 run()하는 백그라운드 스레드를 띄운다. 웹 서버 시작 시 ENABLED면 부른다."""
+    global _thread
+    if _thread is None:
+        _stop.clear()
+        _thread = threading.Thread(target=_loop, name="board-retention", daemon=True)
+        _thread.start()
+
+
+def stop(timeout: float = 10):
+    """진행 중인 배치/VACUUM 단계까지만 하고 멈춘다."""
+    global _thread
+    if _thread is not None:
+        _stop.set()
+        _thread.join(timeout)
+        _thread = None
+
+
+def status() -> dict:
+    with _lock:
+        return {
+            "enabled": ENABLED, "retention_days": RETENTION_DAYS, "interval_seconds": INTERVAL,
+            "running": dict(_current) if _current else None, "last_run": _last,
+        }
+
+
+if __name__ == "__main__":
+    from app.database import init_db
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = sys.argv[1:]
+    if not args or args[0] not in ("run", "vacuum", "status"):
+        print("usage: python -m app.retention run [--dry-run] | vacuum | status")
+        sys.exit(1)
+    init_db()
+    if args[0] == "run":
+        if not ENABLED:
+            print("RETENTION_DAYS가 설정되지 않았습니다")
+            sys.exit(1)
+        report = run(dry_run="--dry-run" in args)
+        if report["dry_run"]:
+            for schema, counts in report["pending"].items():
+                print(f"{schema}: 삭제 상태 {counts['deleted']}개 중 {counts['expired']}개 영구 삭제 예정")
+        else:
+            print(f"글 {report['posts']}개, 좋아요 {report['likes']}개 삭제 ({report['batches']}개 배치)")
+        for schema, stats in report["vacuum"].items():
+            print(f"{schema}: auto_vacuum={stats['auto_vacuum']}, 빈 페이지 {stats['free_pages']}개"
+                  + (f", {stats['freed_bytes']:,} bytes 반환" if "freed_bytes" in stats else ""))
+        sys.exit(1 if report["error"] else 0)
+    elif args[0] == "vacuum":
+        before = vacuum_stats()
+        full_vacuum()
+        for schema, stats in vacuum_stats().items():
+            freed = (before[schema]["page_count"] - stats["page_count"]) * stats["page_size"]
+            print(f"{schema}: auto_vacuum={stats['auto_vacuum']}, {freed:,} bytes 반환")
+    else:
+        db = SessionLocal()
+        try:
+            counts = pending(db)
+        finally:
+            db.close()
+        for schema, stats in vacuum_stats().items():
+            print(f"{schema}: 삭제 상태 {counts[schema]['deleted']}개 (보존 기간 지남 {counts[schema]['expired']}개),"
+                  f" auto_vacuum={stats['auto_vacuum']}, 빈 페이지 {stats['free_pages']}/{stats['page_count']}")
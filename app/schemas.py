@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import Annotated, Literal, Union
 
 
 class BoardCreate(BaseModel):
@@ -10,6 +11,7 @@ class BoardCreate(BaseModel):
     description: str = ""
     icon: str = ""
     sort_order: int = 0
+    archive_after_days: int | None = None  # None이면 ARCHIVE_AFTER_DAYS, 0이면 보관하지 않음
 
 
 class BoardOut(BaseModel):
@@ -53,6 +55,44 @@ class LikeCreate(BaseModel):
     author: str
 
 
+# ── Batch ───────────────────────────────────────────
+
+class BatchCreatePost(PostCreate):
+    op: Literal["create_post"]
+
+
+class BatchCreateReply(ReplyCreate):
+    op: Literal["create_reply"]
+    post_id: int
+
+
+class BatchToggleLike(LikeCreate):
+    op: Literal["toggle_like"]
+    post_id: int
+
+
+class BatchUpdatePost(PostUpdate):
+    op: Literal["update_post"]
+    post_id: int
+
+
+class BatchDeletePost(BaseModel):
+    op: Literal["delete_post"]
+    post_id: int
+
+
+BatchOperation = Annotated[
+    Union[BatchCreatePost, BatchCreateReply, BatchToggleLike, BatchUpdatePost, BatchDeletePost],
+    Field(discriminator="op"),
+]
+
+MAX_BATCH_OPERATIONS = 100
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
 class PostOut(BaseModel):
     id: int
     board_id: int
@@ -2,6 +2,8 @@
 
 from sqlalchemy.orm import Session
 from app.models import Board, Post
+from app.authors import intern
+from app.render import to_html
 
 
 BOARDS = [
@@ -216,10 +218,14 @@ def seed_data(db: Session):
                 board_id=board.id,
                 title=post_data["title"],
                 content=post_data["content"],
-                author=post_data["author"],
+                content_html=to_html(post_data["content"]),
+                author_id=intern(db, post_data["author"]),
                 is_pinned=post_data.get("is_pinned", False),
                 prefix=post_data.get("prefix"),
             )
             db.add(post)
+            db.flush()
+            board.post_count = 1
+            board.latest_post_id = post.id
 
     db.commit()
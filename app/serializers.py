@@ -0,0 +1,105 @@
+"""REST API 응답 형태.
+
+crud 결과(ORM 객체/딕셔너리)를 JSON 응답 딕셔너리로 바꾼다. FastAPI 라우트와
+MCP 서버의 direct 모드가 같은 함수를 써서 두 경로의 응답이 항상 같다.
+"""
+
+from datetime import datetime
+
+from app.models import Board, Post
+
+
+def _iso(dt: datetime | None) -> str | None:
+    return dt.isoformat() if dt else None
+
+
+def board_list(boards: list[dict]) -> list[dict]:
+    return [
+        {
+            "id": b["board"].id, "name": b["board"].name, "slug": b["board"].slug,
+            "category": b["board"].category, "team": b["board"].team,
+            "icon": b["board"].icon, "description": b["board"].description,
+            "post_count": b["post_count"],
+        }
+        for b in boards
+    ]
+
+
+def post_list(posts: list[dict]) -> list[dict]:
+    return [
+        {
+            "id": p["post"].id, "title": p["post"].title, "author": p["post"].author,
+            "prefix": p["post"].prefix, "tag": p["post"].tag, "is_pinned": p["post"].is_pinned,
+            "created_at": p["post"].created_at.isoformat(),
+            "updated_at": _iso(p["post"].updated_at),
+            "reply_count": p["reply_count"],
+            "like_count": p["like_count"], "liked_by": p["liked_by"],
+        }
+        for p in posts
+    ]
+
+
+def post_detail(data: dict) -> dict:
+    return {
+        "id": data["post"].id, "title": data["post"].title,
+        "content": data["post"].content, "author": data["post"].author,
+        "prefix": data["post"].prefix, "tag": data["post"].tag, "is_pinned": data["post"].is_pinned,
+        "created_at": data["post"].created_at.isoformat(),
+        "updated_at": _iso(data["post"].updated_at),
+        "board_slug": data["board"].slug, "board_name": data["board"].name,
+        "like_count": data["like_count"], "liked_by": data["liked_by"],
+        "replies": [
+            {
+                "id": r["reply"].id, "content": r["reply"].content, "author": r["reply"].author,
+                "created_at": r["reply"].created_at.isoformat(),
+                "updated_at": _iso(r["reply"].updated_at),
+                "like_count": r["like_count"], "liked_by": r["liked_by"],
+            }
+            for r in data["replies"]
+        ],
+    }
+
+
+def post_summaries(results: list[dict]) -> list[dict]:
+    """검색/최신 글 목록. 검색 결과에는 snippet이 붙는다."""
+    items = []
+    for r in results:
+        item = {
+            "id": r["post"].id, "title": r["post"].title, "author": r["post"].author,
+            "board_slug": r["board"].slug if r["board"] else "",
+            "board_name": r["board"].name if r["board"] else "",
+            "created_at": r["post"].created_at.isoformat(),
+            "updated_at": _iso(r["post"].updated_at),
+            "reply_count": r["reply_count"],
+            "like_count": r["like_count"],
+        }
+        if "snippet" in r:
+            item["snippet"] = r["snippet"]
+        items.append(item)
+    return items
+
+
+def created_post(post: Post) -> dict:
+    return {"id": post.id, "title": post.title, "created_at": post.created_at.isoformat()}
+
+
+def created_reply(reply: Post) -> dict:
+    return {"id": reply.id, "created_at": reply.created_at.isoformat()}
+
+
+def updated_post(post: Post) -> dict:
+    return {"id": post.id, "title": post.title, "content": post.content, "updated_at": _iso(post.updated_at)}
+
+
+def created_board(board: Board) -> dict:
+    return {"id": board.id, "slug": board.slug}
+
+
+def last_activity(data: dict) -> dict:
+    return {
+        "last_post_at": _iso(data["last_post_at"]),
+        "last_updated_at": _iso(data["last_updated_at"]),
+        "last_comment_at": _iso(data["last_comment_at"]),
+        "last_like_at": _iso(data["last_like_at"]),
+        "last_activity_at": _iso(data["last_activity_at"]),
+    }
@@ -0,0 +1,230 @@
+"""느린 쿼리 기록기 (선택, SLOW_QUERY_MS=임계값).
+
+임계값보다 오래 걸린 SQL마다 문장, 바인딩 파라미터의 형태(값은 남기지 않음), 호출한 app 함수
+(보통 app.crud.xxx), `EXPLAIN QUERY PLAN` 결과를 모아 최근 SLOW_QUERY_RING개는 메모리에,
+전부는 회전하는 JSONL 파일(SLOW_QUERY_LOG, 기본은 DB 옆 slow_queries.jsonl)에 남긴다.
+/api/admin/slow-queries로 조회한다. full_scan에 테이블 이름이 있으면 그 테이블을 인덱스 검색 없이 훑은 쿼리다.
+
+실행 계획은 같은 DB 파일의 읽기 전용 연결로 따로 구하고, 같은 문장은 한 번만 구해 재사용한다. 요청을 처리하던
+스레드(비동기 라우트면 이벤트 루프)를 막지 않도록 기록은 plan 없이 먼저 남기고, 계획은 백그라운드 스레드가 구해
+채운 뒤 파일에 쓴다. 대기열(PLAN_QUEUE_SIZE)이 차면 그 쿼리의 계획은 건너뛴다.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from sqlalchemy import event
+
+THRESHOLD_MS = float(os.getenv("SLOW_QUERY_MS", "0"))  # 0이면 끔
+ENABLED = THRESHOLD_MS > 0
+RING_SIZE = int(os.getenv("SLOW_QUERY_RING", "200"))
+LOG_PATH = os.getenv("SLOW_QUERY_LOG", "")
+LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_MB", "10")) * 1024 * 1024
+LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "3"))
+PLAN_CACHE_SIZE = 256
+PLAN_QUEUE_SIZE = 1000
+MAX_SQL_LEN = 2000
+
+# FTS 가상 테이블 훑기(SCAN posts_fts VIRTUAL TABLE INDEX ...)는 정상이므로 제외한다
+_FULL_SCAN = re.compile(r"\bSCAN (?:TABLE )?(?!CONSTANT ROW)(\w+)\b(?! VIRTUAL TABLE)")
+_SKIP_MODULES = {__name__, "app.database", "app.metrics"}
+
+_lock = threading.Lock()
+_ring: deque = deque(maxlen=RING_SIZE)
+_plans: OrderedDict[str, list[str] | str] = OrderedDict()
+_counters = {"captured": 0, "full_scans": 0}
+_db_path: str | None = None
+_archive_path: str | None = None
+_pending: queue.Queue = queue.Queue(maxsize=PLAN_QUEUE_SIZE)
+_worker: threading.Thread | None = None
+_logger = logging.getLogger("board.slowlog")
+_logger.propagate = False
+
+
+def _after_fork():
+    # 부모의 계획 스레드가 잡고 있던 잠금·대기열을 물려받지 않는다
+    global _lock, _pending, _worker
+    _lock = threading.Lock()
+    _pending = queue.Queue(maxsize=PLAN_QUEUE_SIZE)
+    _worker = None
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def install(engines: list, db_path: str, archive_path: str | None = None):
+    """engines에 리스너를 건다. app.database가 SLOW_QUERY_MS가 있을 때 한 번 부른다."""
+    global _db_path, _archive_path, LOG_PATH
+    _db_path, _archive_path = db_path, archive_path
+    LOG_PATH = LOG_PATH or os.path.join(os.path.dirname(os.path.abspath(db_path)), "slow_queries.jsonl")
+    try:
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8", delay=True,
+        )
+    except OSError:
+        LOG_PATH = ""  # 기록할 수 없는 위치면 메모리에만 남긴다
+    else:
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor)
+        event.listen(engine, "after_cursor_execute", _after_cursor)
+
+
+def _before_cursor(conn, _cursor, _statement, _parameters, _context, _executemany):
+    conn.info.setdefault("slowlog_start", []).append(time.perf_counter())
+
+
+def _after_cursor(conn, _cursor, statement, parameters, _context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["slowlog_start"].pop()) * 1000
+    if elapsed_ms >= THRESHOLD_MS:
+        _record(statement, parameters, executemany, elapsed_ms)
+
+
+# ── Capture ──────────────────────────────────────────
+
+def _shape(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, str):
+        return f"str({len(value)})"
+    if isinstance(value, (bytes, bytearray)):
+        return f"bytes({len(value)})"
+    return type(value).__name__
+
+
+def _param_shapes(parameters, executemany: bool):
+    if executemany:
+        return {"rows": len(parameters), "first": _param_shapes(parameters[0], False) if parameters else None}
+    if isinstance(parameters, dict):
+        return {k: _shape(v) for k, v in parameters.items()}
+    return [_shape(v) for v in parameters or ()]
+
+
+def _caller() -> str | None:
+    """호출 스택에서 app.crud 함수(없으면 가장 가까운 app 모듈 함수)를 찾는다."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module == "app.crud":
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        if fallback is None and module.startswith("app.") and module not in _SKIP_MODULES:
+            fallback = f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return fallback
+
+
+def _ro_uri(path: str) -> str:
+    return f"file:{quote(os.path.abspath(path))}?mode=ro"
+
+
+def _plan(statement: str, parameters, executemany: bool) -> list[str] | str:
+    """EXPLAIN QUERY PLAN 결과 행(들여쓰기로 트리 표시). 구할 수 없으면 오류 문자열."""
+    with _lock:
+        if statement in _plans:
+            _plans.move_to_end(statement)
+            return _plans[statement]
+    params = parameters[0] if executemany and parameters else parameters
+    try:
+        conn = sqlite3.connect(_ro_uri(_db_path), uri=True, timeout=1)
+        try:
+            if _archive_path and os.path.exists(_archive_path):
+                conn.execute("ATTACH DATABASE ? AS archive", (_ro_uri(_archive_path),))
+            rows = conn.execute("EXPLAIN QUERY PLAN " + statement, params or ()).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return f"explain failed: {e}"
+    depth = {0: -1}
+    plan = []
+    for node_id, parent, _notused, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        plan.append("  " * depth[node_id] + detail)
+    with _lock:
+        _plans[statement] = plan
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+def _record(statement: str, parameters, executemany: bool, elapsed_ms: float):
+    global _worker
+    entry = {
+        "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "ms": round(elapsed_ms, 2),
+        "sql": " ".join(statement.split())[:MAX_SQL_LEN],
+        "params": _param_shapes(parameters, executemany),
+        "caller": _caller(),
+        "plan": None,  # 백그라운드 스레드가 채운다
+        "full_scan": [],
+    }
+    with _lock:
+        _ring.append(entry)
+        _counters["captured"] += 1
+        # fork된 프로세스(gunicorn preload)에는 스레드가 따라오지 않으므로 필요할 때 띄운다
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_explain_loop, name="slowlog-explain", daemon=True)
+            _worker.start()
+    try:
+        _pending.put_nowait((entry, statement, parameters, executemany))
+    except queue.Full:
+        _finish(entry, "explain skipped: queue full")
+
+
+def _explain_loop():
+    while True:
+        entry, statement, parameters, executemany = _pending.get()
+        try:
+            _finish(entry, _plan(statement, parameters, executemany))
+        finally:
+            _pending.task_done()
+
+
+def _finish(entry: dict, plan: list[str] | str):
+    scans = sorted({m.group(1) for line in plan for m in _FULL_SCAN.finditer(line)}) if isinstance(plan, list) else []
+    with _lock:
+        entry["plan"] = plan
+        entry["full_scan"] = scans
+        _counters["full_scans"] += bool(scans)
+    if _logger.handlers:
+        _logger.info(json.dumps(entry, ensure_ascii=False))
+
+
+def flush():
+    """대기 중인 실행 계획을 모두 구할 때까지 기다린다."""
+    _pending.join()
+
+
+# ── Read ─────────────────────────────────────────────
+
+def recent(limit: int = 50, full_scan_only: bool = False) -> dict:
+    """최근 느린 쿼리(최신순)와 설정/누적 수."""
+    with _lock:
+        entries = [dict(e) for e in reversed(_ring) if e["full_scan"] or not full_scan_only][:limit]
+        counters = dict(_counters)
+    return {
+        "enabled": ENABLED,
+        "threshold_ms": THRESHOLD_MS,
+        "log_path": LOG_PATH or None,
+        **counters,
+        "queries": entries,
+    }
+
+
+def clear():
+    with _lock:
+        _ring.clear()
+        _plans.clear()
@@ -0,0 +1,161 @@
+"""여러 워커로 띄울 때의 시작 준비: 스키마·시드는 한 번만, 백그라운드 작업은 한 워커만.
+
+`uvicorn --workers N`이나 gunicorn은 워커마다 lifespan을 실행한다. 워커마다 create_all·마이그레이션·seed_data를
+돌리면 모두가 같은 쓰기 잠금을 두고 줄을 서고, 보존 정리(app.retention)·백업(app.backup) 스레드도 N개가 뜬다.
+
+prepare()는 먼저 읽기 전용 연결로 app_state의 'startup' 행 하나만 읽는다. 지금 코드의 지문(마이그레이션 버전,
+테이블·컬럼·인덱스, 시드 게시판)과 같으면 준비가 끝난 DB이므로 그대로 돌아간다. 다르면(새 DB, 스키마가 바뀐 배포)
+DB 옆 `<DB_PATH>.startup.lock` 파일 잠금을 잡고 지문을 다시 읽어, 여전히 다를 때만 init_db()와 seed_data()를
+실행하고 지문을 기록한다. 잠금을 기다리던 다른 워커는 다시 읽은 지문이 같으므로 건너뛴다.
+
+백그라운드 작업은 `<DB_PATH>.jobs.lock`을 잡은 워커 하나만 띄운다(lead_jobs). 그 워커가 죽으면 잠금이 풀리고
+새로 뜬 워커가 이어받는다.
+
+gunicorn preload(gunicorn.conf.py)에서는 마스터가 앱을 한 번 import하고 prepare()까지 마친 뒤 fork하므로,
+워커는 지문 한 번 읽고 바로 요청을 받는다. SQLite 연결은 fork를 건너 쓰면 안 되므로 prepare()는 자기가 연
+연결을 닫고 끝난다.
+
+fcntl이 없는 환경(Windows)에서는 파일 잠금 없이 프로세스 하나로 띄운다고 가정한다.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from sqlalchemy import text
+
+from app.database import ARCHIVE_PATH, DB_PATH, engine, read_engine
+
+LOCK_PATH = DB_PATH + ".startup.lock"
+JOBS_LOCK_PATH = DB_PATH + ".jobs.lock"
+_STATE_KEY = "startup"
+
+_logger = logging.getLogger("board.startup")
+_jobs_file = None
+
+
+def fingerprint() -> str:
+    """init_db()/seed_data()의 결과를 바꾸는 코드(마이그레이션, 모델, 보관소 인덱스, 시드 게시판)의 지문."""
+    from app import archive, migrations
+    from app.database import Base
+    from app.models import ArchiveBase
+    from app.seed import BOARDS
+
+    parts = [migrations.LATEST_VERSION, archive._INDEXES, [board["slug"] for board in BOARDS]]
+    for metadata in (Base.metadata, ArchiveBase.metadata):
+        for table in metadata.sorted_tables:
+            parts.append((table.fullname, [(c.name, str(c.type)) for c in table.columns],
+                          sorted(index.name for index in table.indexes)))
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+
+def _stored() -> str | None:
+    """DB에 기록된 지문. DB 파일이나 app_state 표가 아직 없으면 None."""
+    if not (os.path.exists(DB_PATH) and os.path.exists(ARCHIVE_PATH)):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(DB_PATH))}?mode=ro", uri=True, timeout=30)
+        try:
+            row = conn.execute("SELECT value FROM app_state WHERE key = ?", (_STATE_KEY,)).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def _record(value: str):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO app_state (key, value, updated_at) VALUES (:key, :value, CURRENT_TIMESTAMP)"
+            " ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at"
+        ), {"key": _STATE_KEY, "value": value})
+
+
+@contextmanager
+def _file_lock(path: str):
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield  # 파일을 닫으면 잠금이 풀린다
+
+
+def _close_connections():
+    from app import activity
+
+    engine.dispose()
+    read_engine.dispose()
+    activity.close()
+
+
+# ── Prepare ──────────────────────────────────────────
+
+def prepare() -> dict:
+    """필요하면 init_db()와 seed_data()를 한 프로세스에서만 실행한다. 한 일을 반환."""
+    from app.database import SessionLocal, init_db
+    from app.seed import seed_data
+
+    started = time.perf_counter()
+    current = fingerprint()
+    result = {"fingerprint": current, "prepared": False, "applied": [], "lock_wait": None}
+    if _stored() != current:
+        waiting = time.perf_counter()
+        with _file_lock(LOCK_PATH):
+            result["lock_wait"] = round(time.perf_counter() - waiting, 3)
+            if _stored() != current:
+                result["applied"] = init_db()
+                db = SessionLocal()
+                try:
+                    seed_data(db)
+                finally:
+                    db.close()
+                _record(current)
+                result["prepared"] = True
+        _close_connections()
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    _logger.info("startup pid=%s: %s", os.getpid(), result)
+    return result
+
+
+# ── Background job leader ────────────────────────────
+
+def lead_jobs() -> bool:
+    """이 프로세스가 백그라운드 작업을 맡으면 True. 잠금은 release_jobs()나 프로세스 종료까지 쥔다."""
+    global _jobs_file
+    if _jobs_file is not None or fcntl is None:
+        return True
+    f = open(JOBS_LOCK_PATH, "a")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        f.close()
+        return False
+    _jobs_file = f
+    return True
+
+
+def leads_jobs() -> bool:
+    return _jobs_file is not None or fcntl is None
+
+
+def release_jobs():
+    global _jobs_file
+    if _jobs_file is not None:
+        _jobs_file.close()
+        _jobs_file = None
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    result = prepare()
+    print(f"{'준비함' if result['prepared'] else '이미 준비됨'}: fingerprint {result['fingerprint']}, "
+          f"마이그레이션 {result['applied'] or '없음'} ({result['seconds']}초)")
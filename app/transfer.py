@@ -0,0 +1,369 @@
+"""게시판·글·댓글·좋아요 NDJSON 내보내기/가져오기.
+
+한 줄에 JSON 객체 하나이고 `type`이 meta → board → post → like 순서로 나온다. 작성자는 이름으로,
+게시판은 slug로 적어 다른 DB에서도 그대로 읽히고, 글·좋아요 ID는 유지해 /post/ID 링크가 깨지지 않는다.
+보관소(app.archive)에 있는 행은 `"archived": true`로 표시되어 가져올 때 보관소로 들어간다.
+
+내보내기는 각 줄을 SQLite json_object()로 만들어 yield_per(서버 측 커서)로 EXPORT_CHUNK행씩 읽어 바로
+흘려보내므로 메모리가 데이터 크기와 상관없이 일정하고, 한 읽기 트랜잭션 안에서 읽어 그동안의 쓰기와 섞이지 않는다.
+board_slug/since/until을 주면 그 게시판·기간에 작성된 스레드(최상위 글)와 그 댓글·좋아요만 내보낸다.
+
+가져오기는 posts/likes의 보조 인덱스와 FTS 트리거를 지운 뒤 IMPORT_BATCH줄씩 큰 트랜잭션으로 넣는다.
+줄을 임시 테이블에 그대로 넣고 SQLite JSON 함수(->>)로 풀어 INSERT ... SELECT 하므로 파이썬에서 줄마다
+JSON을 풀지 않는다. 끝나면(실패해도) 인덱스·트리거를 다시 만들고 FTS를 한 번에 재색인한 다음 카운터를
+app.reconcile로 맞춘다. 이미 있는 같은 글·좋아요(ID, 상위 글, 작성 시각이 같은 행)와 필수 필드(content 등)가
+빠진 줄은 건너뛰므로(skipped) 같은 파일을 다시 가져와도 된다. ID가 같은데 다른 행이면 그 배치를 넣지 않고 멈춘다
+(건너뛰면 파일의 댓글·좋아요가 같은 ID의 엉뚱한 스레드에 붙는다). 그때는 빈 DB로 가져온다. 인덱스가 없는 동안 다른 프로세스의 읽기가 느려지므로 서버를 멈추고 돌리는 것이 좋다.
+
+    python -m app.transfer export FILE [--board SLUG] [--since ISO] [--until ISO]   # FILE이 -면 표준 출력
+    python -m app.transfer import FILE [--batch N]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, case, func, literal, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import activity, archive, fts
+from app.models import ArchivedLike, ArchivedPost, Author, Board, Like, Post
+
+FORMAT_VERSION = 1
+EXPORT_CHUNK = int(os.getenv("EXPORT_CHUNK", "2000"))
+IMPORT_BATCH = int(os.getenv("IMPORT_BATCH", "50000"))  # 한 트랜잭션에 넣는 행 수
+
+_BOARD_FIELDS = ["name", "slug", "category", "team", "description", "icon", "sort_order", "is_active",
+                 "created_at", "archive_after_days"]
+_POST_FIELDS = ["id", "parent_id", "title", "content", "content_html", "prefix", "tag", "is_pinned", "is_deleted",
+                "deleted_at", "created_at", "updated_at", "reply_count", "like_count", "last_reply_at"]
+_LIKE_FIELDS = ["id", "post_id", "created_at"]
+_TIME_FIELDS = {"created_at", "updated_at", "deleted_at", "last_reply_at"}
+# (스키마, 글 모델, 좋아요 모델, archived 표시)
+_SOURCES = [("main", Post, Like, False), ("archive", ArchivedPost, ArchivedLike, True)]
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# ── Export ───────────────────────────────────────────
+
+def _json_row(kind: str, model, fields: list[str], **extra):
+    """행을 SQLite json_object()로 직렬화하는 식. 파이썬에서 행마다 dict를 만들어 인코딩하는 것보다 몇 배 빠르다."""
+    args = [literal("type"), literal(kind)]
+    for name in fields:
+        column = model.__table__.c[name]
+        if name in _TIME_FIELDS:
+            value = func.replace(column, " ", "T")  # 저장된 문자열 그대로 ISO 형식으로
+        elif isinstance(column.type, Boolean):
+            value = func.json(case((column == True, "true"), else_="false"))
+        else:
+            value = column
+        args += [literal(name), value]
+    for name, value in extra.items():
+        args += [literal(name), value]
+    return func.json_object(*args)
+
+
+def _thread_filter(post_cls, board_id: int | None, since: datetime | None, until: datetime | None):
+    """조건에 맞는 스레드의 글과 댓글. 조건이 없으면 None."""
+    conditions = [post_cls.parent_id == None]
+    if board_id is not None:
+        conditions.append(post_cls.board_id == board_id)
+    if since is not None:
+        conditions.append(post_cls.created_at >= since)
+    if until is not None:
+        conditions.append(post_cls.created_at < until)
+    if len(conditions) == 1:
+        return None
+    threads = select(post_cls.id).where(*conditions)
+    return or_(post_cls.id.in_(threads), post_cls.parent_id.in_(threads))
+
+
+def export_lines(
+    db: Session, board_slug: str | None = None, since: datetime | None = None, until: datetime | None = None,
+) -> Iterator[str]:
+    """NDJSON 줄을 하나씩 만든다. 없는 board_slug면 첫 줄을 만들기 전에 ValueError."""
+    since, until = _naive_utc(since), _naive_utc(until)
+    board_id = None
+    if board_slug:
+        board_id = db.execute(select(Board.id).where(Board.slug == board_slug)).scalar()
+        if board_id is None:
+            raise ValueError(f"Board not found: {board_slug}")
+    yield json.dumps({
+        "type": "meta", "version": FORMAT_VERSION,
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "board_slug": board_slug, "since": since and since.isoformat(), "until": until and until.isoformat(),
+    }, separators=(",", ":")) + "\n"
+
+    boards = select(_json_row("board", Board, _BOARD_FIELDS)).order_by(Board.id)
+    if board_id is not None:
+        boards = boards.where(Board.id == board_id)
+    queries = [boards]
+    for _, post_cls, _, archived in _SOURCES:
+        query = select(_json_row(
+            "post", post_cls, _POST_FIELDS, board=Board.slug, author=Author.name, archived=func.json(str(archived).lower()),
+        )).select_from(post_cls).outerjoin(Board, Board.id == post_cls.board_id).outerjoin(
+            Author, Author.id == post_cls.author_id).order_by(post_cls.id)
+        where = _thread_filter(post_cls, board_id, since, until)
+        queries.append(query if where is None else query.where(where))
+    for _, post_cls, like_cls, archived in _SOURCES:
+        query = select(_json_row(
+            "like", like_cls, _LIKE_FIELDS, author=Author.name, archived=func.json(str(archived).lower()),
+        )).select_from(like_cls).outerjoin(Author, Author.id == like_cls.author_id).order_by(like_cls.id)
+        where = _thread_filter(post_cls, board_id, since, until)
+        queries.append(query if where is None else query.where(like_cls.post_id.in_(select(post_cls.id).where(where))))
+
+    conn = db.connection()  # ORM 행 처리를 거치지 않는다
+    for query in queries:
+        for (line,) in conn.execute(query.execution_options(yield_per=EXPORT_CHUNK)):
+            yield line + "\n"
+
+
+def chunked(lines: Iterator[str], size: int = EXPORT_CHUNK) -> Iterator[str]:
+    """줄을 size개씩 이어 붙인다. StreamingResponse가 동기 이터레이터를 항목마다 스레드풀로 넘기므로 줄 단위는 느리다."""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield "".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield "".join(buffer)
+
+
+# ── Import ───────────────────────────────────────────
+
+def _stamp(value: str | None) -> str | None:
+    """ISO 시각을 SQLAlchemy SQLite DateTime 저장 형식(YYYY-MM-DD HH:MM:SS.ffffff, UTC)으로 맞춘다."""
+    if value is None:
+        return None
+    if len(value) == 26 and value[10] in "T ":  # 내보낸 그대로인 값
+        return value[:10] + " " + value[11:]
+    parsed = _naive_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    return parsed.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _defer_indexes(conn: Connection) -> list[str]:
+    """posts/likes의 보조 인덱스와 트리거(FTS 동기화)를 지우고, main 쪽을 다시 만들 DDL을 반환한다.
+
+    보관소 쪽은 archive.ensure_schema가 다시 만든다. UNIQUE 제약의 자동 인덱스는 지울 수 없어 남는다.
+    """
+    restore = []
+    for schema in ("main", "archive"):
+        rows = conn.execute(text(
+            f"SELECT type, name, sql FROM {schema}.sqlite_master "
+            "WHERE type IN ('index', 'trigger') AND tbl_name IN ('posts', 'likes') AND sql IS NOT NULL"
+        )).all()
+        for kind, name, sql in rows:
+            conn.execute(text(f"DROP {kind.upper()} {schema}.{name}"))
+            if schema == "main":
+                restore.append(sql)
+    return restore
+
+
+def _restore_indexes(conn: Connection, restore: list[str]) -> int:
+    """지운 인덱스·트리거를 다시 만들고 FTS를 재색인한다. 색인한 글 수를 반환."""
+    for sql in restore:
+        conn.execute(text(sql))
+    archive.ensure_schema(conn)
+    return fts.rebuild(conn) + fts.rebuild(conn, "archive")
+
+
+def _value(name: str) -> str:
+    """스테이징 줄에서 필드를 꺼내는 SQL 식. 시각은 내보낸 형식이면 SQL에서, 아니면 _stamp로 바꾼다."""
+    expr = f"line ->> '{name}'"
+    if name in _TIME_FIELDS:
+        expr = f"CASE WHEN length({expr}) = 26 THEN replace({expr}, 'T', ' ') ELSE transfer_stamp({expr}) END"
+    if name in _DEFAULTS:
+        expr = f"coalesce({expr}, {_DEFAULTS[name]})"
+    return expr
+
+
+# 줄마다 JSON을 한 번 풀어 종류·보관 여부·작성자·게시판을 따로 담아 두고, 나머지 필드는 넣을 때 꺼낸다
+_STAGE_DDL = """CREATE TEMP TABLE IF NOT EXISTS transfer_lines (
+    number INTEGER PRIMARY KEY, line TEXT NOT NULL, kind TEXT, archived INTEGER, author TEXT, board TEXT
+)"""
+_STAGE_INSERT = (
+    "INSERT INTO temp.transfer_lines (number, line, kind, archived, author, board) "
+    "VALUES (?1, ?2, ?2 ->> 'type', coalesce(?2 ->> 'archived', 0), ?2 ->> 'author', ?2 ->> 'board')"
+)
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
+# 직접 만든 파일에서 빠지기 쉬운 필드의 기본값 (NOT NULL 컬럼에 NULL을 넣으면 그 행은 건너뛰어진다)
+_DEFAULTS = {"is_pinned": "0", "is_deleted": "0", "reply_count": "0", "like_count": "0", "sort_order": "0",
+             "is_active": "1", "description": "''", "icon": "''", "created_at": _NOW, "updated_at": _NOW}
+# 배치를 넣기 전에 확인할 것: (조건, 오류 메시지). 게시판 확인은 배치의 게시판을 넣은 뒤에 한다
+_CHECKS = [
+    ("kind IS NULL OR kind NOT IN ('meta', 'board', 'post', 'like')", "'unknown record type: ' || coalesce(kind, 'null')"),
+    ("kind IN ('post', 'like') AND author IS NULL", "'author is missing'"),
+]
+def _clash_check(kind: str) -> tuple[str, str]:
+    """이미 있는 다른 글·좋아요(또는 다른 쪽 스키마의 행)와 ID가 겹치는 줄을 찾는 _check 인자."""
+    table, owner = ("posts", "parent_id") if kind == "post" else ("likes", "post_id")
+    same = f"t.{owner} IS line ->> '{owner}' AND t.created_at IS {_value('created_at')}"
+    clashes = " OR ".join(
+        f"EXISTS (SELECT 1 FROM {schema}.{table} t WHERE t.id = line ->> 'id' "
+        f"AND (archived != {int(archived)} OR NOT ({same})))"
+        for schema, _, _, archived in _SOURCES
+    )
+    return (f"kind = '{kind}' AND ({clashes})",
+            f"'{kind} id ' || (line ->> 'id') || ' is already used by a different {kind} in this database'")
+
+
+_BOARD_CHECK = ("kind = 'post' AND NOT EXISTS (SELECT 1 FROM main.boards b WHERE b.slug = board)",
+                "'Board not found: ' || coalesce(board, 'null')")
+
+
+def _insert_sql(kind: str, schema: str, archived: bool) -> str:
+    table, fields = ("posts", _POST_FIELDS) if kind == "post" else ("likes", _LIKE_FIELDS)
+    joins = "JOIN main.authors a ON a.name = author"
+    columns, values = fields + ["author_id"], [_value(f) for f in fields] + ["a.id"]
+    if kind == "post":
+        joins += " JOIN main.boards b ON b.slug = board"
+        columns.append("board_id")
+        values.append("b.id")
+    return (
+        f"INSERT OR IGNORE INTO {schema}.{table} ({', '.join(columns)}) SELECT {', '.join(values)} "
+        f"FROM temp.transfer_lines {joins} WHERE kind = '{kind}' AND archived = {int(archived)} ORDER BY number"
+    )
+
+
+def _check(raw, condition: str, message: str):
+    bad = raw.execute(f"SELECT number, {message} FROM temp.transfer_lines WHERE {condition} "
+                      "ORDER BY number LIMIT 1").fetchone()
+    if bad:
+        raise ValueError(f"line {bad[0]}: {bad[1]}")
+
+
+def _stage(raw, batch: list[tuple[int, str]]):
+    try:
+        raw.executemany(_STAGE_INSERT, batch)
+    except sqlite3.OperationalError as e:
+        if "JSON" not in str(e):
+            raise
+        for number, line in batch:  # 어느 줄인지 찾는다
+            try:
+                json.loads(line)
+            except json.JSONDecodeError as bad:
+                raise ValueError(f"line {number}: {bad}") from None
+        raise
+
+
+def _load_batch(raw, batch: list[tuple[int, str]], counts: dict):
+    """한 트랜잭션에서 줄 묶음을 스테이징 테이블에 넣고, SQLite JSON 함수로 풀어 각 테이블에 INSERT ... SELECT 한다."""
+    raw.execute("BEGIN IMMEDIATE")
+    try:
+        _stage(raw, batch)
+        for condition, message in _CHECKS:
+            _check(raw, condition, message)
+        cursor = raw.execute(
+            f"INSERT OR IGNORE INTO main.boards ({', '.join(_BOARD_FIELDS)}, post_count) "
+            f"SELECT {', '.join(_value(f) for f in _BOARD_FIELDS)}, 0 FROM temp.transfer_lines "
+            "WHERE kind = 'board' ORDER BY number"
+        )
+        counts["boards"] += cursor.rowcount
+        _check(raw, *_BOARD_CHECK)
+        for kind in ("post", "like"):
+            _check(raw, *_clash_check(kind))
+        raw.execute(f"INSERT OR IGNORE INTO main.authors (name, created_at) SELECT DISTINCT author, {_NOW} "
+                    "FROM temp.transfer_lines WHERE kind IN ('post', 'like')")
+        totals = dict(raw.execute("SELECT kind, count(*) FROM temp.transfer_lines GROUP BY kind").fetchall())
+        for kind, table in (("post", "posts"), ("like", "likes")):
+            inserted = sum(raw.execute(_insert_sql(kind, schema, archived)).rowcount
+                           for schema, _, _, archived in _SOURCES)
+            counts[table] += inserted
+            counts["skipped"] += totals.get(kind, 0) - inserted
+        raw.execute("DELETE FROM temp.transfer_lines")
+        raw.execute("COMMIT")
+    except BaseException:
+        raw.execute("ROLLBACK")
+        raise
+
+
+def import_lines(lines: Iterable[str], batch_size: int = IMPORT_BATCH) -> dict:
+    """NDJSON 줄을 가져온다. {boards, posts, likes: 넣은 수, skipped: 이미 있어 건너뛴 수, indexed, seconds}.
+
+    잘못된 줄에서 ValueError로 멈추며, 그 앞의 배치는 이미 커밋되어 있다.
+    """
+    from app.database import SessionLocal, engine
+    from app.reconcile import reconcile
+
+    started = time.perf_counter()
+    counts = {"boards": 0, "posts": 0, "likes": 0, "skipped": 0}
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        raw = conn.connection.dbapi_connection
+        raw.create_function("transfer_stamp", 1, _stamp, deterministic=True)
+        raw.execute("PRAGMA synchronous=OFF")  # 중간에 죽으면 다시 가져오면 된다
+        raw.execute("PRAGMA cache_size=-262144")
+        raw.execute(_STAGE_DDL)
+        restore = _defer_indexes(conn)
+        try:
+            batch = []
+            for number, line in enumerate(lines, 1):
+                if line.strip():
+                    batch.append((number, line))
+                if len(batch) >= batch_size:
+                    _load_batch(raw, batch, counts)
+                    batch.clear()
+            if batch:
+                _load_batch(raw, batch, counts)
+        finally:
+            indexed = _restore_indexes(conn, restore)
+            raw.execute("DROP TABLE temp.transfer_lines")
+            raw.execute("PRAGMA synchronous=NORMAL")
+            raw.execute("PRAGMA cache_size=-2000")
+    db = SessionLocal()
+    try:
+        reconcile(db, fix=True)
+        if counts["boards"] or counts["posts"] or counts["likes"]:
+            activity.touch(db)  # 세션을 거치지 않고 넣었으므로 활동 번호를 따로 올린다
+            db.commit()
+    finally:
+        db.close()
+    return {**counts, "indexed": indexed, "seconds": round(time.perf_counter() - started, 2)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.database import ReadSessionLocal, init_db
+
+    parser = argparse.ArgumentParser(prog="python -m app.transfer")
+    commands = parser.add_subparsers(dest="command", required=True)
+    out = commands.add_parser("export")
+    out.add_argument("file")
+    out.add_argument("--board")
+    out.add_argument("--since", type=datetime.fromisoformat)
+    out.add_argument("--until", type=datetime.fromisoformat)
+    into = commands.add_parser("import")
+    into.add_argument("file")
+    into.add_argument("--batch", type=int, default=IMPORT_BATCH)
+    args = parser.parse_args()
+
+    init_db()
+    try:
+        if args.command == "export":
+            db = ReadSessionLocal()
+            stream = sys.stdout if args.file == "-" else open(args.file, "w", encoding="utf-8")
+            try:
+                stream.writelines(export_lines(db, args.board, args.since, args.until))
+            finally:
+                db.close()
+                if stream is not sys.stdout:
+                    stream.close()
+        else:
+            with (sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")) as lines:
+                result = import_lines(lines, args.batch)
+            print(f"게시판 {result['boards']}개, 글 {result['posts']}개, 좋아요 {result['likes']}개 추가"
+                  f" (건너뜀 {result['skipped']}개, FTS 색인 {result['indexed']}개, {result['seconds']}초)")
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
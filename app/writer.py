@@ -0,0 +1,228 @@
+"""그룹 커밋 쓰기 큐 (선택, WRITE_QUEUE=1).
+
+동시 쓰기가 SQLite 쓰기 잠금을 두고 busy_timeout 안에서 경쟁하는 대신, 전용 쓰기 스레드 하나가
+큐에 쌓인 crud 쓰기(_xxx, flush까지만 하는 버전)를 WRITE_QUEUE_WINDOW_MS 동안 최대
+WRITE_QUEUE_MAX_GROUP개까지 모아 한 트랜잭션으로 실행하고 한 번만 커밋한다. 호출자는 자기 결과만 await한다.
+
+- _xxx가 던진 ValueError(대상 없음 등)는 DB를 건드리기 전이므로 그 작업만 실패하고 그룹은 계속된다.
+- 그 밖의 예외로 커밋이 실패하면 그룹을 롤백하고 작업마다 따로 다시 실행해 원인 작업만 실패시킨다.
+- exclusive 작업(run_batch 등 스스로 커밋하는 함수)은 그룹에 섞지 않고 단독으로 실행한다.
+
+대기열 길이와 대기/전체/커밋 지연 백분위는 stats()로 (/api/admin/write-queue) 확인한다.
+"""
+
+import asyncio
+import contextvars
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base, engine
+
+ENABLED = os.getenv("WRITE_QUEUE", "0") == "1"
+WINDOW = float(os.getenv("WRITE_QUEUE_WINDOW_MS", "5")) / 1000
+MAX_GROUP = int(os.getenv("WRITE_QUEUE_MAX_GROUP", "32"))
+STATS_WINDOW = 1000  # 최근 N개 작업/그룹의 지연만 보관
+
+# 결과 객체를 커밋 뒤 다른 스레드(요청 처리)에서 읽으므로 expire하지 않는다
+_Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+
+class _Job:
+    __slots__ = ("fn", "args", "after", "exclusive", "loop", "future", "context",
+                 "queued_at", "started_at", "value", "error")
+
+    def __init__(self, fn, args, after, exclusive, loop, future):
+        self.fn, self.args, self.after, self.exclusive = fn, args, after, exclusive
+        self.loop, self.future = loop, future
+        self.context = contextvars.copy_context()  # 요청 문맥(app.metrics 계측 등)에서 실행한다
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.value = self.error = None
+
+
+_queue: "queue.Queue[_Job | None]" = queue.Queue()
+_thread: threading.Thread | None = None
+_start_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_wait_ms: deque = deque(maxlen=STATS_WINDOW)
+_total_ms: deque = deque(maxlen=STATS_WINDOW)
+_commit_ms: deque = deque(maxlen=STATS_WINDOW)
+_group_sizes: deque = deque(maxlen=STATS_WINDOW)
+_counters = {"jobs": 0, "groups": 0, "failed": 0, "fallbacks": 0, "max_depth": 0}
+
+
+async def run(fn: Callable, *args, after: Callable | None = None, exclusive: bool = False):
+    """fn(db, *args)를 쓰기 스레드에서 실행하고 커밋된 뒤 결과를 돌려준다.
+
+    after(db, value)가 있으면 커밋 후 같은 세션에서 호출해 그 반환값을 결과로 쓴다.
+    exclusive=True인 fn은 직접 커밋하는 함수로, 다른 작업과 묶지 않는다.
+    """
+    _ensure_started()
+    loop = asyncio.get_running_loop()
+    job = _Job(fn, args, after, exclusive, loop, loop.create_future())
+    _queue.put(job)
+    depth = _queue.qsize()
+    if depth > _counters["max_depth"]:
+        _counters["max_depth"] = depth
+    return await job.future
+
+
+def _ensure_started():
+    global _thread
+    if _thread is None:
+        with _start_lock:
+            if _thread is None:
+                _thread = threading.Thread(target=_loop, name="board-writer", daemon=True)
+                _thread.start()
+
+
+def stop(timeout: float = 10):
+    """남은 작업을 처리한 뒤 쓰기 스레드를 끝낸다."""
+    global _thread
+    if _thread is not None:
+        _queue.put(None)
+        _thread.join(timeout)
+        _thread = None
+
+
+# ── Writer thread ────────────────────────────────────
+
+def _collect(first: _Job) -> tuple[list[_Job], bool]:
+    """first부터 창(window) 동안 작업을 모은다. (그룹, 종료 신호를 받았는지)"""
+    group = [first]
+    deadline = time.perf_counter() + WINDOW
+    while len(group) < MAX_GROUP and not group[-1].exclusive:
+        remaining = deadline - time.perf_counter()
+        try:
+            job = _queue.get(timeout=remaining) if remaining > 0 else _queue.get_nowait()
+        except queue.Empty:
+            break
+        if job is None:
+            return group, True
+        group.append(job)
+    return group, False
+
+
+def _loop():
+    stopping = False
+    while not stopping:
+        first = _queue.get()
+        if first is None:
+            break
+        group, stopping = _collect(first)
+        shared = [job for job in group if not job.exclusive]
+        if shared:
+            _run_group(shared)
+        for job in group:
+            if job.exclusive:
+                _run_group([job])
+    # 종료 신호 뒤에 남은 작업도 처리한다
+    while True:
+        try:
+            job = _queue.get_nowait()
+        except queue.Empty:
+            return
+        if job is not None:
+            _run_group([job])
+
+
+def _run_group(jobs: list[_Job]):
+    start = time.perf_counter()
+    for job in jobs:
+        job.started_at = job.started_at or start
+        job.value = job.error = None
+    db: Session = _Session()
+    try:
+        for job in jobs:
+            try:
+                job.value = job.context.run(job.fn, db, *job.args)
+            except ValueError as e:
+                job.error = e
+        commit_start = time.perf_counter()
+        exclusive = jobs[0].exclusive  # 스스로 커밋한다
+        if not exclusive:
+            db.commit()
+        commit_ms = (time.perf_counter() - commit_start) * 1000
+        for job in jobs:
+            if job.error is None and isinstance(job.value, Base):
+                job.context.run(db.refresh, job.value)  # 직접 커밋하는 crud 함수와 같은 값(DB에 저장된 형태)을 돌려준다
+            if job.error is None and job.after:
+                try:
+                    job.value = job.context.run(job.after, db, job.value)
+                except Exception as e:
+                    job.error = e
+    except Exception as e:
+        db.rollback()
+        db.close()
+        if len(jobs) > 1:
+            # 어느 작업 때문인지 모르므로 하나씩 따로 커밋한다
+            with _stats_lock:
+                _counters["fallbacks"] += 1
+            for job in jobs:
+                _run_group([job])
+            return
+        jobs[0].error = e
+        _resolve(jobs)
+        return
+    db.close()
+    with _stats_lock:
+        _counters["groups"] += 1
+        _group_sizes.append(len(jobs))
+        if not exclusive:
+            _commit_ms.append(commit_ms)
+    _resolve(jobs)
+
+
+def _resolve(jobs: list[_Job]):
+    now = time.perf_counter()
+    with _stats_lock:
+        for job in jobs:
+            _counters["jobs"] += 1
+            _counters["failed"] += job.error is not None
+            _wait_ms.append((job.started_at - job.queued_at) * 1000)
+            _total_ms.append((now - job.queued_at) * 1000)
+    for job in jobs:
+        job.loop.call_soon_threadsafe(_set_result, job)
+
+
+def _set_result(job: _Job):
+    if job.future.done():  # 호출자가 취소함
+        return
+    if job.error is not None:
+        job.future.set_exception(job.error)
+    else:
+        job.future.set_result(job.value)
+
+
+# ── Stats ────────────────────────────────────────────
+
+def _percentiles(values) -> dict:
+    ordered = sorted(values)
+    if not ordered:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 2)
+    return {"p50": pct(50), "p95": pct(95), "p99": pct(99), "max": round(ordered[-1], 2)}
+
+
+def stats() -> dict:
+    with _stats_lock:
+        sizes = list(_group_sizes)
+        return {
+            "enabled": ENABLED,
+            "window_ms": WINDOW * 1000,
+            "max_group": MAX_GROUP,
+            "queue_depth": _queue.qsize(),
+            **_counters,
+            "avg_group_size": round(sum(sizes) / len(sizes), 2) if sizes else None,
+            "wait_ms": _percentiles(_wait_ms),
+            "total_ms": _percentiles(_total_ms),
+            "commit_ms": _percentiles(_commit_ms),
+        }
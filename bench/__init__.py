@@ -0,0 +1,13 @@
+"""성능 측정 도구 (합성 데이터 생성기 + 엔드포인트 벤치마크). 앱 런타임에는 쓰이지 않는다."""
+
+import os
+import sys
+
+
+def use_db(path: str):
+    """DB_PATH를 path로 정한다. app.database는 import 시점에 DB_PATH를 읽으므로 그 전에 불러야 한다."""
+    path = os.path.abspath(path)
+    database = sys.modules.get("app.database")
+    if database is not None and os.path.abspath(database.DB_PATH) != path:
+        raise RuntimeError(f"app.database가 이미 {database.DB_PATH}로 초기화됨")
+    os.environ["DB_PATH"] = path
@@ -0,0 +1,217 @@
+"""합성 데이터 생성기. 빈(또는 새) SQLite 파일에 게시판/글/댓글/좋아요를 대량으로 채운다.
+
+시드 게시판 9개에 더해 --boards개까지 게시판을 만들고, 게시판·작성자 선택은 Zipf 분포
+(상위 몇 개에 몰림), 글마다 인기도(파레토)를 뽑아 댓글/좋아요 수가 소수의 글에 몰리게 한다.
+본문은 한국어 문장에 목록·코드 블록·표를 섞은 Markdown이다.
+
+    python -m bench.datagen /tmp/bench.db                      # 기본 규모 (글 5000개)
+    python -m bench.datagen /tmp/bench.db --posts 50000 --no-html
+
+쓰기는 crud를 거치지 않고 한 트랜잭션에 묶어 넣은 뒤, 비정규화 카운터는 app.reconcile로 채운다.
+FTS 색인은 posts 트리거가 함께 채운다.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from bench import use_db
+
+CHUNK = 2000
+
+TEAMS = ["law", "buspush", "airlock", "elkhound", "board"]
+ROLES = ["개발", "기획", "QA", "보안", "운영", "법무", "PM", "디자인"]
+PREFIXES = [None, None, None, "[전체]", "[law]", "[buspush]", "[airlock]", "[elkhound]", "[board]"]
+TAGS = [None, None, "기능추가", "아이디어", "버그제보", "개선요청"]
+
+TOPICS = [
+    "배포 파이프라인", "SQLite 잠금", "FTS 검색", "로그 수집", "알림 지연", "계약서 검토", "토큰 만료",
+    "캐시 무효화", "마이그레이션", "API 응답 시간", "Compose 화면", "에러 패턴", "CI 빌드", "모니터링 대시보드",
+    "권한 체크", "버스 도착 정보", "게이트웨이 정책", "테스트 커버리지", "코드 리뷰", "장애 회고",
+]
+TITLE_FORMS = [
+    "{topic} 관련 공유드립니다", "{topic} 이슈 정리", "오늘의 작업 요약 — {topic}", "{topic} 개선안 제안",
+    "{topic} 때문에 삽질한 후기", "{topic} 질문 있습니다", "{topic} 진행 상황 ({n}차)", "[긴급] {topic} 확인 부탁",
+]
+SENTENCES = [
+    "{topic} 작업을 오늘 마무리했습니다.", "원인은 {topic} 설정 값이 환경마다 달랐던 것이었어요.",
+    "재현 조건을 정리해서 아래에 남깁니다.", "리뷰 요청드립니다. 특히 예외 처리 부분 봐주세요.",
+    "지난주 회의에서 나온 {topic} 의견을 반영했습니다.", "측정해 보니 p99가 {n}ms 정도 나옵니다.",
+    "블로커가 하나 있는데 {topic} 담당자 확인이 필요합니다.", "임시 조치는 했고 근본 원인은 계속 보고 있어요.",
+    "새벽 배포 후 알람이 {n}건 올라왔는데 모두 해소됐습니다.", "문서 업데이트는 내일까지 하겠습니다.",
+    "비슷한 문제 겪으신 분 계시면 댓글 부탁드려요.", "{topic} 쪽은 다음 스프린트로 넘기는 게 좋겠습니다.",
+    "테스트는 로컬과 스테이징 모두 통과했습니다.", "이 방법이 생각보다 효과가 좋네요 👍",
+]
+REPLIES = [
+    "확인했습니다!", "좋은 정리 감사합니다 🙏", "저도 같은 문제 겪었어요. {topic} 설정 한번 보세요.",
+    "이 부분은 내일 같이 봐요.", "리뷰 완료했습니다. 코멘트 몇 개 남겼어요.", "수고하셨습니다 👏",
+    "재현 안 되는데 로그 공유 가능할까요?", "{topic} 관련해서는 지난번 글도 참고하세요.", "LGTM",
+]
+CODE = {
+    "python": "def handler(event):\n    for item in event[\"items\"]:\n        if item.get(\"retry\", 0) > {n}:\n            raise RuntimeError(item)\n    return len(event[\"items\"])",
+    "sql": "SELECT board_id, count(*)\nFROM posts\nWHERE parent_id IS NULL AND created_at > date('now', '-{n} days')\nGROUP BY board_id;",
+    "bash": "docker compose logs -f --tail={n} board | grep -i error",
+    "kotlin": "val arrival = repository.fetchArrival(stopId)\nif (arrival.minutes <= {n}) notify(arrival)",
+}
+
+
+def _zipf_weights(n: int, s: float) -> list[float]:
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def _fill(rng: random.Random, template: str) -> str:
+    return template.format(topic=rng.choice(TOPICS), n=rng.randint(2, 500))
+
+
+def _content(rng: random.Random) -> str:
+    parts = []
+    for _ in range(max(1, int(rng.lognormvariate(0.8, 0.6)))):
+        roll = rng.random()
+        if roll < 0.5:
+            parts.append(" ".join(_fill(rng, rng.choice(SENTENCES)) for _ in range(rng.randint(1, 4))))
+        elif roll < 0.7:
+            parts.append("## " + rng.choice(TOPICS) + "\n" + "\n".join(
+                f"- {_fill(rng, rng.choice(SENTENCES))}" for _ in range(rng.randint(2, 5))))
+        elif roll < 0.85:
+            lang = rng.choice(list(CODE))
+            parts.append(f"```{lang}\n{_fill(rng, CODE[lang])}\n```")
+        elif roll < 0.95:
+            rows = "\n".join(f"| {rng.choice(TOPICS)} | {rng.randint(1, 99)}% | `{rng.choice(TEAMS)}` |"
+                             for _ in range(rng.randint(2, 4)))
+            parts.append("| 항목 | 진행률 | 담당 |\n|---|---|---|\n" + rows)
+        else:
+            parts.append(f"참고: https://example.com/{rng.choice(TEAMS)}/{rng.randint(1, 9999)} **꼭 확인**")
+    return "\n\n".join(parts)
+
+
+def generate(boards: int = 20, posts: int = 5000, replies: float = 3.0, likes: float = 2.0,
+             authors: int = 200, days: int = 365, skew: float = 1.1, deleted: float = 0.02,
+             html: bool = True, seed: int = 1) -> dict:
+    """현재 DB_PATH에 데이터를 추가하고 생성한 행 수를 반환한다."""
+    from sqlalchemy import func, insert, select
+    from app.database import SessionLocal, engine, init_db
+    from app.models import Author, Board, Like, Post
+    from app.reconcile import reconcile
+    from app.render import to_html
+    from app.seed import seed_data
+
+    rng = random.Random(seed)
+    render = to_html if html else (lambda _content: None)
+    init_db()
+    db = SessionLocal()
+    try:
+        seed_data(db)
+    finally:
+        db.close()
+
+    with engine.begin() as conn:
+        # 게시판
+        existing = conn.execute(select(func.count(Board.id))).scalar()
+        new_boards = [
+            {"name": f"[{TEAMS[i % len(TEAMS)]}] 벤치 게시판 {i + 1}", "slug": f"bench-{i + 1}",
+             "category": "team" if i % 3 else "global", "team": TEAMS[i % len(TEAMS)], "icon": "🧪",
+             "sort_order": 100 + i, "description": "합성 데이터", "is_active": True,
+             "post_count": 0, "created_at": datetime.now(timezone.utc)}
+            for i in range(existing, boards)
+        ]
+        if new_boards:
+            conn.execute(insert(Board), new_boards)
+        board_ids = conn.execute(select(Board.id).order_by(Board.sort_order, Board.id)).scalars().all()
+
+        # 작성자
+        names = [f"{rng.choice(TEAMS)}-{rng.choice(ROLES)}{i}" for i in range(authors)]
+        conn.execute(insert(Author).prefix_with("OR IGNORE"),
+                     [{"name": name, "created_at": datetime.now(timezone.utc)} for name in names])
+        name_ids = dict(conn.execute(select(Author.name, Author.id)).all())
+        author_ids = [name_ids[name] for name in dict.fromkeys(names)]
+
+        board_weights = _zipf_weights(len(board_ids), skew)
+        author_weights = _zipf_weights(len(author_ids), skew)
+        next_id = (conn.execute(select(func.max(Post.id))).scalar() or 0) + 1
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        start = now - timedelta(days=days)
+        span = (now - start).total_seconds()
+
+        # 글 (작성 시각 순으로 ID를 준다)
+        offsets = sorted(rng.uniform(0, span) for _ in range(posts))
+        threads = []  # (id, board_id, created_at, 인기도)
+        rows = []
+        for offset in offsets:
+            created = start + timedelta(seconds=offset)
+            board_id = rng.choices(board_ids, board_weights)[0]
+            content = _content(rng)
+            rows.append({
+                "id": next_id, "board_id": board_id, "parent_id": None,
+                "title": _fill(rng, rng.choice(TITLE_FORMS)), "content": content, "content_html": render(content),
+                "author_id": rng.choices(author_ids, author_weights)[0],
+                "prefix": rng.choice(PREFIXES), "tag": rng.choice(TAGS), "is_pinned": rng.random() < 0.002,
+                "is_deleted": rng.random() < deleted, "created_at": created, "updated_at": created,
+            })
+            threads.append((next_id, board_id, created, rng.paretovariate(1.5)))
+            next_id += 1
+        counts = {"posts": _insert_chunks(conn, insert(Post), rows)}
+
+        # 댓글 / 좋아요: 인기도(평균 3)에 비례해 몰린다
+        rows, like_rows = [], []
+        for post_id, board_id, created, popularity in threads:
+            for _ in range(min(500, round(replies * popularity / 3 * rng.random() * 2))):
+                at = min(now, created + timedelta(seconds=rng.expovariate(1 / 7200)))
+                content = _fill(rng, rng.choice(REPLIES))
+                rows.append({
+                    "id": next_id, "board_id": board_id, "parent_id": post_id, "title": None, "content": content,
+                    "content_html": render(content), "author_id": rng.choices(author_ids, author_weights)[0],
+                    "is_pinned": False, "is_deleted": rng.random() < deleted, "created_at": at, "updated_at": at,
+                })
+                next_id += 1
+            want = min(len(author_ids), round(likes * popularity / 3 * rng.random() * 2))
+            for author_id in rng.sample(author_ids, want):
+                at = min(now, created + timedelta(seconds=rng.expovariate(1 / 86400)))
+                like_rows.append({"post_id": post_id, "author_id": author_id, "created_at": at})
+        counts["replies"] = _insert_chunks(conn, insert(Post), rows)
+        counts["likes"] = _insert_chunks(conn, insert(Like).prefix_with("OR IGNORE"), like_rows)
+
+    db = SessionLocal()
+    try:
+        reconcile(db, fix=True)
+    finally:
+        db.close()
+    counts["boards"] = len(board_ids)
+    counts["authors"] = len(author_ids)
+    return counts
+
+
+def _insert_chunks(conn, statement, rows: list[dict]) -> int:
+    for i in range(0, len(rows), CHUNK):
+        conn.execute(statement, rows[i:i + CHUNK])
+    return len(rows)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m bench.datagen", description="합성 데이터 생성")
+    parser.add_argument("db", help="SQLite 파일 경로 (없으면 만든다)")
+    parser.add_argument("--boards", type=int, default=20, help="게시판 수 (시드 9개 포함)")
+    parser.add_argument("--posts", type=int, default=5000, help="최상위 글 수")
+    parser.add_argument("--replies", type=float, default=3.0, help="글당 평균 댓글 수")
+    parser.add_argument("--likes", type=float, default=2.0, help="글당 평균 좋아요 수")
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365, help="작성 시각을 흩뿌릴 기간")
+    parser.add_argument("--skew", type=float, default=1.1, help="게시판/작성자 Zipf 지수 (0이면 균등)")
+    parser.add_argument("--deleted", type=float, default=0.02, help="삭제 처리된 비율")
+    parser.add_argument("--no-html", action="store_true", help="content_html을 비워 둔다 (생성이 빨라짐)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    use_db(args.db)
+    started = time.perf_counter()
+    counts = generate(args.boards, args.posts, args.replies, args.likes, args.authors, args.days,
+                      args.skew, args.deleted, not args.no_html, args.seed)
+    size_mb = os.path.getsize(args.db) / 1024 / 1024
+    print(", ".join(f"{k} {v}" for k, v in counts.items())
+          + f" — {time.perf_counter() - started:.1f}s, {size_mb:.1f}MB ({args.db})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,407 @@
+"""엔드포인트 벤치마크. app/main.py의 모든 라우트와 mcp_server.py의 모든 도구를 프로세스 안에서 실행한다.
+
+HTTP는 TestClient(ASGI 직접 호출)로 보내고, MCP 도구는 http 모드 그대로 두되 클라이언트만 같은
+TestClient로 바꿔 끼운다. 경우마다 지연 p50/p99(ms)와 요청당 SQL 실행 수를 잰다.
+쓰기 경우가 있으므로 원본 DB가 아닌 임시 복사본에서 실행한다.
+
+    python -m bench.datagen /tmp/bench.db                    # 데이터 준비 (한 번)
+    python -m bench.run /tmp/bench.db                        # 측정 + bench/baseline.json과 비교
+    python -m bench.run /tmp/bench.db --save bench/baseline.json   # 기준값 갱신
+
+비교 시 SQL 수가 늘었거나 p50이 --tolerance 이상 느려진 경우를 회귀로 표시하고 종료 코드 1을 낸다.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from bench import use_db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+WARMUP = 3
+SAMPLE_POSTS = 200
+MIN_DELTA_MS = 1.0  # 이보다 작은 p50 차이는 잡음으로 본다
+
+# 측정하지 않는 라우트와 이유
+SKIPPED_ROUTES = {
+    "GET /api/events": "SSE 스트림 (연결이 끝나지 않음)",
+    "GET /metrics": "METRICS=1일 때만 켜지는 지표 노출 (꺼져 있으면 404)",
+    "POST /api/admin/backup": "DB 전체를 백업 폴더에 복사한다 (python -m app.backup run으로 따로 잰다)",
+}
+
+_queries = 0
+
+
+def _count_query(*_args):
+    global _queries
+    _queries += 1
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+# ── Cases ────────────────────────────────────────────
+
+class Bench:
+    """측정 경우 목록. case(name, *routes)로 등록한 함수는 반복 번호 i를 받아 요청을 보낸다.
+
+    routes("GET /api/boards" 형태)는 그 경우가 대표하는 라우트로, 빠진 라우트를 찾는 데 쓴다.
+    setup(i)는 반복마다 측정 밖에서 먼저 실행된다 (지울 글 만들기 등).
+    """
+
+    def __init__(self, client, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.cases: list[tuple[str, Callable, Callable | None]] = []
+        self.routes: set[str] = set()
+        self.tools: set[str] = set()
+
+    def case(self, name: str, *routes: str, setup: Callable | None = None):
+        def decorator(fn):
+            self.cases.append((name, fn, setup))
+            self.routes.update(routes)
+            return fn
+        return decorator
+
+    def tool(self, name: str, setup: Callable | None = None):
+        self.tools.add(name)
+        return self.case(f"mcp.{name}", setup=setup)
+
+    def get(self, path: str, **kwargs):
+        r = self.client.get(path, **kwargs)
+        if r.status_code not in (200, 304):
+            raise RuntimeError(f"GET {path} → {r.status_code}: {r.text[:200]}")
+        return r
+
+    def send(self, method: str, path: str, **kwargs):
+        r = self.client.request(method, path, follow_redirects=False, **kwargs)
+        if r.status_code not in (200, 303):
+            raise RuntimeError(f"{method} {path} → {r.status_code}: {r.text[:200]}")
+        return r
+
+
+def _sample(db_path: str, rng: random.Random) -> dict:
+    """측정에 쓸 글 ID, 게시판 slug, 검색어를 DB에서 고른다."""
+    conn = sqlite3.connect(db_path)
+    try:
+        posts = [row[0] for row in conn.execute(
+            "SELECT id FROM posts WHERE parent_id IS NULL AND is_deleted = 0 ORDER BY random() LIMIT ?", (SAMPLE_POSTS,))]
+        hot = conn.execute("SELECT id FROM posts WHERE parent_id IS NULL AND is_deleted = 0 "
+                           "ORDER BY reply_count + like_count DESC LIMIT 1").fetchone()[0]
+        boards = [row[0] for row in conn.execute(
+            "SELECT slug FROM boards WHERE is_active = 1 ORDER BY post_count DESC")]
+    finally:
+        conn.close()
+    rng.shuffle(posts)
+    return {
+        "posts": posts, "hot": hot, "boards": boards,
+        "terms": ["배포 파이프라인", "SQLite", "캐시 무효화", "p99가", "없는검색어입니다", "회고"],
+    }
+
+
+def build(bench: Bench, data: dict, mcp_server=None):
+    posts, boards, terms = data["posts"], data["boards"], data["terms"]
+
+    def post(i: int) -> int:
+        return posts[i % len(posts)]
+
+    def board(i: int) -> str:
+        return boards[min(int(bench.rng.paretovariate(1.2)) - 1, len(boards) - 1)]
+
+    # 읽기 API
+    bench.case("api.boards", "GET /api/boards")(lambda i: bench.get("/api/boards"))
+    bench.case("api.posts.first_page", "GET /api/posts")(
+        lambda i: bench.get("/api/posts", params={"board_slug": board(i)}))
+    bench.case("api.posts.offset_page5")(
+        lambda i: bench.get("/api/posts", params={"board_slug": boards[0], "offset": 80}))
+
+    cursors = {}
+
+    @bench.case("api.posts.cursor_page2")
+    def _(i):
+        slug = board(i)
+        if slug not in cursors:
+            cursors[slug] = bench.get("/api/posts", params={"board_slug": slug}).headers.get("X-Next-Cursor")
+        return bench.get("/api/posts", params={"board_slug": slug, "cursor": cursors[slug]} if cursors[slug]
+                         else {"board_slug": slug})
+
+    bench.case("api.posts.recent")(lambda i: bench.get("/api/posts", params={"limit": 20}))
+    bench.case("api.posts.archived")(
+        lambda i: bench.get("/api/posts", params={"board_slug": board(i), "archived": "true"}))
+    bench.case("api.post", "GET /api/posts/{post_id}")(lambda i: bench.get(f"/api/posts/{post(i)}"))
+    bench.case("api.post.hot_thread")(lambda i: bench.get(f"/api/posts/{data['hot']}"))
+
+    etags = {}
+
+    @bench.case("api.post.not_modified")
+    def _(i):
+        pid = post(i % WARMUP)  # 워밍업에서 ETag를 받아 둔 글만 쓴다
+        if pid not in etags:
+            etags[pid] = bench.get(f"/api/posts/{pid}").headers["ETag"]
+        return bench.get(f"/api/posts/{pid}", headers={"If-None-Match": etags[pid]})
+
+    bench.case("api.likes", "GET /api/posts/{post_id}/likes")(lambda i: bench.get(f"/api/posts/{post(i)}/likes"))
+    bench.case("api.search", "GET /api/search")(lambda i: bench.get("/api/search", params={"q": terms[i % len(terms)]}))
+    bench.case("api.search.board")(
+        lambda i: bench.get("/api/search", params={"q": terms[i % len(terms)], "board_slug": boards[0]}))
+    bench.case("api.recent", "GET /api/recent")(lambda i: bench.get("/api/recent", params={"limit": 20}))
+    bench.case("api.last_activity", "GET /api/last-activity")(lambda i: bench.get("/api/last-activity"))
+    bench.case("api.admin.write_queue", "GET /api/admin/write-queue")(
+        lambda i: bench.get("/api/admin/write-queue"))
+    bench.case("api.admin.slow_queries", "GET /api/admin/slow-queries")(
+        lambda i: bench.get("/api/admin/slow-queries"))
+    bench.case("api.admin.retention", "GET /api/admin/retention")(lambda i: bench.get("/api/admin/retention"))
+    bench.case("api.admin.backup", "GET /api/admin/backup")(lambda i: bench.get("/api/admin/backup"))
+    bench.case("api.export.board", "GET /api/export")(
+        lambda i: bench.get("/api/export", params={"board_slug": boards[-1]}))
+
+    # HTML
+    bench.case("html.index", "GET /")(lambda i: bench.get("/"))
+    bench.case("html.board", "GET /board/{slug}")(lambda i: bench.get(f"/board/{board(i)}"))
+    bench.case("html.board.page3")(lambda i: bench.get(f"/board/{boards[0]}", params={"page": 3}))
+    bench.case("html.post", "GET /post/{post_id}")(lambda i: bench.get(f"/post/{post(i)}"))
+    bench.case("html.new_post", "GET /new/{slug}")(lambda i: bench.get(f"/new/{board(i)}"))
+
+    # 쓰기 API (임시 복사본에 쌓인다)
+    bench.case("api.create_post", "POST /api/posts")(lambda i: bench.send("POST", "/api/posts", json={
+        "board_slug": board(i), "title": f"벤치 글 {i}", "content": f"벤치마크 본문 **{i}**", "author": "bench"}))
+    bench.case("api.reply", "POST /api/posts/{post_id}/reply")(
+        lambda i: bench.send("POST", f"/api/posts/{post(i)}/reply", json={"content": f"벤치 댓글 {i}", "author": "bench"}))
+    bench.case("api.like", "POST /api/posts/{post_id}/like")(
+        lambda i: bench.send("POST", f"/api/posts/{post(i // 2)}/like", json={"author": "bench-like"}))
+    bench.case("api.update_post", "PUT /api/posts/{post_id}")(
+        lambda i: bench.send("PUT", f"/api/posts/{post(i)}", json={"content": f"수정된 본문 {i}"}))
+
+    @bench.case("api.delete_restore", "DELETE /api/posts/{post_id}", "POST /api/posts/{post_id}/restore")
+    def _(i):
+        bench.send("DELETE", f"/api/posts/{post(i)}")
+        return bench.send("POST", f"/api/posts/{post(i)}/restore")
+
+    bench.case("api.create_board", "POST /api/boards")(lambda i: bench.send("POST", "/api/boards", json={
+        "name": f"벤치 {i}", "slug": f"bench-new-{i}-{bench.rng.randrange(10 ** 9)}", "category": "global"}))
+    bench.case("api.batch", "POST /api/batch")(lambda i: bench.send("POST", "/api/batch", json={"operations": [
+        {"op": "create_post", "board_slug": board(i), "title": f"배치 {i}", "content": "배치 본문", "author": "bench"},
+        {"op": "create_reply", "post_id": post(i), "content": "배치 댓글", "author": "bench"},
+        {"op": "toggle_like", "post_id": post(i), "author": "bench-batch"},
+    ]}))
+    bench.case("form.like", "POST /action/like/{post_id}")(
+        lambda i: bench.send("POST", f"/action/like/{post(i // 2)}", data={"author": "bench-form"}))
+    bench.case("form.post", "POST /action/post")(lambda i: bench.send("POST", "/action/post", data={
+        "board_slug": board(i), "title": f"폼 글 {i}", "content": "폼 본문", "author": "bench"}))
+    bench.case("form.reply", "POST /action/reply/{post_id}")(
+        lambda i: bench.send("POST", f"/action/reply/{post(i)}", data={"content": "폼 댓글", "author": "bench"}))
+
+    if mcp_server is None:
+        return
+    m = mcp_server
+    bench.tool("list_boards")(lambda i: m.list_boards())
+    bench.tool("list_posts")(lambda i: m.list_posts(board(i)))
+    bench.tool("read_post")(lambda i: m.read_post(post(i)))
+    bench.tool("search_posts")(lambda i: m.search_posts(terms[i % len(terms)]))
+    bench.tool("get_recent_posts")(lambda i: m.get_recent_posts(20))
+    bench.tool("get_last_activity")(lambda i: m.get_last_activity())
+    bench.tool("get_client_stats")(lambda i: m.get_client_stats())
+    bench.tool("create_post")(lambda i: m.create_post(board(i), f"MCP 글 {i}", "MCP 본문", "bench-mcp"))
+    bench.tool("reply_to_post")(lambda i: m.reply_to_post(post(i), f"MCP 댓글 {i}", "bench-mcp"))
+    bench.tool("like_post")(lambda i: m.like_post(post(i // 2), "bench-mcp"))
+    bench.tool("batch")(lambda i: m.batch([
+        {"op": "create_reply", "post_id": post(i), "content": "MCP 배치", "author": "bench-mcp"},
+        {"op": "toggle_like", "post_id": post(i), "author": "bench-mcp-batch"},
+    ]))
+    bench.tool("create_board")(lambda i: m.create_board(f"MCP {i}", f"mcp-{i}-{bench.rng.randrange(10 ** 9)}"))
+
+    victims = {}
+
+    def make_victim(i):
+        victims[i] = bench.send("POST", "/api/posts", json={
+            "board_slug": boards[-1], "title": "삭제용", "content": "x", "author": "bench-mcp"}).json()["id"]
+
+    bench.tool("delete_post", setup=make_victim)(lambda i: m.delete_post(victims.pop(i)))
+
+
+# ── Runner ───────────────────────────────────────────
+
+def _measure(fn: Callable[[int], object], setup: Callable | None, iterations: int) -> dict:
+    global _queries
+    for i in range(WARMUP):
+        if setup:
+            setup(i)
+        fn(i)
+    timings, queries = [], []
+    for i in range(WARMUP, WARMUP + iterations):
+        if setup:
+            setup(i)
+        _queries = 0
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+        queries.append(_queries)
+    timings.sort()
+    return {
+        "n": iterations,
+        "p50_ms": round(_percentile(timings, 50), 3),
+        "p99_ms": round(_percentile(timings, 99), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "queries": round(sum(queries) / len(queries), 2),
+        "max_queries": max(queries),
+    }
+
+
+def _uncovered(bench: Bench, app, mcp_server) -> list[str]:
+    from fastapi.routing import APIRoute
+
+    missing = []
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            for method in route.methods - {"HEAD"}:
+                key = f"{method} {route.path}"
+                if key not in bench.routes and key not in SKIPPED_ROUTES:
+                    missing.append(key)
+    if mcp_server is not None:
+        tools = {tool.name for tool in asyncio.run(mcp_server.mcp.list_tools())}
+        missing += [f"mcp:{name}" for name in sorted(tools - bench.tools)]
+    return missing
+
+
+def run(db_path: str, iterations: int, seed: int, only: str | None) -> dict:
+    """db_path의 임시 복사본으로 모든 경우를 측정해 결과 dict를 반환한다."""
+    workdir = tempfile.mkdtemp(prefix="board-bench-")
+    copy = os.path.join(workdir, "bench.db")
+    src, dst = sqlite3.connect(db_path), sqlite3.connect(copy)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+    use_db(copy)
+    os.chdir(ROOT)  # app.main이 app/static, app/templates를 상대 경로로 찾는다
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app import database
+    from app.main import app
+
+    for engine in database.ALL_ENGINES:
+        event.listen(engine, "before_cursor_execute", _count_query)
+    try:
+        import mcp_server
+    except ImportError:  # mcp 패키지가 없으면 MCP 도구는 건너뛴다 (mcp_requirements.txt)
+        mcp_server = None
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # FastMCP가 켜 둔 요청별 INFO 로그
+
+    rng = random.Random(seed)
+    results: dict[str, dict] = {}
+    try:
+        with TestClient(app, base_url="http://bench") as client:
+            bench = Bench(client, rng)
+            if mcp_server is not None:
+                mcp_server.MODE = "http"
+                mcp_server._client = client
+            build(bench, _sample(copy, rng), mcp_server)
+            for name, fn, setup in bench.cases:
+                if only and not any(name.startswith(prefix) for prefix in only.split(",")):
+                    continue
+                results[name] = _measure(fn, setup, iterations)
+                print(f"  {name:<28} p50 {results[name]['p50_ms']:>8.2f}ms  p99 {results[name]['p99_ms']:>8.2f}ms  "
+                      f"queries {results[name]['queries']:>6.2f}", flush=True)
+            uncovered = _uncovered(bench, app, mcp_server)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        dataset = {table: conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                   for table in ("boards", "posts", "likes", "authors")}
+    finally:
+        conn.close()
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "iterations": iterations,
+            "dataset": dataset,
+            "mcp": mcp_server is not None,
+            "uncovered": uncovered,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """기준값 대비 표를 출력하고 회귀한 경우 이름 목록을 반환한다."""
+    regressions = []
+    print(f"\n{'case':<32}{'p50 ms':>18}{'p99 ms':>20}{'queries':>16}")
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<32}{cur['p50_ms']:>18.2f}{cur['p99_ms']:>20.2f}{cur['queries']:>16.2f}  (new)")
+            continue
+        # p99는 반복 수가 적으면 최댓값에 가까워 흔들리므로 회귀 판정은 p50으로 한다
+        slower = cur["p50_ms"] > base["p50_ms"] * (1 + tolerance) and cur["p50_ms"] - base["p50_ms"] > MIN_DELTA_MS
+        more_queries = cur["queries"] > base["queries"] + 0.01
+        flag = ""
+        if slower or more_queries:
+            regressions.append(name)
+            flag = "  ← " + ", ".join(reason for reason, hit in (("slower", slower), ("queries", more_queries)) if hit)
+        print(f"{name:<32}{base['p50_ms']:>8.2f} → {cur['p50_ms']:<7.2f}{base['p99_ms']:>9.2f} → {cur['p99_ms']:<8.2f}"
+              f"{base['queries']:>6.2f} → {cur['queries']:<6.2f}{flag}")
+    if baseline["meta"].get("dataset") != current["meta"]["dataset"]:
+        print(f"\n주의: 데이터셋이 다름 (기준 {baseline['meta'].get('dataset')}, 현재 {current['meta']['dataset']})")
+    return regressions
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m bench.run", description="엔드포인트/MCP 도구 벤치마크")
+    parser.add_argument("db", help="bench.datagen으로 만든 SQLite 파일 (없으면 기본 규모로 생성)")
+    parser.add_argument("-n", "--iterations", type=int, default=50, help="경우당 측정 횟수")
+    parser.add_argument("--only", help="이름 접두어로 경우 거르기 (쉼표 구분, 예: api.post,mcp.)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="PATH", help="결과를 JSON으로 저장 (기준값 갱신)")
+    parser.add_argument("--baseline", default=BASELINE, help="비교할 기준값 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="p50 회귀로 볼 증가 비율")
+    args = parser.parse_args(argv)
+
+    db_path = os.path.abspath(args.db)
+    if not os.path.exists(db_path):
+        from bench import datagen
+        print(f"{db_path} 없음 — 기본 규모로 생성")
+        datagen.main([db_path])
+    current = run(db_path, args.iterations, args.seed, args.only)
+    if current["meta"]["uncovered"]:
+        print("측정하지 않은 라우트/도구:", ", ".join(current["meta"]["uncovered"]))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"저장: {args.save}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"기준값 없음: {args.baseline} (--save로 만든다)")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.tolerance)
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\n회귀 없음")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,30 @@
+"""gunicorn 설정: uvicorn 워커 여러 개 + preload.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+preload_app이면 마스터가 app.main을 한 번 import하고(템플릿, 마크다운 렌더러, 모델 등) on_starting에서
+스키마·시드 준비(app.startup.prepare)까지 마친 뒤 워커를 fork한다. 워커는 import 없이 시작해 lifespan에서
+지문 한 번만 읽고 요청을 받는다. 보존 정리·백업 스레드는 워커 하나만 띄운다 (app.startup.lead_jobs).
+
+SQLite 쓰기는 워커가 늘어도 한 번에 하나이므로 워커 수는 읽기 부하에 맞춘다. 활동 번호(ETag)와 이벤트 피드는
+DB에 있어(app.activity, app.events) 어느 워커에 붙어도 같은 ETag와 같은 이벤트 id를 받고, 다른 워커의 쓰기도
+EXTERNAL_POLL_INTERVAL(1초) 안에 롱폴링·SSE로 전달된다.
+
+환경 변수: WEB_CONCURRENCY(워커 수, 기본 CPU 수), BIND(기본 0.0.0.0:8585), PRELOAD(기본 1, 0이면 워커마다 import)
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8585")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("PRELOAD", "1") == "1"
+graceful_timeout = 30
+
+
+def on_starting(_server):
+    # 워커를 띄우기 전 마스터에서 한 번. 연 DB 연결은 닫고 끝나므로 fork로 넘어가지 않는다
+    from app import startup
+
+    startup.prepare()
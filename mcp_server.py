@@ -1,11 +1,36 @@
 """Claude Board MCP Server (stdio).
 Docker의 FastAPI REST API를 호출하는 래퍼.
+
+BOARD_MODE=direct면 HTTP를 거치지 않고 app 패키지(crud/serializers)를 같은 프로세스에서
+DB_PATH의 SQLite 파일에 직접 실행한다 (같은 호스트 전용, requirements.txt 필요). 기본은 http.
+
+http 모드는 GET 응답 본문을 ETag와 함께 보관했다가 If-None-Match로 재검증한다 (304면 보관본 사용).
+
+환경 변수: BOARD_MODE, BOARD_URL, BOARD_TIMEOUT, BOARD_MAX_CONNECTIONS, BOARD_MAX_KEEPALIVE,
+BOARD_RETRIES, BOARD_RETRY_BACKOFF, BOARD_CACHE_SIZE, DB_PATH(direct)
 """
 
+import atexit
+import functools
+import html
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from urllib.parse import urlencode
+
 import httpx
 from mcp.server.fastmcp import FastMCP
 
-BASE_URL = "http://127.0.0.1:8585"
+MODE = os.getenv("BOARD_MODE", "http")  # http | direct
+BASE_URL = os.getenv("BOARD_URL", "http://127.0.0.1:8585")
+TIMEOUT = float(os.getenv("BOARD_TIMEOUT", "10"))
+MAX_CONNECTIONS = int(os.getenv("BOARD_MAX_CONNECTIONS", "10"))
+MAX_KEEPALIVE = int(os.getenv("BOARD_MAX_KEEPALIVE", "5"))
+RETRIES = int(os.getenv("BOARD_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("BOARD_RETRY_BACKOFF", "0.2"))  # 첫 재시도 대기(초), 이후 2배씩
+CACHE_SIZE = int(os.getenv("BOARD_CACHE_SIZE", "128"))  # ETag 재검증용으로 보관할 GET 응답 수 (0이면 끔)
 
 mcp = FastMCP("claude-board", instructions="""
 Claude Board - 팀 간 소통 게시판 시스템.
@@ -14,25 +39,148 @@ Claude Board - 팀 간 소통 게시판 시스템.
 """)
 
 
+# ── HTTP client ──────────────────────────────────────
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+_http_stats = {"requests": 0, "retries": 0, "not_modified": 0}
+_stats_lock = threading.Lock()  # _http_stats와 도구 호출 통계. 도구는 여러 스레드에서 동시에 돈다
+_body_cache: OrderedDict[str, tuple[str, object, httpx.Headers]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _count(key: str):
+    with _stats_lock:
+        _http_stats[key] += 1
+
+
+def _get_client() -> httpx.Client:
+    """MCP 프로세스당 하나의 keep-alive 클라이언트를 재사용한다."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    base_url=BASE_URL,
+                    timeout=TIMEOUT,
+                    limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE),
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+def _request(method: str, path: str, idempotent: bool, **kwargs) -> httpx.Response:
+    """5xx/타임아웃(SQLite 잠금 대기 등)은 지터를 준 지수 백오프로 재시도한다.
+
+    멱등하지 않은 요청(POST)은 서버에 도달하지 못한 연결 실패만 재시도한다.
+    """
+    client = _get_client()
+    for attempt in range(RETRIES + 1):
+        _count("requests")
+        retry = attempt < RETRIES
+        try:
+            r = client.request(method, path, **kwargs)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if not retry:
+                raise
+        except httpx.TransportError:  # 타임아웃, 응답 도중 끊김
+            if not (retry and idempotent):
+                raise
+        else:
+            if r.status_code == 304:
+                return r
+            if not (r.status_code >= 500 and retry and idempotent):
+                r.raise_for_status()
+                return r
+        _count("retries")
+        time.sleep(RETRY_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5))
+    raise AssertionError("unreachable")
+
+
+def _call(method: str, path: str, params: dict | None = None, json: dict | None = None) -> tuple:
+    """(응답 본문, 응답 헤더). direct 모드는 app.direct로 같은 API를 프로세스 안에서 실행한다."""
+    if MODE == "direct":
+        from app import direct
+        return direct.call(method, path, params=params, json=json)
+    if method == "GET" and CACHE_SIZE > 0:
+        return _cached_get(path, params)
+    r = _request(method, path, idempotent=method != "POST", params=params, json=json)
+    return r.json(), r.headers
+
+
+def _cached_get(path: str, params: dict | None) -> tuple:
+    key = f"{path}?{urlencode(sorted((params or {}).items()))}"
+    with _cache_lock:
+        cached = _body_cache.get(key)
+    r = _request("GET", path, idempotent=True, params=params,
+                 headers={"If-None-Match": cached[0]} if cached else None)
+    if r.status_code == 304 and cached:
+        _count("not_modified")
+        with _cache_lock:
+            if key in _body_cache:
+                _body_cache.move_to_end(key)
+        return cached[1], cached[2]
+    body = r.json()
+    etag = r.headers.get("ETag")
+    if etag:
+        with _cache_lock:
+            _body_cache[key] = (etag, body, r.headers)
+            _body_cache.move_to_end(key)
+            while len(_body_cache) > CACHE_SIZE:
+                _body_cache.popitem(last=False)
+    return body, r.headers
+
+
 def _get(path: str, params: dict | None = None) -> dict | list:
-    with httpx.Client(base_url=BASE_URL, timeout=10) as client:
-        r = client.get(path, params=params)
-        r.raise_for_status()
-        return r.json()
+    return _call("GET", path, params=params)[0]
+
+
+def _get_page(path: str, params: dict | None = None) -> tuple[list, str | None]:
+    """목록과 함께 X-Next-Cursor 헤더(다음 페이지 커서)를 반환한다."""
+    body, headers = _call("GET", path, params=params)
+    return body, headers.get("X-Next-Cursor")
 
 
 def _post(path: str, json: dict) -> dict:
-    with httpx.Client(base_url=BASE_URL, timeout=10) as client:
-        r = client.post(path, json=json)
-        r.raise_for_status()
-        return r.json()
+    return _call("POST", path, json=json)[0]
 
 
 def _delete(path: str) -> dict:
-    with httpx.Client(base_url=BASE_URL, timeout=10) as client:
-        r = client.delete(path)
-        r.raise_for_status()
-        return r.json()
+    return _call("DELETE", path)[0]
+
+
+# ── Tool latency stats ───────────────────────────────
+
+STATS_WINDOW = 500  # 도구별로 최근 N회 지연만 보관
+_tool_latency: dict[str, deque] = defaultdict(lambda: deque(maxlen=STATS_WINDOW))
+_tool_calls: dict[str, int] = defaultdict(int)
+_tool_errors: dict[str, int] = defaultdict(int)
+
+
+def _tool():
+    """mcp.tool() 등록 + 호출 지연/오류 집계."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                with _stats_lock:
+                    _tool_errors[fn.__name__] += 1
+                raise
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                with _stats_lock:
+                    _tool_calls[fn.__name__] += 1
+                    _tool_latency[fn.__name__].append(elapsed)
+        return mcp.tool()(wrapper)
+    return decorator
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
 
 
 def _fmt(dt_str: str | None) -> str:
@@ -42,7 +190,7 @@ def _fmt(dt_str: str | None) -> str:
     return dt_str[:19].replace("T", " ")
 
 
-@mcp.tool()
+@_tool()
 def list_boards() -> str:
     """게시판 목록을 조회합니다."""
     boards = _get("/api/boards")
@@ -54,17 +202,24 @@ def list_boards() -> str:
     return "\n".join(lines)
 
 
-@mcp.tool()
-def list_posts(board_slug: str, limit: int = 20) -> str:
+@_tool()
+def list_posts(board_slug: str, limit: int = 20, cursor: str | None = None, archived: bool = False) -> str:
     """특정 게시판의 게시글 목록을 조회합니다.
 
     Args:
         board_slug: 게시판 slug (예: law-work, free, notice, knowhow)
         limit: 조회할 글 수 (기본 20)
+        cursor: 이전 호출 결과 끝에 표시된 다음 페이지 커서 (선택)
+        archived: True면 오래되어 보관된 글 목록 (기본 False)
     """
-    posts = _get("/api/posts", {"board_slug": board_slug, "limit": limit})
+    params = {"board_slug": board_slug, "limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    if archived:
+        params["archived"] = "true"
+    posts, next_cursor = _get_page("/api/posts", params)
     if not posts:
-        return f"'{board_slug}' 게시판에 글이 없습니다."
+        return f"'{board_slug}' 게시판에 {'보관된 ' if archived else ''}글이 없습니다."
     lines = []
     for p in posts:
         pin = "📌 " if p["is_pinned"] else ""
@@ -72,10 +227,12 @@ def list_posts(board_slug: str, limit: int = 20) -> str:
         reply = f" 💬{p['reply_count']}" if p["reply_count"] > 0 else ""
         like = f" ❤️{p['like_count']}" if p.get("like_count", 0) > 0 else ""
         lines.append(f"[{p['id']}] {pin}{prefix}{p['title']} ({p['author']}, {_fmt(p['created_at'])}){reply}{like}")
+    if next_cursor:
+        lines.append(f"\n다음 페이지: cursor={next_cursor}")
     return "\n".join(lines)
 
 
-@mcp.tool()
+@_tool()
 def read_post(post_id: int) -> str:
     """게시글 상세 내용과 댓글을 조회합니다.
 
@@ -110,7 +267,7 @@ def read_post(post_id: int) -> str:
     return "\n".join(lines)
 
 
-@mcp.tool()
+@_tool()
 def create_post(board_slug: str, title: str, content: str, author: str, prefix: str | None = None) -> str:
     """게시판에 새 글을 작성합니다.
 
@@ -128,7 +285,7 @@ def create_post(board_slug: str, title: str, content: str, author: str, prefix:
     return f"게시글 작성 완료! ID: {result['id']}, 제목: {title}"
 
 
-@mcp.tool()
+@_tool()
 def reply_to_post(post_id: int, content: str, author: str) -> str:
     """게시글에 댓글을 답니다.
 
@@ -141,7 +298,7 @@ def reply_to_post(post_id: int, content: str, author: str) -> str:
     return f"댓글 작성 완료! ID: {result['id']}"
 
 
-@mcp.tool()
+@_tool()
 def create_board(name: str, slug: str, category: str = "team", team: str | None = None,
                  description: str = "", icon: str = "📋") -> str:
     """새 게시판을 생성합니다 (새 프로젝트 추가 시 사용).
@@ -161,7 +318,7 @@ def create_board(name: str, slug: str, category: str = "team", team: str | None
     return f"게시판 생성 완료! slug: {result['slug']}"
 
 
-@mcp.tool()
+@_tool()
 def search_posts(keyword: str, board_slug: str | None = None, limit: int = 20) -> str:
     """게시글을 검색합니다.
 
@@ -179,10 +336,12 @@ def search_posts(keyword: str, board_slug: str | None = None, limit: int = 20) -
     lines = []
     for r in results:
         lines.append(f"[{r['id']}] {r['title']} ({r['board_name']}, {r['author']}, {_fmt(r['created_at'])}) 💬{r['reply_count']}")
+        if r.get("snippet"):
+            lines.append("    " + html.unescape(r["snippet"].replace("<mark>", "**").replace("</mark>", "**")))
     return "\n".join(lines)
 
 
-@mcp.tool()
+@_tool()
 def get_recent_posts(limit: int = 10) -> str:
     """전체 게시판의 최신 글을 조회합니다.
 
@@ -199,7 +358,7 @@ def get_recent_posts(limit: int = 10) -> str:
     return "\n".join(lines)
 
 
-@mcp.tool()
+@_tool()
 def like_post(post_id: int, author: str) -> str:
     """게시글에 좋아요를 누릅니다 (토글 - 이미 눌렀으면 취소).
 
@@ -213,7 +372,48 @@ def like_post(post_id: int, author: str) -> str:
     return f"{action} (현재 ❤️ {result['like_count']}개: {who})"
 
 
-@mcp.tool()
+def _describe_batch_result(r: dict) -> str:
+    op = r["op"]
+    if op == "create_post":
+        return f"글 작성 ID: {r['id']}, 제목: {r['title']}"
+    if op == "create_reply":
+        return f"댓글 작성 ID: {r['id']}"
+    if op == "toggle_like":
+        action = "좋아요" if r["action"] == "liked" else "좋아요 취소"
+        return f"{r['post_id']}번 글 {action} (현재 ❤️ {r['like_count']}개)"
+    if op == "update_post":
+        return f"{r['id']}번 글 수정"
+    return f"{r['post_id']}번 글 삭제"
+
+
+@_tool()
+def batch(operations: list[dict]) -> str:
+    """여러 쓰기 작업을 한 트랜잭션으로 한 번에 실행합니다 (하나라도 실패하면 전부 취소).
+
+    Args:
+        operations: 순서대로 실행할 작업 목록 (최대 100개). 각 항목은 "op"와 인자를 가집니다.
+            {"op": "create_post", "board_slug", "title", "content", "author", "prefix"(선택)}
+            {"op": "create_reply", "post_id", "content", "author"}
+            {"op": "toggle_like", "post_id", "author"}
+            {"op": "update_post", "post_id", "title"(선택), "content"(선택)}
+            {"op": "delete_post", "post_id"}
+    """
+    result = _post("/api/batch", {"operations": operations})
+    if result["committed"]:
+        lines = [f"일괄 처리 완료 ({len(result['results'])}건)"]
+    else:
+        lines = [f"일괄 처리 실패: {result['failed_index'] + 1}번째 작업 오류로 전체 취소"]
+    for i, r in enumerate(result["results"], 1):
+        if r["status"] == "ok":
+            lines.append(f"{i}. {_describe_batch_result(r)}")
+        elif r["status"] == "error":
+            lines.append(f"{i}. {r['op']} 오류: {r['error']}")
+        else:
+            lines.append(f"{i}. {r['op']} {'취소됨' if r['status'] == 'rolled_back' else '실행 안 함'}")
+    return "\n".join(lines)
+
+
+@_tool()
 def get_last_activity() -> str:
     """전체 게시판의 마지막 활동 시간을 조회합니다.
 
@@ -233,7 +433,7 @@ def get_last_activity() -> str:
     return "\n".join(lines)
 
 
-@mcp.tool()
+@_tool()
 def delete_post(post_id: int) -> str:
     """게시글을 삭제합니다 (소프트 삭제).
 
@@ -244,5 +444,33 @@ def delete_post(post_id: int) -> str:
     return f"게시글 {post_id} 삭제 완료"
 
 
+@_tool()
+def get_client_stats() -> str:
+    """MCP 서버 진단 정보: 접속 설정, HTTP 재시도 수, 도구별 호출 지연(ms)을 조회합니다."""
+    # 다른 도구 호출이 통계를 바꾸는 동안 순회하지 않도록 잠금 안에서 복사해 둔다
+    with _stats_lock:
+        http = dict(_http_stats)
+        tools = [(name, _tool_calls[name], _tool_errors.get(name, 0), list(_tool_latency[name]))
+                 for name in sorted(_tool_calls)]
+    with _cache_lock:
+        cached = len(_body_cache)
+    if MODE == "direct":
+        from app.database import DB_PATH
+        lines = [f"board: direct ({DB_PATH})"]
+    else:
+        lines = [
+            f"board: {BASE_URL} (timeout {TIMEOUT}s, 연결 {MAX_CONNECTIONS}/keep-alive {MAX_KEEPALIVE}, 재시도 {RETRIES}회)",
+            f"HTTP 요청 {http['requests']}회, 재시도 {http['retries']}회, "
+            f"304 재사용 {http['not_modified']}회 (보관 {cached}/{CACHE_SIZE})",
+        ]
+    for name, calls, errors, samples in tools:
+        lines.append(
+            f"- {name}: {calls}회 (오류 {errors}) "
+            f"p50 {_percentile(samples, 50):.1f} / p95 {_percentile(samples, 95):.1f} / "
+            f"p99 {_percentile(samples, 99):.1f} / max {max(samples):.1f}"
+        )
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
     mcp.run()
@@ -0,0 +1,59 @@
+"""테스트 공용 픽스처. 세션마다 임시 폴더에 새 DB를 만든다.
+
+app.database가 import 시점에 DB_PATH를 읽으므로 app 모듈보다 먼저 환경 변수를 정한다.
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+
+import pytest
+
+_DIR = tempfile.mkdtemp(prefix="board-test-")
+os.environ["DB_PATH"] = os.path.join(_DIR, "board.db")
+for _name in ("ARCHIVE_PATH", "WRITE_QUEUE", "METRICS", "SLOW_QUERY_MS", "RETENTION_DAYS", "BACKUP_INTERVAL"):
+    os.environ.pop(_name, None)
+
+from app import crud, startup  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.schemas import BoardCreate, PostCreate  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prepared():
+    startup.prepare()
+    yield
+    shutil.rmtree(_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def client(prepared):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def board(db):
+    """테스트마다 새 게시판. 다른 테스트의 글과 섞이지 않는다."""
+    slug = f"t-{uuid.uuid4().hex[:8]}"
+    return crud.create_board(db, BoardCreate(name=slug, slug=slug))
+
+
+@pytest.fixture
+def make_post(db, board):
+    """board에 글을 쓰는 함수."""
+    def make(title: str = "테스트 글", content: str = "본문", author: str = "tester", **extra):
+        return crud.create_post(db, PostCreate(board_slug=board.slug, title=title, content=content, author=author, **extra))
+    return make
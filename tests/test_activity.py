@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from sqlalchemy import text
+
+from app import events
+from app.database import ReadSessionLocal
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_WRITE = """
+import sys
+from app import activity, crud
+from app.database import SessionLocal
+from app.schemas import PostCreate
+post = crud.create_post(SessionLocal(), PostCreate(board_slug=sys.argv[1], title="다른 워커", content="본문", author="w"))
+activity.check_external()
+print(post.id, activity.etag())
+"""
+
+
+def _write_elsewhere(board_slug: str) -> tuple[int, str]:
+    """다른 프로세스(다른 워커)에서 글을 쓰고 (글 id, 그 프로세스의 ETag)를 반환한다."""
+    env = {**os.environ, "PYTHONPATH": _ROOT}
+    out = subprocess.run([sys.executable, "-c", _WRITE, board_slug], cwd=_ROOT, env=env,
+                         capture_output=True, text=True, timeout=60, check=True).stdout.split()
+    return int(out[0]), out[1]
+
+
+def _newest_event() -> int:
+    db = ReadSessionLocal()
+    try:
+        return db.execute(text("SELECT coalesce(max(id), 0) FROM events")).scalar()
+    finally:
+        db.close()
+
+
+def test_long_poll_and_events_see_other_process(client, board):
+    tag = client.get("/api/last-activity").headers["etag"]
+    last = _newest_event()
+    result = {}
+    writer = threading.Thread(target=lambda: result.update(written=_write_elsewhere(board.slug)))
+    writer.start()
+    started = time.monotonic()
+    response = client.get("/api/last-activity?wait=30", headers={"If-None-Match": tag})
+    writer.join()
+    post_id, other_tag = result["written"]
+
+    assert response.status_code == 200
+    assert time.monotonic() - started < 10
+    assert response.headers["etag"] == other_tag  # 어느 프로세스든 같은 ETag
+    assert client.get("/api/last-activity", headers={"If-None-Match": other_tag}).status_code == 304
+
+    # SSE가 읽는 피드도 DB에 있다 (앱의 이벤트 루프에서 호출)
+    batch, missed = client.portal.call(events.since, last)
+    assert not missed
+    assert [(e["id"], e["type"], e["data"]["post_id"]) for e in batch] == [(last + 1, "post-created", post_id)]
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, update
+
+from app import archive, crud, render
+from app.models import ArchivedLike, ArchivedPost, Board, Like, Post
+
+
+def _age(db, post_id: int, days: int):
+    db.execute(update(Post).where(Post.id == post_id).values(created_at=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)))
+    db.commit()
+
+
+def test_archive_threads_with_reused_like_id(db, board, make_post):
+    db.execute(update(Board).where(Board.id == board.id).values(archive_after_days=30))
+    db.commit()
+    first, second = make_post(title="먼저 보관").id, make_post(title="나중에 보관").id
+    make_post(title="남는 글")  # 가장 큰 posts.id는 옮기지 않는다
+    crud.toggle_like(db, second, "a")
+    crud.toggle_like(db, first, "b")  # 가장 큰 likes.id
+    reused = db.query(func.max(Like.id)).scalar()
+
+    _age(db, first, 60)
+    assert archive.run(db)[board.slug] == 1
+    assert db.query(ArchivedLike).filter(ArchivedLike.post_id == first).count() == 1
+    crud.toggle_like(db, second, "c")
+    assert db.query(func.max(Like.id)).scalar() == reused  # SQLite가 옮겨 간 ID를 다시 내준다
+
+    _age(db, second, 60)
+    assert archive.run(db)[board.slug] == 1
+    liked = db.query(ArchivedLike).filter(ArchivedLike.post_id == second).order_by(ArchivedLike.id).all()
+    assert [like.author for like in liked] == ["a", "c"]
+    assert db.get(Post, second) is None
+    assert crud.get_post(db, first)["liked_by"] == ["b"]
+
+
+def test_backfill_renders_archived_posts(db, board, make_post):
+    db.execute(update(Board).where(Board.id == board.id).values(archive_after_days=30))
+    db.commit()
+    post_id = make_post(title="보관된 글", content="**굵게**").id
+    make_post(title="남는 글")
+    _age(db, post_id, 60)
+    assert archive.run(db)[board.slug] == 1
+    db.execute(update(ArchivedPost).where(ArchivedPost.id == post_id).values(content_html=None))
+    db.commit()
+
+    assert render.backfill(db) >= 1
+    assert db.query(ArchivedPost.content_html).filter(ArchivedPost.id == post_id).scalar() == "<p><strong>굵게</strong></p>\n"
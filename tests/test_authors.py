@@ -0,0 +1,43 @@
+import uuid
+
+from sqlalchemy import text
+
+from app import authors
+from app.database import SessionLocal
+
+
+def test_interned_author_is_shared_only_after_commit():
+    name = f"new-{uuid.uuid4().hex[:8]}"
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        second.execute(text("SELECT 1"))  # 연결을 먼저 잡아 둔다 (쓰기 잠금 중에는 새 연결의 PRAGMA가 막힌다)
+        pending = authors.intern(first, name)
+        assert authors.id_of(first, name) == pending
+        assert authors.name_of(pending) == name  # 커밋 전 응답 직렬화용
+        assert authors.id_of(second, name) is None
+        first.rollback()
+
+        assert name not in authors._by_name and pending not in authors._pending
+        author_id = authors.intern(second, name)
+        second.commit()
+        assert authors._by_name[name] == author_id
+        assert authors.id_of(first, name) == author_id
+    finally:
+        first.close()
+        second.close()
+
+
+def test_async_routes_load_unknown_authors_through_the_request_session(client, board, monkeypatch):
+    from tests.test_activity import _write_elsewhere
+
+    _write_elsewhere(board.slug)  # 이 프로세스가 모르는 작성자 "w"가 생길 수 있다
+    with authors._lock:
+        authors._by_id.clear()
+        authors._by_name.clear()
+
+    def blocking_reload():
+        raise AssertionError("name_of() read the authors table on the event loop")
+
+    monkeypatch.setattr(authors, "_reload", blocking_reload)
+    posts = client.get(f"/api/posts?board_slug={board.slug}").json()
+    assert [p["author"] for p in posts] == ["w"]
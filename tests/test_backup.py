@@ -0,0 +1,44 @@
+import threading
+import time
+
+from app import backup
+
+
+def _wait_idle():
+    for _ in range(200):
+        if backup.status()["running"] is None:
+            return
+        time.sleep(0.05)
+    raise AssertionError("backup did not finish")
+
+
+def test_back_to_back_runs_get_distinct_names(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup, "BACKUP_DIR", str(tmp_path))
+    first, second = backup.run(), backup.run()
+    assert first["error"] is None and second["error"] is None
+    assert first["name"] != second["name"]
+    assert [b["name"] for b in backup.backups()] == [second["name"], first["name"]]
+    assert backup.backups()[0]["created_at"] is not None
+
+
+def test_concurrent_triggers_start_one_backup(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup, "BACKUP_DIR", str(tmp_path))
+    gate = threading.Event()
+    snapshot = backup._snapshot
+    monkeypatch.setattr(backup, "_snapshot", lambda *args: gate.wait(5) and snapshot(*args))
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(backup.trigger())
+
+    callers = [threading.Thread(target=call) for _ in range(8)]
+    for t in callers:
+        t.start()
+    for t in callers:
+        t.join()
+    gate.set()
+    _wait_idle()
+    assert sorted(results) == [False] * 7 + [True]
+    assert len(backup.backups()) == 1
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import activity, crud
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CREATE_BOARD = """
+import sys
+from app import activity, crud
+from app.database import SessionLocal
+from app.schemas import BoardCreate
+crud.create_board(SessionLocal(), BoardCreate(name=sys.argv[1], slug=sys.argv[1]))
+"""
+
+
+def _create_board_elsewhere(slug: str):
+    env = {**os.environ, "PYTHONPATH": _ROOT}
+    subprocess.run([sys.executable, "-c", _CREATE_BOARD, slug], cwd=_ROOT, env=env, timeout=60, check=True)
+
+
+def _slugs(db) -> list[str]:
+    return [item["board"].slug for item in crud.get_boards(db)]
+
+
+def test_foreign_commit_during_own_commit_clears_cache(db, make_post):
+    post = make_post()
+    _slugs(db)  # 게시판 목록을 캐시에 올린다
+    slug = f"f-{uuid.uuid4().hex[:8]}"
+
+    def foreign(session):
+        # 우리 커밋이 끝난 직후, after_commit 처리가 끝나기 전에 다른 프로세스가 커밋한다
+        if session is db:
+            _create_board_elsewhere(slug)
+
+    event.listen(Session, "after_commit", foreign, insert=True)
+    try:
+        crud.toggle_like(db, post.id, "a")  # 게시판 목록 태그는 건드리지 않는 쓰기
+    finally:
+        event.remove(Session, "after_commit", foreign)
+    activity.check_external()  # 동기 경로는 읽기 전에 직접 확인한다 (비동기 경로는 acrud가 refresh)
+    assert slug in _slugs(db)
+
+
+def test_cached_read_does_no_io(db, monkeypatch):
+    def blocking_read():
+        raise AssertionError("cache.cached() read PRAGMA data_version")
+
+    monkeypatch.setattr(activity, "_read_data_version", blocking_read)
+    crud.get_boards(db)
+    crud.get_boards(db)
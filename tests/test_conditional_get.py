@@ -0,0 +1,27 @@
+from app import crud
+from app.schemas import ReplyCreate
+
+
+def test_post_etag_changes_on_unlike_and_reply_delete(db, client, make_post):
+    post = make_post()
+    reply = crud.create_reply(db, post.id, ReplyCreate(content="댓글", author="a"))
+    crud.toggle_like(db, post.id, "a")
+    first = client.get(f"/api/posts/{post.id}")
+    assert "last-modified" not in first.headers
+    tag = first.headers["etag"]
+    assert client.get(f"/api/posts/{post.id}", headers={"If-None-Match": tag}).status_code == 304
+
+    crud.toggle_like(db, post.id, "a")  # 취소: 좋아요 시각은 앞으로 가지 않는다
+    after_unlike = client.get(f"/api/posts/{post.id}", headers={"If-None-Match": tag})
+    assert after_unlike.status_code == 200
+    assert after_unlike.json()["like_count"] == 0
+
+    tag = after_unlike.headers["etag"]
+    crud.delete_post(db, reply.id)
+    assert client.get(f"/api/posts/{post.id}", headers={"If-None-Match": tag}).status_code == 200
+
+
+def test_if_modified_since_is_ignored(client, make_post):
+    post = make_post()
+    response = client.get(f"/api/posts/{post.id}", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert response.status_code == 200
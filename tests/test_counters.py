@@ -0,0 +1,41 @@
+from app import crud
+from app.models import Board, Post
+from app.reconcile import reconcile
+from app.schemas import ReplyCreate
+
+
+def test_counters_follow_writes(db, board, make_post):
+    older = make_post(title="먼저 쓴 글")
+    post = make_post()
+    replies = [crud.create_reply(db, post.id, ReplyCreate(content=f"댓글 {i}", author="a")) for i in range(3)]
+    crud.toggle_like(db, post.id, "a")
+    crud.toggle_like(db, post.id, "b")
+    crud.toggle_like(db, post.id, "a")  # 취소
+    crud.delete_post(db, replies[-1].id)
+
+    db.expire_all()
+    post = db.get(Post, post.id)
+    assert (post.reply_count, post.like_count) == (2, 1)
+    assert post.last_reply_at == replies[1].created_at
+    assert (db.get(Board, board.id).post_count, db.get(Board, board.id).latest_post_id) == (2, post.id)
+
+    crud.delete_post(db, post.id)
+    db.expire_all()
+    assert (db.get(Board, board.id).post_count, db.get(Board, board.id).latest_post_id) == (1, older.id)
+    crud.restore_post(db, post.id)
+    db.expire_all()
+    assert (db.get(Board, board.id).post_count, db.get(Board, board.id).latest_post_id) == (2, post.id)
+    assert reconcile(db, fix=False) == {"posts": 0, "boards": 0, "fixed": False}
+
+
+def test_reconcile_fixes_drift(db, board, make_post):
+    post = make_post()
+    crud.toggle_like(db, post.id, "a")
+    db.query(Post).filter(Post.id == post.id).update({Post.like_count: 7, Post.reply_count: 3})
+    db.query(Board).filter(Board.id == board.id).update({Board.post_count: 0})
+    db.commit()
+    assert reconcile(db, fix=False) == {"posts": 1, "boards": 1, "fixed": False}
+    reconcile(db)
+    db.expire_all()
+    assert (db.get(Post, post.id).like_count, db.get(Post, post.id).reply_count) == (1, 0)
+    assert db.get(Board, board.id).post_count == 1
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from app import activity, events
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_event_ids_carry_db_epoch():
+    activity.check_external()
+    epoch = activity.current_epoch()
+    assert epoch
+    assert events.format_id(42) == f"{epoch}-42"
+    assert events.parse_id(events.format_id(42)) == 42
+    # 다른 DB의 id, epoch 없는 옛 형식, 깨진 값은 이어받지 않고 reset으로 처리한다
+    for value in ("deadbeef-42", "42", f"{epoch}-", "garbage"):
+        assert events.parse_id(value) is None
+
+
+def test_event_buffer_size_must_be_positive():
+    env = {**os.environ, "PYTHONPATH": _ROOT, "EVENT_BUFFER_SIZE": "0"}
+    result = subprocess.run([sys.executable, "-c", "import app.events"], cwd=_ROOT, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode != 0
+    assert "EVENT_BUFFER_SIZE must be at least 1" in result.stderr
@@ -0,0 +1,83 @@
+from sqlalchemy import create_engine, event, text
+
+from app import migrations
+
+# 마이그레이션 이전(최초 버전) 스키마
+_BASELINE = [
+    """CREATE TABLE boards (
+        id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(100) NOT NULL, slug VARCHAR(100) NOT NULL UNIQUE,
+        category VARCHAR(20) NOT NULL, team VARCHAR(50), description TEXT, icon VARCHAR(10), sort_order INTEGER,
+        is_active BOOLEAN, created_at DATETIME
+    )""",
+    """CREATE TABLE posts (
+        id INTEGER NOT NULL PRIMARY KEY, board_id INTEGER NOT NULL REFERENCES boards (id),
+        parent_id INTEGER REFERENCES posts (id), title VARCHAR(200), content TEXT NOT NULL,
+        author VARCHAR(100) NOT NULL, prefix VARCHAR(50), tag VARCHAR(50), is_pinned BOOLEAN, is_deleted BOOLEAN,
+        created_at DATETIME, updated_at DATETIME
+    )""",
+    "CREATE INDEX ix_posts_board_id ON posts (board_id)",
+    "CREATE INDEX ix_posts_parent_id ON posts (parent_id)",
+    """CREATE TABLE likes (
+        id INTEGER NOT NULL PRIMARY KEY, post_id INTEGER NOT NULL REFERENCES posts (id),
+        author VARCHAR(100) NOT NULL, created_at DATETIME, CONSTRAINT uq_like_post_author UNIQUE (post_id, author)
+    )""",
+    "CREATE INDEX ix_likes_post_id ON likes (post_id)",
+    "INSERT INTO boards VALUES (1, '자유', 'free', 'global', NULL, '', '', 0, 1, '2024-01-01 00:00:00')",
+    "INSERT INTO posts VALUES (1, 1, NULL, '옛 글', '검색될 본문입니다', 'kim', NULL, NULL, 0, 0,"
+    " '2024-01-01 00:00:00', '2024-01-01 00:00:00')",
+    "INSERT INTO posts VALUES (2, 1, 1, NULL, '댓글', 'lee', NULL, NULL, 0, 0, '2024-01-02 00:00:00', '2024-01-02 00:00:00')",
+    "INSERT INTO posts VALUES (3, 1, 1, NULL, '지운 댓글', 'lee', NULL, NULL, 0, 1, '2024-01-03 00:00:00', '2024-01-04 00:00:00')",
+    "INSERT INTO likes VALUES (1, 1, 'lee', '2024-01-02 00:00:00')",
+    "INSERT INTO likes VALUES (2, 1, 'park', '2024-01-03 00:00:00')",
+]
+
+
+def _old_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        for ddl in _BASELINE:
+            conn.execute(text(ddl))
+    return engine
+
+
+def test_migrates_baseline_schema_and_data(tmp_path):
+    engine = _old_engine(tmp_path)
+    assert migrations.run_migrations(engine) == [v for v, _, _ in migrations.MIGRATIONS]
+    with engine.connect() as conn:
+        assert migrations.get_version(conn) == migrations.LATEST_VERSION
+        post = conn.execute(text(
+            "SELECT p.reply_count, p.like_count, p.last_reply_at, a.name FROM posts p"
+            " JOIN authors a ON a.id = p.author_id WHERE p.id = 1"
+        )).one()
+        assert tuple(post) == (1, 2, "2024-01-02 00:00:00", "kim")
+        assert conn.execute(text("SELECT post_count, latest_post_id FROM boards")).one() == (1, 1)
+        assert conn.execute(text(
+            "SELECT a.name FROM likes l JOIN authors a ON a.id = l.author_id ORDER BY l.id"
+        )).scalars().all() == ["lee", "park"]
+        assert conn.execute(text("SELECT rowid FROM posts_fts WHERE posts_fts MATCH '검색될'")).scalars().all() == [1]
+        indexes = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+        assert {"ix_posts_board_list", "ix_likes_post_list", "ix_posts_deleted"} <= indexes
+        assert "ix_posts_board_id" not in indexes
+        assert conn.execute(text("SELECT deleted_at FROM posts WHERE id = 3")).scalar() == "2024-01-04 00:00:00"
+
+
+def test_already_applied_migrations_are_skipped(tmp_path):
+    engine = _old_engine(tmp_path)
+    migrations.run_migrations(engine)
+    assert migrations.run_migrations(engine) == []
+
+
+def test_archived_deletions_get_deleted_at_once(tmp_path):
+    engine = _old_engine(tmp_path)
+    event.listen(engine, "connect", lambda dbapi_conn, _: dbapi_conn.execute(
+        "ATTACH DATABASE ? AS archive", (str(tmp_path / "archive.db"),)))
+    engine.dispose()  # 이미 열린 연결에는 보관소가 붙어 있지 않다
+    migrations.run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA user_version = 9"))
+        columns = ", ".join(row[1] for row in conn.execute(text("PRAGMA table_info(posts)")))
+        conn.execute(text(f"INSERT INTO archive.posts ({columns}) SELECT {columns} FROM posts WHERE id = 3"))
+        conn.execute(text("UPDATE archive.posts SET deleted_at = NULL"))
+    assert migrations.run_migrations(engine) == [10]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT deleted_at FROM archive.posts WHERE id = 3")).scalar() == "2024-01-04 00:00:00"
@@ -0,0 +1,42 @@
+import pytest
+
+from app import crud
+
+
+def _ids(items: list[dict]) -> list[int]:
+    return [item["post"].id for item in items]
+
+
+def test_cursor_pages_match_offset_pages(db, board, make_post):
+    pinned = make_post(title="고정", is_pinned=True)
+    posts = [make_post(title=f"글 {i}") for i in range(24)]
+    expected = [pinned.id] + [p.id for p in reversed(posts)]
+
+    seen, cursor = [], None
+    while True:
+        page = crud.get_posts(db, board.id, limit=10, cursor=cursor)
+        seen += _ids(page)
+        cursor = crud.next_cursor(page, 10)
+        if cursor is None:
+            break
+    assert seen == expected
+    assert _ids(crud.get_posts(db, board.id, limit=10, offset=10)) == expected[10:20]
+
+
+def test_cursor_skips_posts_added_after_first_page(db, board, make_post):
+    for i in range(5):
+        make_post(title=f"글 {i}")
+    first = crud.get_posts(db, board.id, limit=3)
+    make_post(title="새 글")  # 오프셋이면 한 칸씩 밀려 같은 글이 다시 나온다
+    second = crud.get_posts(db, board.id, limit=3, cursor=crud.next_cursor(first, 3))
+    assert not set(_ids(first)) & set(_ids(second))
+    assert len(second) == 2
+
+
+def test_invalid_cursor(db, board):
+    with pytest.raises(ValueError):
+        crud.get_posts(db, board.id, cursor="not-a-cursor")
+
+
+def test_api_rejects_invalid_cursor(client, board):
+    assert client.get("/api/posts", params={"board_slug": board.slug, "cursor": "@@"}).status_code == 400
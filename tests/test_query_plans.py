@@ -0,0 +1,11 @@
+from app import crud
+from app.database import engine
+from app.migrations import check_query_plans
+from app.schemas import ReplyCreate
+
+
+def test_hot_queries_do_not_scan_posts_or_likes(db, make_post):
+    post = make_post()
+    crud.create_reply(db, post.id, ReplyCreate(content="댓글", author="a"))
+    crud.toggle_like(db, post.id, "liker")
+    assert check_query_plans(engine) == []
@@ -0,0 +1,9 @@
+from app import crud
+
+
+def test_snippets_escape_post_markup(db, board, make_post):
+    make_post(title="스니펫 검사", content="앞 <script>alert(1)</script> & 뒤")
+    fts_hit = crud.search_posts(db, "script", board_slug=board.slug)
+    assert fts_hit[0]["snippet"].startswith("앞 &lt;<mark>script</mark>&gt;alert(1)")
+    like_hit = crud.search_posts(db, "<s", board_slug=board.slug)  # 3글자 미만은 LIKE 경로
+    assert like_hit[0]["snippet"] == "앞 <mark>&lt;s</mark>cript&gt;alert(1)&lt;/script&gt; &amp; 뒤"
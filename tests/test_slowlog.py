@@ -0,0 +1,26 @@
+import sqlite3
+import threading
+
+from app import slowlog
+
+
+def test_plans_are_explained_off_the_request_thread(tmp_path, monkeypatch):
+    folder = tmp_path / "slow logs #1?"
+    folder.mkdir()
+    db_path = folder / "board.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    monkeypatch.setattr(slowlog, "_db_path", str(db_path))
+    monkeypatch.setattr(slowlog, "_archive_path", None)
+    threads = []
+    explain = slowlog._plan
+    monkeypatch.setattr(slowlog, "_plan", lambda *args: threads.append(threading.current_thread()) or explain(*args))
+    slowlog.clear()
+
+    slowlog._record("SELECT name FROM items WHERE name = ?", ("x",), False, 12.5)
+    slowlog.flush()
+    entry = slowlog.recent()["queries"][0]
+    assert threads and threading.current_thread() not in threads
+    # 경로에 공백·#·?가 있어도 같은 파일의 계획을 구한다
+    assert entry["plan"] == ["SCAN items"]
+    assert entry["full_scan"] == ["items"]
@@ -0,0 +1,85 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+from app import crud, transfer
+from app.database import ReadSessionLocal
+from app.schemas import ReplyCreate
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cli(db_path, *args) -> subprocess.CompletedProcess:
+    env = {**os.environ, "DB_PATH": str(db_path), "PYTHONPATH": _ROOT}
+    return subprocess.run([sys.executable, *args], cwd=_ROOT, env=env, capture_output=True, text=True, timeout=120)
+
+
+def _export(board_slug: str) -> list[str]:
+    db = ReadSessionLocal()
+    try:
+        return list(transfer.export_lines(db, board_slug, None, None))
+    finally:
+        db.close()
+
+
+def test_export_import_round_trip(tmp_path, db, board, make_post):
+    post = make_post(title="내보낼 글 <b>", content="여러 줄\n\"따옴표\" 본문", tag="t")
+    crud.create_reply(db, post.id, ReplyCreate(content="댓글", author="다른 사람"))
+    crud.toggle_like(db, post.id, "다른 사람")
+    deleted = make_post(title="지운 글")
+    crud.delete_post(db, deleted.id)
+    lines = _export(board.slug)
+    assert [json.loads(line)["type"] for line in lines] == ["meta", "board", "post", "post", "post", "like"]
+
+    source = tmp_path / "export.ndjson"
+    source.write_text("".join(lines), encoding="utf-8")
+    copy = tmp_path / "copy" / "board.db"
+    copy.parent.mkdir()
+    result = _cli(copy, "-m", "app.transfer", "import", str(source))
+    assert result.returncode == 0, result.stdout + result.stderr
+    again = tmp_path / "again.ndjson"
+    assert _cli(copy, "-m", "app.transfer", "export", str(again), "--board", board.slug).returncode == 0
+    # meta 줄에는 내보낸 시각이 들어간다
+    assert again.read_text(encoding="utf-8").splitlines(True)[1:] == lines[1:]
+
+    # 가져오기는 인덱스를 지웠다 다시 만든다. 핫 쿼리 실행 계획이 그대로인지 본다
+    plans = _cli(copy, "-m", "app.migrations", "--check-plans")
+    assert plans.returncode == 0, plans.stdout
+    assert _cli(copy, "-m", "app.reconcile", "--check").returncode == 0
+
+
+def test_import_reports_line_of_bad_record(tmp_path):
+    source = tmp_path / "bad.ndjson"
+    source.write_text('{"type": "meta", "version": 1}\n{"type": "post", "id": 1}\n', encoding="utf-8")
+    copy = tmp_path / "copy" / "board.db"
+    copy.parent.mkdir()
+    result = _cli(copy, "-m", "app.transfer", "import", str(source))
+    assert result.returncode == 1
+    assert result.stdout.startswith("line 2:")
+
+
+def test_import_refuses_ids_used_by_other_posts(tmp_path, db, board, make_post):
+    post = make_post(title="가져올 글")
+    crud.create_reply(db, post.id, ReplyCreate(content="댓글", author="다른 사람"))
+    crud.toggle_like(db, post.id, "다른 사람")
+    source = tmp_path / "export.ndjson"
+    source.write_text("".join(_export(board.slug)), encoding="utf-8")
+    copy = tmp_path / "copy" / "board.db"
+    copy.parent.mkdir()
+    assert _cli(copy, "-m", "app.transfer", "import", str(source)).returncode == 0
+    # 같은 파일을 다시 가져오면 이미 있는 행이므로 건너뛴다
+    again = _cli(copy, "-m", "app.transfer", "import", str(source))
+    assert again.returncode == 0, again.stdout + again.stderr
+
+    # 같은 ID의 글이 다른 글이면(다른 DB에서 만든 글) 댓글·좋아요가 그 스레드에 붙지 않도록 멈춘다
+    conn = sqlite3.connect(copy)
+    with conn:
+        conn.execute("UPDATE posts SET created_at = '2001-01-01 00:00:00.000000' WHERE id = ?", (post.id,))
+        conn.execute("DELETE FROM likes")
+    result = _cli(copy, "-m", "app.transfer", "import", str(source))
+    assert result.returncode == 1
+    assert f"post id {post.id} is already used by a different post" in result.stdout
+    assert conn.execute("SELECT count(*) FROM likes").fetchone() == (0,)
+    conn.close()
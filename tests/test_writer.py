@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import authors, crud, writer
+from app.models import Like, Post
+from app.schemas import ReplyCreate
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    monkeypatch.setattr(writer, "WINDOW", 0.2)  # 아래 작업들이 한 그룹으로 모이게
+    yield writer
+    writer.stop()
+
+
+def _gather(*calls):
+    async def main():
+        return await asyncio.gather(*(writer.run(fn, *args) for fn, *args in calls), return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_group_commits_once(db, make_post, queue):
+    post = make_post()
+    before = queue.stats()["groups"]
+    results = _gather(*[(crud._create_reply, post.id, ReplyCreate(content=f"댓글 {i}", author="w")) for i in range(5)])
+    assert all(isinstance(r, Post) for r in results)
+    assert queue.stats()["groups"] == before + 1
+    db.expire_all()
+    assert db.get(Post, post.id).reply_count == 5
+
+
+def test_failed_commit_falls_back_to_single_jobs(db, make_post, queue):
+    post = make_post()
+    author_id = authors.intern(db, "writer-dup")
+    db.commit()
+
+    def duplicate_like(session):
+        session.add(Like(post_id=post.id, author_id=author_id))
+
+    before = queue.stats()["fallbacks"]
+    liked, duplicate, reply = _gather(
+        (crud._toggle_like, post.id, "writer-dup"),
+        (duplicate_like,),
+        (crud._create_reply, post.id, ReplyCreate(content="댓글", author="w")),
+    )
+    assert liked == "liked"
+    assert isinstance(duplicate, IntegrityError)
+    assert isinstance(reply, Post)
+    assert queue.stats()["fallbacks"] == before + 1
+    db.expire_all()
+    assert (db.get(Post, post.id).like_count, db.get(Post, post.id).reply_count) == (1, 1)
+
+
+def test_value_error_fails_only_its_job(db, make_post, queue):
+    post = make_post()
+    missing, reply = _gather(
+        (crud._create_reply, 0, ReplyCreate(content="없는 글", author="w")),
+        (crud._create_reply, post.id, ReplyCreate(content="댓글", author="w")),
+    )
+    assert isinstance(missing, ValueError)
+    assert isinstance(reply, Post)